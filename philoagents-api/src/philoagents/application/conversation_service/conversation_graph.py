@@ -0,0 +1,92 @@
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+
+from langgraph.checkpoint.mongodb.saver import MongoDBSaver
+from loguru import logger
+from pymongo import MongoClient
+
+from philoagents.application.conversation_service.workflow.graph import (
+    create_workflow_graph,
+)
+from philoagents.config import settings
+
+# The compiled conversation graph and its xray description, shared by every
+# chat turn in the process. Built on first use (or at startup via
+# `warm_up_conversation_graph`) and rebuilt after the checkpoint collections
+# are dropped, since the saver creates their indexes when it is constructed.
+_compiled: Optional[tuple[Any, Any]] = None
+_compiled_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> MongoClient:
+    # One pooled client for the whole process instead of a new client (and
+    # connection handshake) per chat turn.
+    return MongoClient(
+        settings.MONGO_URI,
+        appname="philoagents",
+        maxPoolSize=settings.MONGO_CHECKPOINTER_MAX_POOL_SIZE,
+    )
+
+
+def get_conversation_graph() -> tuple[Any, Any]:
+    """
+    Returns the conversation graph compiled with the process-wide MongoDB
+    checkpointer, and its xray description for tracing.
+
+    Building it is blocking (the checkpointer creates its indexes), so async
+    callers should use `aget_conversation_graph`.
+    """
+    global _compiled
+    with _compiled_lock:
+        if _compiled is None:
+            checkpointer = MongoDBSaver(
+                client=_get_client(),
+                db_name=settings.MONGO_DB_NAME,
+                checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+                writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
+            )
+            graph = create_workflow_graph().compile(checkpointer=checkpointer)
+            _compiled = (graph, graph.get_graph(xray=True))
+            logger.info(
+                "Conversation graph compiled with a pooled MongoDB checkpointer."
+            )
+        return _compiled
+
+
+async def aget_conversation_graph() -> tuple[Any, Any]:
+    """Async variant of `get_conversation_graph` that never blocks the event loop."""
+    compiled = _compiled
+    if compiled is not None:
+        return compiled
+    return await asyncio.to_thread(get_conversation_graph)
+
+
+async def warm_up_conversation_graph() -> None:
+    """Builds the conversation graph at startup, ahead of the first chat turn."""
+    try:
+        await aget_conversation_graph()
+    except Exception as e:
+        # Chat still retries the build on its first turn.
+        logger.warning(f"Could not prepare the conversation graph at startup: {e}")
+
+
+def invalidate_conversation_graph() -> None:
+    """
+    Forces the next turn to rebuild the graph and its checkpointer, e.g. after
+    the checkpoint collections (and their indexes) were dropped. In-flight
+    turns keep the graph they started with; the pooled client is reused.
+    """
+    global _compiled
+    with _compiled_lock:
+        _compiled = None
+
+
+def close_conversation_graph() -> None:
+    """Releases the pooled client. Call once, at shutdown."""
+    invalidate_conversation_graph()
+    if _get_client.cache_info().currsize:
+        _get_client().close()
+        _get_client.cache_clear()
@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from loguru import logger
+from opik.integrations.langchain import OpikTracer
+
+from philoagents.application.conversation_service.workflow.edges import (
+    should_summarize_conversation,
+)
+from philoagents.application.conversation_service.workflow.nodes import (
+    summarize_conversation_node,
+)
+from philoagents.application.conversation_service.workflow.state import (
+    ConversationState,
+)
+from philoagents.config import settings
+
+# The in-flight background summary of each conversation thread. At most one
+# runs per thread, and the next turn of a thread waits for it before reading
+# the checkpointed state.
+_pending: Dict[str, asyncio.Task] = {}
+
+
+def _thread_id(config: dict) -> str:
+    return config["configurable"]["thread_id"]
+
+
+def _pending_summary(thread_id: str) -> Optional[asyncio.Task]:
+    task = _pending.get(thread_id)
+    # A task from a finished event loop (e.g. a previous asyncio.run) can
+    # never complete; forget it.
+    if task is not None and task.get_loop() is not asyncio.get_running_loop():
+        del _pending[thread_id]
+        return None
+    return task
+
+
+async def _summarize_conversation(graph: Any, config: dict) -> None:
+    # Re-read the checkpoint: it is the source of truth, and another
+    # process may have summarized the thread already.
+    snapshot = await graph.aget_state(config)
+    if not should_summarize_conversation(snapshot.values):
+        return
+    update = await summarize_conversation_node(snapshot.values)
+    # The update is applied to the thread's latest checkpoint, so messages
+    # added by a turn that ran meanwhile are kept; only the summarized ones
+    # are removed.
+    await graph.aupdate_state(config, update, as_node="summarize_conversation_node")
+    logger.info(f"Summarized conversation thread '{_thread_id(config)}'.")
+
+
+def _forget(thread_id: str, task: asyncio.Task) -> None:
+    if _pending.get(thread_id) is task:
+        del _pending[thread_id]
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(
+            f"Background summary of '{thread_id}' failed: {task.exception()}"
+        )
+
+
+def schedule_conversation_summary(
+    graph: Any, thread_id: str, state: ConversationState
+) -> None:
+    """
+    Summarizes the thread in the background once its reply has been sent, if
+    `state` (the turn's final state) has grown past
+    TOTAL_MESSAGES_SUMMARY_TRIGGER. Does nothing while a summary of the same
+    thread is already running.
+    """
+    if not should_summarize_conversation(state):
+        return
+    if _pending_summary(thread_id) is not None:
+        return
+    config = {
+        "configurable": {"thread_id": thread_id},
+        "callbacks": [OpikTracer(project_name=settings.COMET_PROJECT)],
+    }
+    task = asyncio.create_task(_summarize_conversation(graph, config))
+    _pending[thread_id] = task
+    task.add_done_callback(lambda done: _forget(thread_id, done))
+
+
+async def wait_for_pending_summary(thread_id: str) -> None:
+    """Waits for the thread's background summary, so the next turn reads it."""
+    task = _pending_summary(thread_id)
+    if task is None:
+        return
+    try:
+        # Shielded: a turn that is cancelled while waiting must not cancel
+        # the summary for everyone else.
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+    except Exception:
+        pass  # Logged by _forget; the turn proceeds with the full history.
+
+
+def cancel_pending_summaries() -> None:
+    """Cancels every background summary, e.g. before the checkpoints are dropped."""
+    for task in list(_pending.values()):
+        task.cancel()
+    _pending.clear()
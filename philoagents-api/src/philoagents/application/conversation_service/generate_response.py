@@ -1,13 +1,15 @@
 import uuid
-from contextlib import contextmanager
-from typing import Any, AsyncGenerator, Iterator, List, Union
+from typing import Any, AsyncGenerator, List, Union
 
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
-from langgraph.checkpoint.mongodb.saver import MongoDBSaver
 from opik.integrations.langchain import OpikTracer
 
-from philoagents.application.conversation_service.workflow.graph import (
-    create_workflow_graph,
+from philoagents.application.conversation_service.conversation_graph import (
+    aget_conversation_graph,
+)
+from philoagents.application.conversation_service.conversation_summary import (
+    schedule_conversation_summary,
+    wait_for_pending_summary,
 )
 from philoagents.application.conversation_service.workflow.state import (
     ConversationState,
@@ -31,45 +33,38 @@ def __get_conversation_thread_id(
     return base_thread_id
 
 
-@contextmanager
-def __compiled_graph(
+async def __prepare_turn(
     messages: Union[str, List[dict]],
     sender_id: str,
     receiver_character: Character,
     new_thread: bool,
-) -> Iterator[tuple[Any, dict, dict]]:
+) -> tuple[Any, dict, dict]:
     """
-    Shared setup for a conversation turn: opens the MongoDB checkpointer and
-    yields the compiled graph, run config, and initial state. The graph is only
-    valid inside the `with` block (the checkpointer connection closes on exit).
+    Shared setup for a conversation turn: returns the process-wide compiled
+    graph (checkpointed in MongoDB over a pooled client), the run config, and
+    the initial state. A background summary of the thread still running from
+    the previous turn is applied first.
     """
-    graph_builder = create_workflow_graph()
-
-    with MongoDBSaver.from_conn_string(
-        conn_string=settings.MONGO_URI,
-        db_name=settings.MONGO_DB_NAME,
-        checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
-        writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
-    ) as checkpointer:
-        graph = graph_builder.compile(checkpointer=checkpointer)
-        opik_tracer = OpikTracer(
-            graph=graph.get_graph(xray=True), project_name=settings.COMET_PROJECT
-        )
-        thread_id = __get_conversation_thread_id(
-            sender_id, receiver_character.id, new_thread
-        )
-        config = {
-            "configurable": {"thread_id": thread_id},
-            "callbacks": [opik_tracer],
-        }
-        initial_state = {
-            "messages": __format_messages(messages),
-            "character_id": receiver_character.id,
-            "character_name": receiver_character.name,
-            "character_perspective": receiver_character.perspective,
-            "character_style": receiver_character.style,
-        }
-        yield graph, config, initial_state
+    graph, graph_description = await aget_conversation_graph()
+    opik_tracer = OpikTracer(
+        graph=graph_description, project_name=settings.COMET_PROJECT
+    )
+    thread_id = __get_conversation_thread_id(
+        sender_id, receiver_character.id, new_thread
+    )
+    await wait_for_pending_summary(thread_id)
+    config = {
+        "configurable": {"thread_id": thread_id},
+        "callbacks": [opik_tracer],
+    }
+    initial_state = {
+        "messages": __format_messages(messages),
+        "character_id": receiver_character.id,
+        "character_name": receiver_character.name,
+        "character_perspective": receiver_character.perspective,
+        "character_style": receiver_character.style,
+    }
+    return graph, config, initial_state
 
 
 async def get_response(
@@ -93,15 +88,16 @@ async def get_response(
         final state of the conversation.
     """
     try:
-        with __compiled_graph(messages, sender_id, receiver_character, new_thread) as (
-            graph,
-            config,
-            initial_state,
-        ):
-            output_state = await graph.ainvoke(
-                input=initial_state,
-                config=config,
-            )
+        graph, config, initial_state = await __prepare_turn(
+            messages, sender_id, receiver_character, new_thread
+        )
+        output_state = await graph.ainvoke(
+            input=initial_state,
+            config=config,
+        )
+        schedule_conversation_summary(
+            graph, config["configurable"]["thread_id"], output_state
+        )
         last_message = output_state["messages"][-1]
         return last_message.content, ConversationState(**output_state)
     except Exception as e:
@@ -127,20 +123,27 @@ async def get_streaming_response(
         Chunks of the response content as they become available.
     """
     try:
-        with __compiled_graph(messages, sender_id, receiver_character, new_thread) as (
-            graph,
-            config,
-            initial_state,
+        graph, config, initial_state = await __prepare_turn(
+            messages, sender_id, receiver_character, new_thread
+        )
+        output_state = None
+        async for mode, chunk in graph.astream(
+            input=initial_state,
+            config=config,
+            stream_mode=["messages", "values"],
         ):
-            async for chunk in graph.astream(
-                input=initial_state,
-                config=config,
-                stream_mode="messages",
+            if mode == "values":
+                output_state = chunk
+            elif chunk[1]["langgraph_node"] == "conversation_node" and isinstance(
+                chunk[0], AIMessageChunk
             ):
-                if chunk[1]["langgraph_node"] == "conversation_node" and isinstance(
-                    chunk[0], AIMessageChunk
-                ):
-                    yield chunk[0].content
+                yield chunk[0].content
+
+        # The reply is complete; summarizing a long thread no longer delays it.
+        if output_state is not None:
+            schedule_conversation_summary(
+                graph, config["configurable"]["thread_id"], output_state
+            )
 
     except Exception as e:
         raise RuntimeError(
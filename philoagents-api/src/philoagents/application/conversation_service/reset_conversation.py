@@ -3,6 +3,12 @@ import asyncio
 from loguru import logger
 from pymongo import MongoClient
 
+from philoagents.application.conversation_service.conversation_graph import (
+    invalidate_conversation_graph,
+)
+from philoagents.application.conversation_service.conversation_summary import (
+    cancel_pending_summaries,
+)
 from philoagents.config import settings
 
 
@@ -19,6 +25,8 @@ async def reset_conversation_state() -> dict:
     Raises:
         Exception: If there's an error connecting to MongoDB or deleting collections
     """
+    # A summary finishing after the drop would resurrect its thread.
+    cancel_pending_summaries()
     return await asyncio.to_thread(_reset_conversation_state)
 
 
@@ -37,6 +45,10 @@ def _reset_conversation_state() -> dict:
                     collections_deleted.append(collection)
                     logger.info(f"Deleted collection: {collection}")
 
+        # Dropping the collections also dropped the checkpointer's indexes; the
+        # next turn rebuilds the checkpointer, which recreates them.
+        invalidate_conversation_graph()
+
         if collections_deleted:
             return {
                 "status": "success",
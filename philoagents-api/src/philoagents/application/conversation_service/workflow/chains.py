@@ -9,6 +9,8 @@ from philoagents.domain.prompts import (
     EXTEND_SUMMARY_PROMPT,
     SUMMARY_PROMPT,
 )
+from philoagents.infrastructure.groq_rate_limiter import RateLimitedChatGroq
+from philoagents.infrastructure.llm_cache import get_llm_cache
 
 
 def get_chat_model(
@@ -19,10 +21,12 @@ def get_chat_model(
         # Qwen3 emits <think> blocks that would leak into the dialogue stream;
         # disable reasoning entirely (it also burns the token budget).
         kwargs["reasoning_effort"] = "none"
-    return ChatGroq(
+    return RateLimitedChatGroq(
         api_key=settings.GROQ_API_KEY,
+        base_url=settings.GROQ_API_BASE,
         model=model_name,
         temperature=temperature,
+        cache=get_llm_cache(),
         **kwargs,
     )
 
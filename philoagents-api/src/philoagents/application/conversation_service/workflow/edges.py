@@ -1,18 +1,12 @@
-from langgraph.graph import END
-from typing_extensions import Literal
-
 from philoagents.application.conversation_service.workflow.state import (
     ConversationState,
 )
 from philoagents.config import settings
 
 
-def should_summarize_conversation(
-    state: ConversationState,
-) -> Literal["summarize_conversation_node", "__end__"]:
-    messages = state["messages"]
-
-    if len(messages) > settings.TOTAL_MESSAGES_SUMMARY_TRIGGER:
-        return "summarize_conversation_node"
-
-    return END
+def should_summarize_conversation(state: ConversationState) -> bool:
+    """
+    Whether the conversation has grown long enough to be summarized. Checked
+    in the background after a reply is sent, not as an edge of the graph.
+    """
+    return len(state["messages"]) > settings.TOTAL_MESSAGES_SUMMARY_TRIGGER
@@ -3,9 +3,6 @@ from functools import lru_cache
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import tools_condition
 
-from philoagents.application.conversation_service.workflow.edges import (
-    should_summarize_conversation,
-)
 from philoagents.application.conversation_service.workflow.nodes import (
     connector_node,
     conversation_node,
@@ -38,7 +35,9 @@ def create_workflow_graph():
     )
     graph_builder.add_edge("retrieve_character_context", "summarize_context_node")
     graph_builder.add_edge("summarize_context_node", "conversation_node")
-    graph_builder.add_conditional_edges("connector_node", should_summarize_conversation)
+    graph_builder.add_edge("connector_node", END)
+    # Not reached by a turn: conversation_summary runs it in the background
+    # after the reply is sent and records its update under this node.
     graph_builder.add_edge("summarize_conversation_node", END)
 
     return graph_builder
@@ -1,3 +1,6 @@
+import asyncio
+import hashlib
+
 from langchain_core.messages import RemoveMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import ToolNode
@@ -12,6 +15,11 @@ from philoagents.application.conversation_service.workflow.state import (
 )
 from philoagents.application.conversation_service.workflow.tools import tools
 from philoagents.config import settings
+from philoagents.domain.prompts import CONTEXT_SUMMARY_PROMPT
+from philoagents.infrastructure.context_summary_cache import (
+    context_summary_key,
+    get_context_summary_cache,
+)
 
 retriever_node = ToolNode(tools)
 
@@ -64,20 +72,40 @@ async def summarize_conversation_node(state: ConversationState):
 async def summarize_context_node(state: ConversationState):
     """
     Summarizes the factual context retrieved from the RAG tool. This is useful
-    if the retrieved documents are very long.
+    if the retrieved documents are very long. Summaries are cached by the set
+    of retrieved chunks, which recur often in a small scenario corpus.
     """
-    context_summary_chain = get_context_summary_chain()
     tool_output_message = state["messages"][-1]
+    cache = get_context_summary_cache()
+    retrieved_ids = getattr(tool_output_message, "artifact", None)
+    key = None
+    if cache is not None and retrieved_ids:
+        key = context_summary_key(retrieved_ids, _context_summarizer())
+        summary = await asyncio.to_thread(cache.get, key)
+        if summary is not None:
+            tool_output_message.content = summary
+            return {}
 
+    context_summary_chain = get_context_summary_chain()
     response = await context_summary_chain.ainvoke(
         {
             "context": tool_output_message.content,
         }
     )
     tool_output_message.content = response.content
+    if key is not None:
+        await asyncio.to_thread(cache.put, key, response.content)
 
     return {}
 
 
+def _context_summarizer() -> str:
+    # A different model or prompt produces different summaries.
+    return (
+        f"{settings.GROQ_LLM_MODEL_CONTEXT_SUMMARY}:"
+        f"{hashlib.sha256(CONTEXT_SUMMARY_PROMPT.prompt.encode()).hexdigest()}"
+    )
+
+
 async def connector_node(state: ConversationState):
     return {}
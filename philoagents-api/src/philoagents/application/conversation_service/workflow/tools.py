@@ -2,8 +2,9 @@ from functools import lru_cache
 
 from langchain.tools import tool
 
-from philoagents.application.rag.retrievers import get_retriever
+from philoagents.application.rag.retrievers import get_cached_retriever, get_retriever
 from philoagents.config import settings
+from philoagents.infrastructure.context_summary_cache import chunk_ids
 
 
 @lru_cache(maxsize=1)
@@ -11,21 +12,27 @@ def _retriever():
     # Built lazily on the first chat, not at import: constructing the
     # retriever loads the sentence-transformers model and requires the Atlas
     # hybrid search index, neither of which pure game-loop play needs.
-    return get_retriever(
+    factory = (
+        get_cached_retriever if settings.RAG_RETRIEVAL_CACHE_ENABLED else get_retriever
+    )
+    return factory(
         embedding_model_id=settings.RAG_TEXT_EMBEDDING_MODEL_ID,
         k=settings.RAG_TOP_K,
         device=settings.RAG_DEVICE,
     )
 
 
-@tool
+@tool(response_format="content_and_artifact")
 def retrieve_character_context(query: str):
     """Search and return information about a specific character.
 
     Always use this tool when the user asks you about a character,
     their works, ideas or historical context.
     """
-    return _retriever().invoke(query)
+    documents = _retriever().invoke(query)
+    # The chunk ids ride along as the message artifact (not sent to the
+    # model) so the context summary can be cached by them.
+    return str(documents), chunk_ids(documents)
 
 
 tools = [retrieve_character_context]
@@ -1,4 +1,4 @@
-from .deduplicate_documents import deduplicate_documents
+from .deduplicate_documents import DuplicateIndex, deduplicate_documents
 from .extract import RagExtractor
 
-__all__ = ["RagExtractor", "deduplicate_documents"]
+__all__ = ["DuplicateIndex", "RagExtractor", "deduplicate_documents"]
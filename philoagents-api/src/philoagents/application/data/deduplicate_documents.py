@@ -1,15 +1,339 @@
+import itertools
+import os
 import re
-from typing import List, Tuple
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
-from datasketch import MinHash, MinHashLSH
+import numpy as np
+from datasketch import MinHashLSH
 from langchain_core.documents import Document
 from loguru import logger
 
 from philoagents.config import settings
 
+DEFAULT_NUM_PERM = int(settings.RAG_CHUNK_SIZE * 0.5)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+# Odd multipliers combining three word hashes into an order-sensitive shingle
+# hash.
+_SHINGLE_MULTIPLIERS = (
+    np.uint64(0x9E3779B97F4A7C15),
+    np.uint64(0xC2B2AE3D27D4EB4F),
+)
+# Shingles permuted in one NumPy operation: a (num_perm x shingles) block of
+# about 8 MB, which stays in cache.
+_SHINGLES_PER_BATCH = 1 << 13
+# Bumped whenever signatures are computed differently, which invalidates
+# saved indexes.
+_INDEX_FORMAT = 1
+
+
+class MinHasher:
+    """
+    Computes the MinHash signatures of many texts at once.
+
+    Each text is shingled into runs of three words, and each permutation is a
+    multiply-add-shift hash of the 32-bit shingle hashes, so it needs no
+    modulo. Shingle hashes of a whole batch of texts go through every
+    permutation in one vectorized operation, and each text's signature is the
+    minimum over its shingles. Texts with fewer than three words have no
+    shingles; their signatures are all `_MAX_HASH`, so they match each other,
+    as empty datasketch MinHashes do.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        generator = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        high = np.iinfo(np.uint64).max
+        self._a = generator.randint(
+            1, high, size=(num_perm, 1), dtype=np.uint64
+        ) | np.uint64(1)
+        self._b = generator.randint(0, high, size=(num_perm, 1), dtype=np.uint64)
+        self._word_hashes: Dict[str, int] = {}
+
+    def shingle_hashes(self, texts: Sequence[str]) -> List[np.ndarray]:
+        """The hashes of each text's shingles."""
+        texts_words = [re.findall(r"\w+", text.lower()) for text in texts]
+        # Each distinct word is hashed once; the lookups below run in C.
+        for word in set().union(*texts_words) - self._word_hashes.keys():
+            self._word_hashes[word] = zlib.crc32(word.encode("utf-8"))
+        lookup = self._word_hashes.__getitem__
+        first, second = _SHINGLE_MULTIPLIERS
+
+        shingles = []
+        for words in texts_words:
+            if len(words) < 3:
+                shingles.append(np.empty(0, dtype=np.uint64))
+                continue
+            hashes = np.fromiter(map(lookup, words), dtype=np.uint64, count=len(words))
+            combined = hashes[:-2] * first + hashes[1:-1] * second + hashes[2:]
+            shingles.append((combined >> np.uint64(32)) ^ (combined & _MAX_HASH))
+        return shingles
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        """The (len(texts), num_perm) signatures of `texts`."""
+        shingles = self.shingle_hashes(texts)
+        signatures = np.full((len(texts), self.num_perm), _MAX_HASH, dtype=np.uint32)
+        buffer = np.empty((self.num_perm, _SHINGLES_PER_BATCH), dtype=np.uint64)
+
+        start = 0
+        while start < len(texts):
+            # As many texts as fit in the buffer, and at least one.
+            end, total = start + 1, len(shingles[start])
+            while (
+                end < len(texts) and total + len(shingles[end]) <= _SHINGLES_PER_BATCH
+            ):
+                total += len(shingles[end])
+                end += 1
+            counts = np.array([len(s) for s in shingles[start:end]])
+            nonempty = np.flatnonzero(counts)
+            if nonempty.size:
+                block = (
+                    buffer[:, :total]
+                    if total <= _SHINGLES_PER_BATCH
+                    else np.empty((self.num_perm, total), dtype=np.uint64)
+                )
+                np.multiply(self._a, np.concatenate(shingles[start:end]), out=block)
+                block += self._b
+                block >>= np.uint64(32)
+                offsets = (np.cumsum(counts) - counts)[nonempty]
+                signatures[start + nonempty] = np.minimum.reduceat(
+                    block, offsets, axis=1
+                ).T
+            start = end
+        return signatures
+
+
+def _similarities(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarities between rows of two signature arrays."""
+    return (first == second).mean(axis=1)
+
+
+@lru_cache
+def _band_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    The (bands, rows) split of a signature that datasketch's MinHashLSH picks
+    for `threshold`; it integrates numerically, so it is computed once.
+    """
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    return lsh.b, lsh.r
+
+
+def _resized(array: np.ndarray, rows: int) -> np.ndarray:
+    resized = np.empty((rows, array.shape[1]), dtype=array.dtype)
+    resized[: len(array)] = array
+    return resized
+
+
+class DuplicateIndex:
+    """
+    Locality-sensitive hashing index of MinHash signatures, used to find
+    near-duplicate chunks across the whole corpus rather than within one
+    character's documents.
+
+    Signatures are split into bands (sized for `threshold` as datasketch's
+    MinHashLSH sizes them), and two chunks are candidates when any band is
+    identical; candidates are then checked against `threshold`. The index is
+    saved to disk between ingests, keyed by chunk id.
+
+    `anchors` maps the key of each document dropped since the index was
+    created or loaded to the keys of the chunks it duplicated, so that a
+    dropped document can be indexed again once those chunks are removed.
+    """
+
+    def __init__(self, threshold: float = 0.7, num_perm: int = DEFAULT_NUM_PERM):
+        self.threshold = threshold
+        self.hasher = MinHasher(num_perm)
+        bands, rows = _band_params(threshold, num_perm)
+        self._bands = [(band * rows, (band + 1) * rows) for band in range(bands)]
+        self._band_multipliers = np.random.RandomState(2).randint(
+            1, np.iinfo(np.int64).max, size=rows, dtype=np.uint64
+        ) | np.uint64(1)
+        self._keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._band_keys = np.empty((0, len(self._bands)), dtype=np.uint64)
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        self.anchors: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One hash per band of each signature."""
+        return np.stack(
+            [
+                (
+                    signatures[:, start:end].astype(np.uint64) * self._band_multipliers
+                ).sum(axis=1, dtype=np.uint64)
+                for start, end in self._bands
+            ],
+            axis=1,
+        ).reshape(len(signatures), len(self._bands))
+
+    def duplicate_pairs(self, signatures: np.ndarray) -> List[Tuple[int, int, float]]:
+        """
+        The (i, j, similarity) pairs of rows of `signatures`, with i < j, that
+        are at least `threshold` similar; each pair once.
+        """
+        candidates: Set[Tuple[int, int]] = set()
+        for band in self.band_keys(signatures).T:
+            order = np.argsort(band, kind="stable")
+            sorted_band = band[order]
+            starts = np.flatnonzero(np.r_[True, sorted_band[1:] != sorted_band[:-1]])
+            sizes = np.diff(np.r_[starts, len(band)])
+            for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+                candidates.update(
+                    itertools.combinations(sorted(order[start : start + size]), 2)
+                )
+        if not candidates:
+            return []
+        pairs = np.array(sorted(candidates), dtype=np.int64)
+        similarities = _similarities(signatures[pairs[:, 0]], signatures[pairs[:, 1]])
+        return [
+            (int(i), int(j), float(similarity))
+            for (i, j), similarity in zip(pairs, similarities)
+            if similarity >= self.threshold
+        ]
+
+    def deduplicate(self, documents: List[Document], keys: List[str]) -> List[Document]:
+        """
+        Drops the documents that nearly duplicate an indexed chunk, or a longer
+        document of the batch, and indexes the rest under `keys`.
+
+        Documents whose key is already indexed were kept when first seen and
+        are kept again as they are.
+        """
+        indexed = len(self)
+        new = [i for i, key in enumerate(keys) if key not in self._rows]
+        signatures = self.hasher.signatures([documents[i].page_content for i in new])
+        band_keys = self.band_keys(signatures)
+
+        # Near-duplicates of chunks already in the corpus.
+        candidates = {
+            (position, row)
+            for position, row_band_keys in enumerate(band_keys)
+            for band, band_key in enumerate(row_band_keys)
+            for row in self._buckets[band].get(int(band_key), ())
+        }
+        duplicated = np.zeros(len(new), dtype=bool)
+        if candidates:
+            pairs = np.array(sorted(candidates), dtype=np.int64)
+            similar = (
+                _similarities(signatures[pairs[:, 0]], self._signatures[pairs[:, 1]])
+                >= self.threshold
+            )
+            duplicated[pairs[similar, 0]] = True
+            for position, row in pairs[similar].tolist():
+                self.anchors.setdefault(keys[new[position]], set()).add(self._keys[row])
+
+        # Near-duplicates within the batch: keep the one with more content.
+        survivors = np.flatnonzero(~duplicated)
+        for i, j, _ in self.duplicate_pairs(signatures[survivors]):
+            first, second = survivors[i], survivors[j]
+            if len(documents[new[first]].page_content) < len(
+                documents[new[second]].page_content
+            ):
+                first, second = second, first
+            duplicated[second] = True
+            self.anchors.setdefault(keys[new[second]], set()).add(keys[new[first]])
+
+        kept = np.flatnonzero(~duplicated)
+        self._insert([keys[new[i]] for i in kept], signatures[kept], band_keys[kept])
+        removed = {new[i] for i in np.flatnonzero(duplicated)}
+        logger.info(
+            f"{len(removed)} / {len(documents)} documents are duplicates "
+            f"(of {indexed} indexed chunks or of each other). Removing them."
+        )
+        return [doc for i, doc in enumerate(documents) if i not in removed]
+
+    def _insert(
+        self,
+        keys: List[str],
+        signatures: np.ndarray,
+        band_keys: Optional[np.ndarray] = None,
+    ):
+        if band_keys is None:
+            band_keys = self.band_keys(signatures)
+        first_row = len(self._keys)
+        rows = first_row + len(keys)
+        if rows > len(self._signatures):
+            # Grown geometrically, so indexing a corpus batch by batch copies
+            # each signature a constant number of times.
+            capacity = max(rows, 2 * len(self._signatures))
+            self._signatures = _resized(self._signatures, capacity)
+            self._band_keys = _resized(self._band_keys, capacity)
+        self._keys.extend(keys)
+        self._signatures[first_row:rows] = signatures
+        self._band_keys[first_row:rows] = band_keys
+        for row, (key, row_band_keys) in enumerate(zip(keys, band_keys), first_row):
+            self._rows[key] = row
+            for band, band_key in enumerate(row_band_keys.tolist()):
+                self._buckets[band].setdefault(band_key, []).append(row)
+
+    def remove(self, keys: Set[str]):
+        """Drops the chunks with these keys, e.g. ones deleted from the store."""
+        for key in keys:
+            row = self._rows.pop(key, None)
+            if row is None:
+                continue
+            self._keys[row] = None
+            for band, band_key in enumerate(self._band_keys[row].tolist()):
+                self._buckets[band][band_key].remove(row)
+
+    def retain(self, keys: Set[str]):
+        """Drops the chunks whose key is not in `keys`."""
+        self.remove(set(self._rows) - set(keys))
+
+    def save(self, path: Path):
+        rows = np.array(sorted(self._rows.values()), dtype=np.int64)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.tmp")
+        with open(temporary, "wb") as file:
+            np.savez(
+                file,
+                format=np.array(_INDEX_FORMAT),
+                threshold=np.array(self.threshold),
+                num_perm=np.array(self.hasher.num_perm),
+                keys=np.array([self._keys[row] for row in rows], dtype=str),
+                signatures=self._signatures[rows],
+            )
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(
+        cls, path: Path, threshold: float = 0.7, num_perm: int = DEFAULT_NUM_PERM
+    ) -> "DuplicateIndex":
+        """The index saved at `path`, or an empty one if there is none usable."""
+        index = cls(threshold, num_perm)
+        if not Path(path).exists():
+            return index
+        with np.load(path) as saved:
+            settings_ = (
+                int(saved["format"]),
+                float(saved["threshold"]),
+                int(saved["num_perm"]),
+            )
+            if settings_ != (_INDEX_FORMAT, threshold, num_perm):
+                logger.warning(
+                    f"Ignoring the deduplication index at {path}, built with "
+                    f"other settings; chunks are indexed again."
+                )
+                return index
+            index._insert(saved["keys"].tolist(), saved["signatures"])
+        logger.info(f"Loaded {len(index)} chunks into the deduplication index.")
+        return index
+
 
 def deduplicate_documents(
-    documents: List[Document], threshold: float = 0.7
+    documents: List[Document],
+    threshold: float = 0.7,
+    index: Optional[DuplicateIndex] = None,
 ) -> List[Document]:
     """Remove duplicate documents from a list based on content similarity.
 
@@ -20,6 +344,10 @@ def deduplicate_documents(
         documents: List of documents to deduplicate.
         threshold: Similarity threshold to consider documents as duplicates.
             Value between 0.0 and 1.0, where higher values require more similarity.
+            Ignored when `index` is given, which has its own.
+        index: A corpus-wide index. If given, documents that nearly duplicate
+            an indexed chunk are removed too, and the rest are indexed under
+            their ids, which must be set.
 
     Returns:
         List of documents with duplicates removed.
@@ -28,6 +356,11 @@ def deduplicate_documents(
     if not documents:
         return []
 
+    if index is not None:
+        if not all(doc.id for doc in documents):
+            raise ValueError("Documents need ids to be added to a DuplicateIndex.")
+        return index.deduplicate(documents, [doc.id for doc in documents])
+
     duplicates = find_duplicates(documents, threshold)
 
     logger.info(
@@ -48,12 +381,12 @@ def deduplicate_documents(
 def find_duplicates(
     documents: List[Document],
     threshold: float = 0.7,
-    num_perm: int = int(settings.RAG_CHUNK_SIZE * 0.5),
+    num_perm: int = DEFAULT_NUM_PERM,
 ) -> List[Tuple[int, int, float]]:
     """Find duplicate documents using MinHash algorithm.
 
-    Creates MinHash signatures for each document and uses Locality Sensitive Hashing (LSH)
-    to efficiently find similar document pairs.
+    Creates MinHash signatures for all documents at once and uses Locality
+    Sensitive Hashing (LSH) to efficiently find similar document pairs.
 
     Args:
         documents: List of documents to check for duplicates.
@@ -66,41 +399,6 @@ def find_duplicates(
         List of tuples containing (doc_index1, doc_index2, similarity_score)
         for document pairs that exceed the similarity threshold.
     """
-
-    minhashes = []
-
-    for doc in documents:
-        minhash = MinHash(num_perm=num_perm)
-        text = doc.page_content.lower()
-        words = re.findall(r"\w+", text)
-
-        # Create shingles (3-grams of words)
-        for i in range(len(words) - 3):
-            shingle = " ".join(words[i : i + 3])
-            minhash.update(shingle.encode("utf-8"))
-        minhashes.append(minhash)
-
-    # Find similar document pairs using LSH (Locality Sensitive Hashing)
-    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
-
-    # Add documents to LSH index
-    for i, minhash in enumerate(minhashes):
-        lsh.insert(i, minhash)
-
-    duplicates = []
-    for i, minhash in enumerate(minhashes):
-        similar_docs = lsh.query(minhash)
-        # Remove self from results
-        similar_docs = [j for j in similar_docs if j != i]
-
-        # Find duplicates
-        for j in similar_docs:
-            similarity = minhashes[i].jaccard(minhashes[j])
-            if similarity >= threshold:
-                # Ensure we don't add the same pair twice (in different order)
-                pair = tuple(sorted([i, j]))
-                duplicate_info = (*pair, similarity)
-                if duplicate_info not in duplicates:
-                    duplicates.append(duplicate_info)
-
-    return duplicates
+    index = DuplicateIndex(threshold, num_perm)
+    signatures = index.hasher.signatures([doc.page_content for doc in documents])
+    return index.duplicate_pairs(signatures)
@@ -1,22 +1,43 @@
-from typing import Dict, Generator, List
+import json
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Dict, Generator, List, Optional, Tuple
 
+import requests
 from bs4 import BeautifulSoup
-from langchain_community.document_loaders import WebBaseLoader, WikipediaLoader
+from langchain_community.document_loaders import WikipediaLoader
+from langchain_community.document_loaders.web_base import default_header_template
 from langchain_core.documents import Document
+from loguru import logger
 from tqdm import tqdm
 
+from philoagents.config import settings
 from philoagents.domain.character import Character
 from philoagents.domain.character_factory import CharacterFactory
+from philoagents.infrastructure.source_cache import SourceCache, get_source_cache
 
 
 class RagExtractor:
     """
     A class responsible for extracting raw text data from various web sources
     to build the knowledge base for a given scenario.
+
+    Sources are downloaded by a pool of `max_workers` threads, through
+    `source_cache`, so unchanged sources are not downloaded again.
     """
 
-    def __init__(self, character_factory: CharacterFactory):
+    def __init__(
+        self,
+        character_factory: CharacterFactory,
+        source_cache: Optional[SourceCache] = None,
+        max_workers: Optional[int] = None,
+    ):
         self.character_factory = character_factory
+        self.source_cache = (
+            source_cache if source_cache is not None else get_source_cache()
+        )
+        self.max_workers = max_workers or settings.RAG_EXTRACTION_WORKERS
 
     def get_extraction_generator(
         self, rag_sources: List[Dict]
@@ -24,6 +45,10 @@ class RagExtractor:
         """
         Extracts documents for all characters defined in the RAG sources, yielding one at a time.
 
+        The sources of the next few characters are downloaded concurrently, but
+        characters are yielded in the order of `rag_sources`, and at most
+        `max_workers` of them are extracted ahead of the one being consumed.
+
         Args:
             rag_sources: A list of dictionaries loaded from the scenario's rag_sources.json.
 
@@ -32,61 +57,97 @@ class RagExtractor:
                 documents extracted for that character.
         """
         progress_bar = tqdm(
-            rag_sources,
+            total=len(rag_sources),
             desc="Extracting RAG docs",
             unit="character",
             bar_format="{desc}: {percentage:3.0f}%|{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}] {postfix}",
         )
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="rag-extract"
+        )
+        sources = iter(rag_sources)
+        pending: Deque[Tuple[Character, List[Future]]] = deque()
+
+        def submit_next_character():
+            source_info = next(sources, None)
+            if source_info is None:
+                return
+            character = self.character_factory.get_character(
+                source_info["character_id"]
+            )
+            pending.append(
+                (
+                    character,
+                    self._submit_for_character(executor, character, source_info),
+                )
+            )
 
-        for source_info in progress_bar:
-            character_id = source_info["character_id"]
-            character = self.character_factory.get_character(character_id)
-            progress_bar.set_postfix_str(f"Character: {character.name}")
-
-            character_docs = self._extract_for_character(character, source_info)
-            yield character, character_docs
-
-    def _extract_for_character(
-        self, character: Character, source_info: Dict
-    ) -> List[Document]:
+        try:
+            for _ in range(self.max_workers):
+                submit_next_character()
+            while pending:
+                character, futures = pending.popleft()
+                submit_next_character()
+                progress_bar.set_postfix_str(f"Character: {character.name}")
+
+                character_docs = [doc for future in futures for doc in future.result()]
+                progress_bar.update()
+                yield character, character_docs
+        finally:
+            # Stops downloading when the consumer fails or stops early.
+            executor.shutdown(cancel_futures=True)
+            progress_bar.close()
+
+    def _submit_for_character(
+        self, executor: ThreadPoolExecutor, character: Character, source_info: Dict
+    ) -> List[Future]:
         """
-        Orchestrates the extraction from all configured sources for a single character.
+        Starts the extraction from all configured sources for a single character.
         """
-        docs = []
+        futures = []
 
         if "wikipedia_query" in source_info:
-            docs.extend(
-                self._extract_wikipedia(character, source_info["wikipedia_query"])
+            futures.append(
+                executor.submit(
+                    self._extract_wikipedia, character, source_info["wikipedia_query"]
+                )
             )
 
-        if "britannica_urls" in source_info:
-            docs.extend(
-                self._extract_britannica(character, source_info["britannica_urls"])
-            )
+        for url in source_info.get("britannica_urls", []):
+            futures.append(executor.submit(self._extract_britannica, character, url))
 
-        return docs
+        return futures
 
-    @staticmethod
-    def _extract_wikipedia(character: Character, query: str) -> List[Document]:
+    def _extract_wikipedia(self, character: Character, query: str) -> List[Document]:
         """Extracts a document for a single character from Wikipedia."""
-        loader = WikipediaLoader(
-            query=query,
-            lang="en",
-            load_max_docs=1,
-            doc_content_chars_max=2_000_000,
-        )
-        docs = loader.load()
+
+        def load() -> str:
+            loader = WikipediaLoader(
+                query=query,
+                lang="en",
+                load_max_docs=1,
+                doc_content_chars_max=2_000_000,
+            )
+            return json.dumps(
+                [
+                    {"page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc in loader.load()
+                ],
+                default=str,
+            )
+
+        docs = [
+            Document(**doc)
+            for doc in json.loads(self.source_cache.fetch(f"wikipedia:{query}", load))
+        ]
         for doc in docs:
             doc.metadata["character_id"] = character.id
             doc.metadata["character_name"] = character.name
             doc.metadata["source_type"] = "Wikipedia"
         return docs
 
-    @staticmethod
-    def _extract_britannica(character: Character, urls: List[str]) -> List[Document]:
-        """Extracts documents from Encyclopedia Britannica URLs."""
-        if not urls:
-            return []
+    def _extract_britannica(self, character: Character, url: str) -> List[Document]:
+        """Extracts the article at an Encyclopedia Britannica URL."""
 
         def clean_britannica_html(soup: BeautifulSoup) -> str:
             excluded_selectors = [
@@ -109,20 +170,25 @@ class RagExtractor:
                 for element in main_article.find_all(["p", "h1", "h2", "h3", "h4"])
             )
 
-        loader = WebBaseLoader(show_progress=False)
-        soups = loader.scrape_all(urls)
-        documents = []
-        for url, soup in zip(urls, soups):
-            text = clean_britannica_html(soup)
-            if not text:
-                continue
-            metadata = {
-                "source": url,
-                "character_id": character.id,
-                "character_name": character.name,
-                "source_type": "Encyclopedia",
-            }
-            if title := soup.find("title"):
-                metadata["title"] = title.get_text().strip(" \n")
-            documents.append(Document(page_content=text, metadata=metadata))
-        return documents
+        headers = dict(default_header_template)
+        if user_agent := os.environ.get("USER_AGENT"):
+            headers["User-Agent"] = user_agent
+        try:
+            html = self.source_cache.fetch_url(url, headers=headers)
+        except requests.HTTPError as e:
+            logger.warning(f"Skipping {url} for {character.name}: {e}")
+            return []
+
+        soup = BeautifulSoup(html, "html.parser")
+        text = clean_britannica_html(soup)
+        if not text:
+            return []
+        metadata = {
+            "source": url,
+            "character_id": character.id,
+            "character_name": character.name,
+            "source_type": "Encyclopedia",
+        }
+        if title := soup.find("title"):
+            metadata["title"] = title.get_text().strip(" \n")
+        return [Document(page_content=text, metadata=metadata)]
@@ -1,10 +1,27 @@
-from typing import Dict
-
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+import asyncio
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from philoagents.application.game_loop_service.events import (
+    RoundEvent,
+    RoundEventType,
+)
 from philoagents.application.game_loop_service.service import GameLoopService
+from philoagents.config import settings
 from philoagents.domain import Action, Character, CharacterFactory
+from philoagents.domain.game_state import GameState
 from philoagents.infrastructure.dependencies import (
     get_character_factory,
     get_game_service,
@@ -25,6 +42,7 @@ class GameStatusResponse(BaseModel):
     known_intel: list[str]
     is_game_over: bool
     is_processing_round: bool = False
+    version: int = 0
 
 
 class CharacterProfile(BaseModel):
@@ -103,28 +121,82 @@ async def start_game(
     return {"message": f"Game started as '{request.character_id}'."}
 
 
-@router.get("/status/{character_id}", response_model=GameStatusResponse)
-async def get_game_status(
-    character_id: str, service: GameLoopService = Depends(get_game_service)
-):
+def _player_character(state: GameState, character_id: str) -> Character:
     """
-    Endpoint for the player's UI to get the current state of the game
-    from their character's perspective. Only the character the game is bound
-    to may be queried, so one seat cannot read another seat's private intel.
+    Returns the character a status request is for. Only the character the game
+    is bound to may be queried, so one seat cannot read another seat's private
+    intel.
     """
-    current_state = service.get_current_state()
-    if character_id not in current_state.characters:
+    if character_id not in state.characters:
         raise HTTPException(
             status_code=404, detail=f"Character '{character_id}' not found."
         )
-    player_id = current_state.player_character_id
+    player_id = state.player_character_id
     if player_id is not None and character_id != player_id:
         raise HTTPException(
             status_code=403,
             detail=f"This game is bound to '{player_id}'.",
         )
+    return state.characters[character_id]
+
+
+def _status_etag(service: GameLoopService) -> str:
+    # Everything a status response depends on besides the requested character,
+    # which is part of the URL. The instance keeps a version reached again
+    # after a restart (a lost write) from matching another state.
+    state = service.game_state
+    return (
+        f'"{service.instance_id}-{state.version}-{state.round_number}-'
+        f'{int(service.is_processing_round)}-{int(service.is_game_over)}"'
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@router.get(
+    "/status/{character_id}",
+    response_model=GameStatusResponse,
+    responses={304: {"description": "The status has not changed."}},
+)
+async def get_game_status(
+    character_id: str,
+    response: Response,
+    wait_for_version: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description=(
+            "Long-poll: answer only once the state version differs from this "
+            "one, a round in progress finishes, or the long-poll timeout passes."
+        ),
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    service: GameLoopService = Depends(get_game_service),
+):
+    """
+    Endpoint for the player's UI to get the current state of the game
+    from their character's perspective.
+
+    Responses carry an ETag; a request whose If-None-Match still matches gets
+    an empty 304 instead of the full status.
+    """
+    _player_character(service.get_current_state(), character_id)
+    if wait_for_version is not None:
+        await service.wait_for_state_change(
+            wait_for_version, timeout=settings.GAME_STATUS_LONG_POLL_SECONDS
+        )
+
+    current_state = service.get_current_state()
+    player_char = _player_character(current_state, character_id)
+
+    etag = _status_etag(service)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
 
-    player_char = current_state.characters[character_id]
     other_chars = [
         char.name
         for cid, char in current_state.characters.items()
@@ -139,6 +211,59 @@ async def get_game_status(
         known_intel=player_char.known_intel,
         is_game_over=service.is_game_over,
         is_processing_round=service.is_processing_round,
+        version=current_state.version,
+    )
+
+
+def _format_sse(event: RoundEvent) -> str:
+    return f"data: {event.model_dump_json(exclude_none=True)}\n\n"
+
+
+async def _round_event_stream(
+    request: Request, service: GameLoopService
+) -> AsyncIterator[str]:
+    with service.events.subscribe() as queue:
+        yield _format_sse(
+            RoundEvent(
+                type=RoundEventType.STATUS,
+                round_number=service.game_state.round_number,
+                is_game_over=service.is_game_over,
+                is_processing_round=service.is_processing_round,
+            )
+        )
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=settings.GAME_EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # An SSE comment: ignored by clients, keeps proxies from
+                # closing a stream that is quiet while the judge deliberates.
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                # Fell behind: ending the stream makes the client poll.
+                return
+            yield _format_sse(event)
+
+
+@router.get("/events")
+async def stream_round_events(
+    request: Request, service: GameLoopService = Depends(get_game_service)
+):
+    """
+    Server-sent event stream of round-resolution phases: delegates started,
+    each delegate finished, judge started, the judge's crisis update as it is
+    written, and round committed (or failed).
+
+    Clients get one message per transition instead of polling /status while
+    a round resolves, and re-fetch their status once the round is committed.
+    The first message is a status snapshot of the game.
+    """
+    return StreamingResponse(
+        _round_event_stream(request, service),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -0,0 +1,142 @@
+import asyncio
+from contextlib import contextmanager
+from enum import Enum
+from typing import Iterator, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel, Field
+
+
+class RoundEventType(str, Enum):
+    """
+    The phase transitions of a round, in the order they happen. STATUS is
+    sent once when a client subscribes, so it can tell whether a round
+    committed before it connected.
+    """
+
+    STATUS = "status"
+    DELEGATES_STARTED = "delegates_started"
+    DELEGATE_FINISHED = "delegate_finished"
+    JUDGE_STARTED = "judge_started"
+    JUDGE_NARRATIVE = "judge_narrative"
+    ROUND_COMMITTED = "round_committed"
+    ROUND_FAILED = "round_failed"
+
+
+class RoundEvent(BaseModel):
+    """
+    A single round-resolution event pushed to clients. Events never carry
+    private state (intel, resources); clients re-fetch their own status once
+    a round is committed.
+    """
+
+    type: RoundEventType
+    round_number: int = Field(
+        description="The round the event belongs to (the new round once committed)."
+    )
+    character_id: Optional[str] = Field(
+        default=None,
+        description="The delegate that finished, for delegate_finished events.",
+    )
+    used_fallback: Optional[bool] = Field(
+        default=None,
+        description="Whether the delegate fell back to the safe default action.",
+    )
+    offset: Optional[int] = Field(
+        default=None,
+        description=(
+            "For judge_narrative events: where `text` starts in the crisis "
+            "update being written. Clients replace what they have from there "
+            "on; 0 means the judge started over."
+        ),
+    )
+    text: Optional[str] = Field(
+        default=None,
+        description="For judge_narrative events: the crisis update from `offset` on.",
+    )
+    is_game_over: Optional[bool] = Field(
+        default=None, description="Set on status and round_committed events."
+    )
+    is_processing_round: Optional[bool] = Field(
+        default=None, description="Set on status events."
+    )
+
+
+class _SubscriberQueue(asyncio.Queue):
+    """
+    A subscriber's queue, in which a judge_narrative event waiting behind
+    another one is merged into it, so a client that reads less often than
+    the judge writes receives fewer, larger pieces rather than falling behind.
+    """
+
+    def put_event(self, event: RoundEvent) -> None:
+        last = self._queue[-1] if self._queue else None
+        if (
+            event.type != RoundEventType.JUDGE_NARRATIVE
+            or last is None
+            or last.type != RoundEventType.JUDGE_NARRATIVE
+        ):
+            self.put_nowait(event)
+            return
+        if event.offset < last.offset:
+            # Replaces everything the queued piece would have written.
+            merged = event
+        else:
+            merged = last.model_copy(
+                update={"text": last.text[: event.offset - last.offset] + event.text}
+            )
+        self._queue[-1] = merged
+
+
+class RoundEventBroadcaster:
+    """
+    Fans round events out to every subscribed client of one game.
+
+    Each subscriber gets its own bounded queue, so a stalled client never
+    blocks the round being resolved. Pieces of the crisis update waiting in a
+    queue are merged, so they never fill it. Events are never dropped: a
+    subscriber whose queue is full is unsubscribed and its queue closed, so
+    its stream ends and the client falls back to polling instead of waiting
+    for a round_committed it will not receive.
+    """
+
+    def __init__(self, max_queued_events: int = 64):
+        self.max_queued_events = max_queued_events
+        self._subscribers: List[_SubscriberQueue] = []
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue]:
+        """
+        Yields a queue receiving every event published while subscribed. It
+        receives None, and nothing after it, if the subscriber fell behind.
+        """
+        queue = _SubscriberQueue(maxsize=self.max_queued_events)
+        self._subscribers.append(queue)
+        try:
+            yield queue
+        finally:
+            if queue in self._subscribers:
+                self._subscribers.remove(queue)
+
+    def publish(self, event: RoundEvent) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_event(event)
+            except asyncio.QueueFull:
+                self._close_lagging(queue, event)
+
+    def _close_lagging(self, queue: _SubscriberQueue, event: RoundEvent) -> None:
+        logger.warning(
+            f"Closing the event stream of a subscriber that is not keeping up "
+            f"(queue full at a '{event.type.value}' event)."
+        )
+        self._subscribers.remove(queue)
+        # What is queued is incomplete anyway; the client re-fetches its
+        # status once the stream ends.
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
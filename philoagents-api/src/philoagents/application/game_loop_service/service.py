@@ -1,15 +1,30 @@
 import asyncio
+import uuid
 from typing import Dict, List, Optional
 
 from loguru import logger
 from opik.integrations.langchain import OpikTracer
 
+from philoagents.application.game_loop_service.events import (
+    RoundEvent,
+    RoundEventBroadcaster,
+    RoundEventType,
+)
 from philoagents.application.game_loop_service.workflow.chains import (
+    get_intel_digest_chain,
     get_undergame_guess_chain,
 )
 from philoagents.application.game_loop_service.workflow.graph import (
-    create_action_graph,
-    create_judge_graph,
+    get_action_graph_description,
+    get_compiled_action_graph,
+    get_compiled_judge_graph,
+    get_judge_graph_description,
+)
+from philoagents.application.game_loop_service.workflow.intel_digest import (
+    IntelDigest,
+    apply_intel_digest,
+    format_known_intel,
+    reports_to_fold,
 )
 from philoagents.application.scoring_service import ScoringService
 from philoagents.config import settings
@@ -37,9 +52,14 @@ class GameLoopService:
         undergame_plot_display: str,
         max_rounds: int = 4,  # TODO: increase after we're done testing. Needs higher model limits
         state_repository: Optional[GameStateRepository] = None,
+        game_id: str = GameStateRepository.DEFAULT_GAME_ID,
     ):
-        self.game_state = initial_state
+        self.game_id = game_id
+        # The current state is an immutable snapshot: it is never modified once
+        # published, only replaced (see `_update_state`), so readers can share
+        # it without copying. Every replacement increases its `version`.
         self._initial_state = initial_state.model_copy(deep=True)
+        self.game_state = self._initial_state
         self.undergame_plot = undergame_plot
         self.undergame_plot_display = undergame_plot_display
         self.factory = factory
@@ -49,8 +69,18 @@ class GameLoopService:
         self.state_repository = state_repository
         self._round_lock = asyncio.Lock()
         self.is_processing_round = False
-
-    def try_resume(self) -> bool:
+        self.events = RoundEventBroadcaster()
+        # Set (and replaced) whenever the state or the round-processing flag
+        # changes, waking long-polling status requests.
+        self._state_changed = asyncio.Event()
+        self._state_waiters = 0
+        self._speculative_actions: Dict[str, asyncio.Task] = {}
+        self._speculative_round: Optional[int] = None
+        # Tells apart services that hosted this game, e.g. before and after an
+        # eviction or a restart, in validators clients cache.
+        self.instance_id = uuid.uuid4().hex[:12]
+
+    async def try_resume(self) -> bool:
         """
         Restores the last persisted game state, if any.
 
@@ -60,14 +90,14 @@ class GameLoopService:
         if self.state_repository is None:
             return False
 
-        saved_state = self.state_repository.load()
+        saved_state = await self.state_repository.load()
         if saved_state is None:
             return False
 
         self.game_state = saved_state
         self.is_game_over = saved_state.round_number > self.max_rounds
         logger.info(
-            f"Resumed saved game at round {saved_state.round_number} "
+            f"Resumed saved game '{self.game_id}' at round {saved_state.round_number} "
             f"(game over: {self.is_game_over})."
         )
         return True
@@ -79,25 +109,63 @@ class GameLoopService:
         if self.is_processing_round:
             raise RuntimeError("Cannot reset the game while a round is being resolved.")
 
-        self.game_state = self._initial_state.model_copy(deep=True)
+        self.discard_speculative_actions()
+        self._set_state(self._initial_state)
         self.submitted_actions = {}
         self.is_game_over = False
         if self.state_repository is not None:
-            await self._persist(self.state_repository.clear)
+            await self.state_repository.clear()
+            # The reset state is saved, so a resumed game carries on from its
+            # version instead of counting up from 0 again.
+            await self.state_repository.save(self.game_state)
         logger.info("Game state reset to the initial scenario state.")
         return self.get_current_state()
 
     def get_current_state(self) -> GameState:
-        """Returns a copy of the current game state."""
-        return self.game_state.model_copy(deep=True)
+        """
+        Returns the current game state snapshot. It is shared, not copied:
+        callers must treat it as read-only.
+        """
+        return self.game_state
+
+    def _set_state(self, state: GameState):
+        self.game_state = state.model_copy(
+            update={"version": self.game_state.version + 1}
+        )
+        self._notify_state_changed()
 
-    @staticmethod
-    async def _persist(repository_call, *args):
+    def _notify_state_changed(self):
+        self._state_changed.set()
+        self._state_changed = asyncio.Event()
+
+    @property
+    def has_state_waiters(self) -> bool:
+        return self._state_waiters > 0
+
+    async def wait_for_state_change(self, version: int, timeout: float):
+        """
+        Returns once the state version differs from `version`, a round being
+        processed finishes (committed or failed), or `timeout` seconds pass.
         """
-        Runs a blocking repository call off the event loop, so a slow MongoDB
-        cannot freeze every other request and open websocket.
+        if self.game_state.version != version:
+            return
+        changed = self._state_changed
+        self._state_waiters += 1
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._state_waiters -= 1
+
+    def _update_state(self, **updates):
+        """
+        Replaces the current snapshot with a shallow copy carrying `updates`.
+        Unchanged fields (and unchanged characters) are shared with the
+        previous snapshot, so updates must always pass new objects rather than
+        modify the ones already in the state.
         """
-        return await asyncio.to_thread(repository_call, *args)
+        self._set_state(self.game_state.model_copy(update=updates))
 
     async def start_game(self, character_id: str):
         """
@@ -120,10 +188,11 @@ class GameLoopService:
                 f"to play a different character."
             )
         if bound is None:
-            self.game_state.player_character_id = character_id
+            self._update_state(player_character_id=character_id)
             if self.state_repository is not None:
-                await self._persist(self.state_repository.save, self.game_state)
+                await self.state_repository.save(self.game_state)
             logger.info(f"Player bound to character '{character_id}'.")
+        self.speculate_ai_actions()
 
     def _ensure_player_is(self, character_id: str):
         """
@@ -162,12 +231,14 @@ class GameLoopService:
 
         # Lock all guesses on first call; ignore later attempts to change them.
         if self.game_state.player_undergame_guess is None:
-            self.game_state.player_undergame_guess = undergame_guess
-            self.game_state.ai_undergame_guesses = await self._generate_ai_guesses(
-                player_character_id
+            self._update_state(player_undergame_guess=undergame_guess)
+            self._update_state(
+                ai_undergame_guesses=await self._generate_ai_guesses(
+                    player_character_id
+                )
             )
             if self.state_repository is not None:
-                await self._persist(self.state_repository.save, self.game_state)
+                await self.state_repository.save(self.game_state)
 
         undergame_guesses = {
             player_character_id: self.game_state.player_undergame_guess,
@@ -203,7 +274,7 @@ class GameLoopService:
                         {
                             "character_name": character.name,
                             "character_perspective": character.perspective,
-                            "known_intel": "\n".join(character.known_intel) or "None.",
+                            "known_intel": format_known_intel(character),
                             "crisis_update": self.game_state.crisis_update,
                         }
                     ),
@@ -263,7 +334,7 @@ class GameLoopService:
 
     def _charge_action_costs(self, actions: List[Action]) -> Dict[str, Character]:
         """
-        Deducts each action's declared resource cost on a deep copy of the
+        Deducts each action's declared resource cost on copies of the paying
         characters, so the game economy does not depend on the Judge LLM doing
         arithmetic and a failed round leaves the live state untouched.
 
@@ -271,14 +342,17 @@ class GameLoopService:
         amounts are dropped and overspends are clamped to zero instead of
         failing the round.
         """
-        characters = {
-            char_id: char.model_copy(deep=True)
-            for char_id, char in self.game_state.characters.items()
-        }
+        live_characters = self.game_state.characters
+        characters = dict(live_characters)
         for action in actions:
             character = characters.get(action.character_id)
             if character is None:
                 continue
+            if character is live_characters[action.character_id]:
+                character = character.model_copy(
+                    update={"resources": dict(character.resources)}
+                )
+                characters[action.character_id] = character
             for resource, amount in action.resource_cost.items():
                 if resource not in character.resources or amount < 0:
                     logger.warning(
@@ -296,9 +370,14 @@ class GameLoopService:
                 character.resources[resource] = remaining
         return characters
 
-    def _deliver_private_intel(self, private_reports: Optional[List[PrivateIntel]]):
+    def _deliver_private_intel(
+        self,
+        characters: Dict[str, Character],
+        private_reports: Optional[List[PrivateIntel]],
+    ):
         """
-        Appends new intelligence reports to the appropriate characters' state.
+        Appends new intelligence reports to the recipients in `characters`,
+        replacing each recipient with an updated copy.
         """
         if not private_reports:
             return
@@ -308,20 +387,89 @@ class GameLoopService:
         )
         for report in private_reports:
             recipient_id = report.recipient_id
-            if recipient_id in self.game_state.characters:
-                self.game_state.characters[recipient_id].known_intel.append(
-                    report.report
+            recipient = characters.get(recipient_id)
+            if recipient is not None:
+                characters[recipient_id] = recipient.model_copy(
+                    update={"known_intel": [*recipient.known_intel, report.report]}
                 )
             else:
                 logger.warning(
                     f"Could not deliver intel to non-existent character ID: {recipient_id}"
                 )
 
-    def _apply_victory_points(self, vp_awards: Optional[List[VictoryPointAward]]):
+    async def _compact_intel(self) -> Dict[str, IntelDigest]:
+        """
+        Folds each AI character's older intelligence reports into its digest,
+        concurrently. A character whose digest fails or times out keeps its
+        reports verbatim and is retried next round.
+        """
+        due = {
+            char_id: (character, folded)
+            for char_id, character in self.game_state.characters.items()
+            if char_id != self.game_state.player_character_id
+            and (
+                folded := reports_to_fold(
+                    character,
+                    settings.INTEL_RECENT_REPORTS,
+                    settings.INTEL_COMPACTION_BATCH,
+                )
+            )
+        }
+        if not due:
+            return {}
+        digest_chain = get_intel_digest_chain()
+
+        async def digest_for(character: Character, folded: List[str]) -> IntelDigest:
+            digest = await asyncio.wait_for(
+                digest_chain.ainvoke(
+                    {
+                        "character_name": character.name,
+                        "intel_digest": character.intel_digest or "None yet.",
+                        "reports": "\n".join(folded),
+                    }
+                ),
+                timeout=settings.AI_ACTION_TIMEOUT_SECONDS,
+            )
+            return IntelDigest(digest=digest.strip(), folded_reports=folded)
+
+        results = await asyncio.gather(
+            *(digest_for(character, folded) for character, folded in due.values()),
+            return_exceptions=True,
+        )
+        digests = {}
+        for char_id, result in zip(due, results):
+            if isinstance(result, BaseException) or not result.digest:
+                logger.warning(
+                    f"Could not summarize the intel of '{char_id}': {result!r}"
+                )
+                continue
+            logger.info(
+                f"Folded {len(result.folded_reports)} intel reports of '{char_id}' "
+                f"into its digest."
+            )
+            digests[char_id] = result
+        return digests
+
+    def _apply_intel_digests(
+        self, characters: Dict[str, Character], digests: Dict[str, IntelDigest]
+    ):
+        """Swaps folded reports for the new digests in `characters`, copy-on-write."""
+        for char_id, digest in digests.items():
+            character = characters.get(char_id)
+            if character is not None:
+                characters[char_id] = apply_intel_digest(character, digest)
+
+    def _apply_victory_points(
+        self,
+        characters: Dict[str, Character],
+        vp_awards: Optional[List[VictoryPointAward]],
+    ):
+        """Adds the (clamped) awards to the characters in `characters`, copy-on-write."""
         if not vp_awards:
             return
         for award in vp_awards:
-            if award.character_id not in self.game_state.characters:
+            character = characters.get(award.character_id)
+            if character is None:
                 logger.warning(
                     f"Ignoring VP award for unknown character '{award.character_id}'."
                 )
@@ -332,11 +480,20 @@ class GameLoopService:
                     f"Judge awarded {award.points_awarded} VP to "
                     f"'{award.character_id}'; clamped to {points}."
                 )
-            self.game_state.characters[award.character_id].victory_points += points
+            characters[award.character_id] = character.model_copy(
+                update={"victory_points": character.victory_points + points}
+            )
             logger.info(
                 f"Awarded {points} VP to {award.character_id} for: {award.reason}"
             )
 
+    def _publish(self, event_type: RoundEventType, **fields):
+        self.events.publish(
+            RoundEvent(
+                type=event_type, round_number=self.game_state.round_number, **fields
+            )
+        )
+
     def _fallback_action(self, character: Character) -> Action:
         """
         A safe default action used when an AI delegate fails to produce one in time,
@@ -351,59 +508,157 @@ class GameLoopService:
             resource_cost={},
         )
 
-    async def _run_ai_delegate_turns(self) -> List[Action]:
-        """
-        Invokes the action agent for all AI characters concurrently.
+    def _action_agent_input(self, character: Character) -> dict:
+        """Builds the action agent's input for `character` from the current round."""
+        dossier_entries = []
+        for other_char in self.game_state.characters.values():
+            if other_char.id != character.id:
+                entry = (
+                    f"- **{other_char.name}**\n  Perspective: {other_char.perspective}"
+                )
+                dossier_entries.append(entry)
+
+        return {
+            "character": character,
+            "crisis_update": self.game_state.crisis_update,
+            "other_players_dossier": "\n".join(dossier_entries),
+        }
+
+    async def _get_ai_action(
+        self, character: Character, agent_input: dict, round_number: int
+    ) -> tuple[Action, bool]:
         """
-        ai_characters = [
-            char
-            for char_id, char in self.game_state.characters.items()
-            if char_id not in self.submitted_actions
-        ]
+        Invokes the action agent for one AI character, falling back to a safe
+        default on error or timeout.
 
-        async def get_single_action(character: Character) -> Action:
-            graph_builder = create_action_graph()
-            graph = graph_builder.compile()
+        Returns:
+            The action, and whether the fallback was used.
+        """
+        try:
+            graph = get_compiled_action_graph()
             opik_tracer = OpikTracer(
-                graph=graph.get_graph(xray=True), project_name=settings.COMET_PROJECT
+                graph=get_action_graph_description(),
+                project_name=settings.COMET_PROJECT,
             )
-            thread_id = f"{character.id}-action-round-{self.game_state.round_number}"
             config = {
-                "configurable": {"thread_id": thread_id},
+                "configurable": {
+                    "thread_id": (
+                        f"{self.game_id}-{character.id}-action-round-{round_number}"
+                    )
+                },
                 "callbacks": [opik_tracer],
             }
+            result = await asyncio.wait_for(
+                graph.ainvoke(input=agent_input, config=config),
+                timeout=settings.AI_ACTION_TIMEOUT_SECONDS,
+            )
+            return result["action"], False
+        except Exception as e:
+            logger.error(
+                f"AI delegate '{character.id}' failed to produce an action, "
+                f"using fallback: {e}"
+            )
+            return self._fallback_action(character), True
 
-            dossier_entries = []
-            all_characters = self.game_state.characters
-            for char_id, other_char in all_characters.items():
-                if other_char.id != character.id:
-                    entry = f"- **{other_char.name}**\n  Perspective: {other_char.perspective}"
-                    dossier_entries.append(entry)
-
-            other_players_dossier = "\n".join(dossier_entries)
-            initial_state = {
-                "character": character,
-                "crisis_update": self.game_state.crisis_update,
-                "other_players_dossier": other_players_dossier,
-            }
-            result = await graph.ainvoke(input=initial_state, config=config)
-            return result["action"]
+    def speculate_ai_actions(self):
+        """
+        Starts computing the AI delegates' actions for the current round in the
+        background, while the human is still deciding. Delegates never see the
+        human's action, so the results stay valid until the round is resolved,
+        and `advance_round` only has to wait for the judge.
 
-        async def get_action_with_fallback(character: Character) -> Action:
-            try:
-                return await asyncio.wait_for(
-                    get_single_action(character),
-                    timeout=settings.AI_ACTION_TIMEOUT_SECONDS,
+        Does nothing when disabled, once the game is over, before a player is
+        bound, or when this round is already being precomputed.
+        """
+        if not settings.SPECULATIVE_AI_ACTIONS or self.is_game_over:
+            return
+        player_id = self.game_state.player_character_id
+        if player_id is None:
+            return
+        round_number = self.game_state.round_number
+        if (
+            self._speculative_round == round_number
+            and self._speculative_actions
+            and not any(task.cancelled() for task in self._speculative_actions.values())
+        ):
+            return
+
+        self.discard_speculative_actions()
+        self._speculative_round = round_number
+        # Inputs are built now, so each run sees exactly the round it was started for.
+        self._speculative_actions = {
+            char_id: asyncio.create_task(
+                self._get_ai_action(
+                    character, self._action_agent_input(character), round_number
                 )
-            except Exception as e:
-                logger.error(
-                    f"AI delegate '{character.id}' failed to produce an action, "
-                    f"using fallback: {e}"
+            )
+            for char_id, character in self.game_state.characters.items()
+            if char_id != player_id and char_id not in self.submitted_actions
+        }
+        logger.info(
+            f"Precomputing {len(self._speculative_actions)} AI actions for round "
+            f"{round_number} of game '{self.game_id}'."
+        )
+
+    def discard_speculative_actions(self):
+        """Cancels any precomputed AI actions that have not been used."""
+        for task in self._speculative_actions.values():
+            task.cancel()
+        self._speculative_actions = {}
+        self._speculative_round = None
+
+    def _take_speculative_actions(self) -> Dict[str, asyncio.Task]:
+        """
+        Hands over the precomputed actions for the current round, if any.
+        Runs started for another round or cancelled are dropped.
+        """
+        tasks = self._speculative_actions
+        is_current_round = self._speculative_round == self.game_state.round_number
+        self._speculative_actions = {}
+        self._speculative_round = None
+        if not is_current_round:
+            for task in tasks.values():
+                task.cancel()
+            return {}
+        loop = asyncio.get_running_loop()
+        return {
+            char_id: task
+            for char_id, task in tasks.items()
+            if not task.cancelled() and task.get_loop() is loop
+        }
+
+    async def _run_ai_delegate_turns(self) -> List[Action]:
+        """
+        Collects the actions of all AI characters concurrently, reusing the
+        ones precomputed when the round opened.
+        """
+        ai_characters = [
+            char
+            for char_id, char in self.game_state.characters.items()
+            if char_id not in self.submitted_actions
+        ]
+        speculative = self._take_speculative_actions()
+        round_number = self.game_state.round_number
+
+        async def get_action(character: Character) -> Action:
+            task = speculative.pop(character.id, None)
+            if task is not None:
+                action, used_fallback = await task
+            else:
+                action, used_fallback = await self._get_ai_action(
+                    character, self._action_agent_input(character), round_number
                 )
-                return self._fallback_action(character)
+            self._publish(
+                RoundEventType.DELEGATE_FINISHED,
+                character_id=character.id,
+                used_fallback=used_fallback,
+            )
+            return action
 
-        tasks = [get_action_with_fallback(char) for char in ai_characters]
-        ai_actions = await asyncio.gather(*tasks)
+        ai_actions = await asyncio.gather(*(get_action(c) for c in ai_characters))
+        # Precomputed for a character that has since acted itself.
+        for task in speculative.values():
+            task.cancel()
         return ai_actions
 
     async def _run_judge_turn(
@@ -421,37 +676,40 @@ class GameLoopService:
         have already been deducted deterministically, and the judge sees that
         state as the authoritative one.
         """
-        graph_builder = create_judge_graph()
-        graph = graph_builder.compile()
+        graph = get_compiled_judge_graph()
         opik_tracer = OpikTracer(
-            graph=graph.get_graph(xray=True), project_name=settings.COMET_PROJECT
+            graph=get_judge_graph_description(), project_name=settings.COMET_PROJECT
         )
-        thread_id = f"judge-resolution-round-{self.game_state.round_number}"
-        config = {"configurable": {"thread_id": thread_id}, "callbacks": [opik_tracer]}
-        state_for_judge = self.game_state.model_copy(deep=True)
-        state_for_judge.characters = characters
-        # Keep the judge's input lean: last_round_actions duplicates what the
-        # judge already saw, and the prompt grows each round — a bloated state
-        # JSON blows the per-minute token limit on free-tier Groq. known_intel
-        # only ever grows and the judge writes intel rather than reading it,
-        # so past reports are excluded too.
-        current_state_json_str = state_for_judge.model_dump_json(
-            exclude={
-                "last_round_actions": True,
-                "player_undergame_guess": True,
-                "ai_undergame_guesses": True,
-                "characters": {"__all__": {"known_intel"}},
-            }
+        thread_id = (
+            f"{self.game_id}-judge-resolution-round-{self.game_state.round_number}"
         )
+        config = {"configurable": {"thread_id": thread_id}, "callbacks": [opik_tracer]}
+        # The resolution node serializes these compactly and within the
+        # judge's token budget (see workflow/judge_prompt.py).
         initial_state = {
-            "current_game_state_json": current_state_json_str,
+            "round_number": self.game_state.round_number,
+            "current_crisis_update": self.game_state.crisis_update,
             "actions": all_actions,
             "characters": characters,
             "undergame_plot": self.undergame_plot,
         }
+
+        async def resolve() -> dict:
+            # The crisis update is published as the judge writes it (the
+            # "custom" stream); the economy only changes once the final
+            # state arrives, at commit.
+            result = {}
+            async for mode, chunk in graph.astream(
+                input=initial_state, config=config, stream_mode=["custom", "values"]
+            ):
+                if mode == "custom":
+                    self._publish(RoundEventType.JUDGE_NARRATIVE, **chunk)
+                else:
+                    result = chunk
+            return result
+
         result = await asyncio.wait_for(
-            graph.ainvoke(input=initial_state, config=config),
-            timeout=settings.JUDGE_TIMEOUT_SECONDS,
+            resolve(), timeout=settings.JUDGE_TIMEOUT_SECONDS
         )
 
         return (
@@ -478,14 +736,20 @@ class GameLoopService:
                 logger.exception(
                     f"Failed to resolve round {self.game_state.round_number}."
                 )
+                self._publish(RoundEventType.ROUND_FAILED)
                 raise
             finally:
                 self.is_processing_round = False
+                self._notify_state_changed()
 
     async def _advance_round(self) -> GameState:
-        logger.info(f"--- Processing Round {self.game_state.round_number} ---")
+        logger.info(
+            f"--- Processing Round {self.game_state.round_number} "
+            f"of game '{self.game_id}' ---"
+        )
 
         # 1. Get actions from all AI delegates
+        self._publish(RoundEventType.DELEGATES_STARTED)
         ai_actions = await self._run_ai_delegate_turns()
         for action in ai_actions:
             self.submitted_actions[action.character_id] = action
@@ -493,31 +757,45 @@ class GameLoopService:
         all_actions_for_round = list(self.submitted_actions.values())
 
         # 2. Pay declared action costs deterministically (on a copy, so a
-        # failed round stays retriable), then resolve with the AI Judge.
+        # failed round stays retriable), then resolve with the AI Judge. The
+        # judge never reads intel, so older reports are summarized meanwhile.
         settled_characters = self._charge_action_costs(all_actions_for_round)
-        (
-            new_crisis_update,
-            updated_characters,
-            private_reports,
-            victory_point_awards,
-        ) = await self._run_judge_turn(all_actions_for_round, settled_characters)
-
-        # 3. Update the master game state for the new round.
-        self.game_state.round_number += 1
-        self.game_state.crisis_update = new_crisis_update
-        self.game_state.characters = updated_characters
-        self.game_state.last_round_actions = all_actions_for_round
-        self._deliver_private_intel(private_reports)
-        self._apply_victory_points(victory_point_awards)
+        self._publish(RoundEventType.JUDGE_STARTED)
+        compaction = asyncio.create_task(self._compact_intel())
+        try:
+            (
+                new_crisis_update,
+                updated_characters,
+                private_reports,
+                victory_point_awards,
+            ) = await self._run_judge_turn(all_actions_for_round, settled_characters)
+        except BaseException:
+            compaction.cancel()
+            raise
+        intel_digests = await compaction
+
+        # 3. Publish the new round's state as a single new snapshot.
+        characters = dict(updated_characters)
+        self._deliver_private_intel(characters, private_reports)
+        self._apply_intel_digests(characters, intel_digests)
+        self._apply_victory_points(characters, victory_point_awards)
+        self._update_state(
+            round_number=self.game_state.round_number + 1,
+            crisis_update=new_crisis_update,
+            characters=characters,
+            last_round_actions=all_actions_for_round,
+        )
 
         # 4. Reset submitted actions for the next round
         self.submitted_actions = {}
 
         if self.state_repository is not None:
-            await self._persist(self.state_repository.save, self.game_state)
+            await self.state_repository.save(self.game_state)
 
         logger.info(f"--- Round {self.game_state.round_number} has begun! ---")
         if self.game_state.round_number > self.max_rounds:
             self.is_game_over = True
             logger.info("--- FINAL ROUND COMPLETE. GAME OVER. ---")
+        self._publish(RoundEventType.ROUND_COMMITTED, is_game_over=self.is_game_over)
+        self.speculate_ai_actions()
         return self.get_current_state()
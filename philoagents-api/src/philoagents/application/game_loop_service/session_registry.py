@@ -0,0 +1,175 @@
+import asyncio
+import time
+import weakref
+from typing import Callable, Dict, Optional
+
+from loguru import logger
+
+from philoagents.application.game_loop_service.service import GameLoopService
+from philoagents.config import settings
+from philoagents.domain import CharacterFactory
+from philoagents.domain.game_state import GameState
+from philoagents.infrastructure.mongo import GameStateRepository
+
+
+class _GameSession:
+    """A hosted game and the last time a request touched it."""
+
+    def __init__(self, service: GameLoopService, last_used: float):
+        self.service = service
+        self.last_used = last_used
+
+
+class GameSessionRegistry:
+    """
+    Hosts one GameLoopService per game id, so a single API process can run
+    many independent games.
+
+    Each session has its own state, round lock and persistence document.
+    Sessions are created lazily on first access, resuming the game's saved
+    state if there is one, and evicted from memory once idle. Every state
+    change is already persisted, so an evicted game simply resumes on its
+    next request.
+    """
+
+    def __init__(
+        self,
+        initial_state: GameState,
+        undergame_plot: str,
+        factory: CharacterFactory,
+        undergame_plot_display: str,
+        state_repository: Optional[GameStateRepository] = None,
+        idle_timeout_seconds: float = settings.GAME_SESSION_IDLE_TIMEOUT_SECONDS,
+        max_active_sessions: int = settings.GAME_SESSION_MAX_ACTIVE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._initial_state = initial_state.model_copy(deep=True)
+        self.undergame_plot = undergame_plot
+        self.undergame_plot_display = undergame_plot_display
+        self.factory = factory
+        self.state_repository = state_repository
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_active_sessions = max_active_sessions
+        self._clock = clock
+        self._sessions: Dict[str, _GameSession] = {}
+        # One lock per game being created, so two first requests for the same
+        # game cannot build two services, while different games load in
+        # parallel. A lock lives as long as a request holds or awaits it, so a
+        # late request never gets a new one while an earlier waiter still
+        # holds the old.
+        self._creation_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self._sessions
+
+    async def get(self, game_id: str) -> GameLoopService:
+        """
+        Returns the service hosting `game_id`, creating (and resuming) it on
+        first access.
+
+        Raises:
+            RuntimeError: If the registry is full and no session is idle
+                enough to be evicted.
+        """
+        session = self._sessions.get(game_id)
+        if session is None:
+            lock = self._creation_locks.setdefault(game_id, asyncio.Lock())
+            async with lock:
+                session = self._sessions.get(game_id)
+                if session is None:
+                    session = await self._create(game_id)
+        session.last_used = self._clock()
+        return session.service
+
+    async def _create(self, game_id: str) -> _GameSession:
+        if len(self._sessions) >= self.max_active_sessions:
+            self._evict_least_recently_used()
+
+        repository = (
+            self.state_repository.for_game(game_id)
+            if self.state_repository is not None
+            else None
+        )
+        service = GameLoopService(
+            initial_state=self._initial_state,
+            undergame_plot=self.undergame_plot,
+            factory=self.factory,
+            undergame_plot_display=self.undergame_plot_display,
+            state_repository=repository,
+            game_id=game_id,
+        )
+        if not await service.try_resume():
+            logger.info(f"No saved game found for '{game_id}'; starting a new game.")
+        # No AI actions are precomputed here: a status poll would otherwise
+        # spend LLM calls on every idle game it loads. They start once the
+        # player (re)starts the game or a new round opens.
+
+        session = _GameSession(service, last_used=self._clock())
+        self._sessions[game_id] = session
+        logger.info(f"Game session '{game_id}' opened ({len(self)} active).")
+        return session
+
+    @staticmethod
+    def _is_evictable(session: _GameSession) -> bool:
+        # A round being resolved, a connected event stream or a long-polling
+        # status request still holds the service; evicting it would let the
+        # next request resume a second copy of the same game.
+        service = session.service
+        return not (
+            service.is_processing_round
+            or service.events.has_subscribers
+            or service.has_state_waiters
+        )
+
+    def _evict_least_recently_used(self) -> None:
+        candidates = [
+            (session.last_used, game_id)
+            for game_id, session in self._sessions.items()
+            if self._is_evictable(session)
+        ]
+        if not candidates:
+            raise RuntimeError(
+                "The server is hosting the maximum number of games. Try again later."
+            )
+        _, game_id = min(candidates)
+        self._evict(game_id)
+
+    def _evict(self, game_id: str) -> None:
+        session = self._sessions.pop(game_id)
+        session.service.discard_speculative_actions()
+        logger.info(f"Game session '{game_id}' evicted ({len(self)} active).")
+
+    def evict_idle(self) -> int:
+        """
+        Drops every session that has not been used within the idle timeout.
+
+        Returns:
+            The number of sessions evicted.
+        """
+        now = self._clock()
+        idle_ids = [
+            game_id
+            for game_id, session in self._sessions.items()
+            if now - session.last_used >= self.idle_timeout_seconds
+            and self._is_evictable(session)
+        ]
+        for game_id in idle_ids:
+            self._evict(game_id)
+        return len(idle_ids)
+
+    async def run_eviction_loop(
+        self,
+        interval_seconds: float = settings.GAME_SESSION_SWEEP_INTERVAL_SECONDS,
+    ):
+        """Periodically evicts idle sessions. Runs until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                self.evict_idle()
+            except Exception:
+                logger.exception("Failed to evict idle game sessions.")
@@ -1,15 +1,19 @@
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.utils.function_calling import convert_to_json_schema
 from langchain_groq import ChatGroq
 
 from philoagents.config import settings
 from philoagents.domain import Action
 from philoagents.domain.prompts import (
     DELEGATE_ACTION_PROMPT,
+    INTEL_DIGEST_PROMPT,
     JUDGE_RESOLUTION_PROMPT,
     UNDERGAME_GUESS_PROMPT,
 )
 from philoagents.domain.resources import JudgeOutput
+from philoagents.infrastructure.groq_rate_limiter import RateLimitedChatGroq
+from philoagents.infrastructure.llm_cache import get_llm_cache
 
 
 def get_chat_model(
@@ -25,10 +29,12 @@ def get_chat_model(
         # Qwen3 emits <think> blocks that would leak into plain-text output;
         # disable reasoning entirely (it also burns the max_tokens budget).
         kwargs["reasoning_effort"] = "none"
-    return ChatGroq(
+    return RateLimitedChatGroq(
         api_key=settings.GROQ_API_KEY,
+        base_url=settings.GROQ_API_BASE,
         model=model_name,
         temperature=temperature,
+        cache=get_llm_cache(),
         max_tokens=max_tokens,
         **kwargs,
     )
@@ -69,7 +75,11 @@ def get_judge_resolution_chain():
     `JudgeOutput` Pydantic model.
 
     Returns:
-        A compiled LCEL chain ready for invocation.
+        A compiled LCEL chain returning the model's message, whose content is
+        the `JudgeOutput` JSON. It is left unparsed so that a caller streaming
+        it can read the crisis update as it is written and still validate the
+        complete text strictly. It has no retry of its own: a retried stream
+        would be interleaved with the failed one, so the caller retries.
     """
     # Use a higher temperature to encourage more creative and narrative-rich crisis updates.
     # The judge's structured output (narrative + full state for every character) is
@@ -81,7 +91,17 @@ def get_judge_resolution_chain():
         max_tokens=settings.GROQ_JUDGE_MAX_TOKENS,
     )
 
-    structured_llm = model.with_structured_output(JudgeOutput, method="json_schema")
+    # What with_structured_output(method="json_schema") binds, minus its
+    # parser.
+    structured_llm = model.bind(
+        response_format={
+            "type": "json_schema",
+            "json_schema": {
+                "name": JudgeOutput.__name__,
+                "schema": convert_to_json_schema(JudgeOutput),
+            },
+        }
+    )
     prompt = ChatPromptTemplate.from_messages(
         [
             ("system", JUDGE_RESOLUTION_PROMPT.prompt),
@@ -89,7 +109,7 @@ def get_judge_resolution_chain():
         template_format="jinja2",
     )
 
-    return (prompt | structured_llm).with_retry(stop_after_attempt=3)
+    return prompt | structured_llm
 
 
 def get_undergame_guess_chain():
@@ -106,3 +126,23 @@ def get_undergame_guess_chain():
     )
 
     return (prompt | model | StrOutputParser()).with_retry(stop_after_attempt=2)
+
+
+def get_intel_digest_chain():
+    """
+    Creates the LCEL chain that folds a character's older intelligence
+    reports into its running digest. Returns plain text.
+    """
+    model = get_chat_model(
+        temperature=0.2,
+        model_name=settings.GROQ_LLM_MODEL_SUMMARY,
+        max_tokens=settings.GROQ_INTEL_DIGEST_MAX_TOKENS,
+    )
+    prompt = ChatPromptTemplate.from_messages(
+        [
+            ("system", INTEL_DIGEST_PROMPT.prompt),
+        ],
+        template_format="jinja2",
+    )
+
+    return (prompt | model | StrOutputParser()).with_retry(stop_after_attempt=2)
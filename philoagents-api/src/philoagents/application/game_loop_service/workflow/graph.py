@@ -65,6 +65,38 @@ def create_judge_graph():
     return graph_builder
 
 
+# --- Compiled graphs, shared process-wide ---
+#
+# Both graphs run without a checkpointer, so one compiled instance can serve
+# every delegate and every round concurrently. Compiling and walking the xray
+# graph for tracing is pure CPU work, so it happens once per process instead
+# of once per delegate per round.
+
+
+@lru_cache(maxsize=1)
+def get_compiled_action_graph():
+    """Returns the action graph, compiled once per process."""
+    return create_action_graph().compile()
+
+
+@lru_cache(maxsize=1)
+def get_action_graph_description():
+    """Returns the action graph's xray description, used by the Opik tracer."""
+    return get_compiled_action_graph().get_graph(xray=True)
+
+
+@lru_cache(maxsize=1)
+def get_compiled_judge_graph():
+    """Returns the judge graph, compiled once per process."""
+    return create_judge_graph().compile()
+
+
+@lru_cache(maxsize=1)
+def get_judge_graph_description():
+    """Returns the judge graph's xray description, used by the Opik tracer."""
+    return get_compiled_judge_graph().get_graph(xray=True)
+
+
 # Compiled without a checkpointer. Used for LangGraph Studio
-action_agent_graph = create_action_graph().compile()
-judge_agent_graph = create_judge_graph().compile()
+action_agent_graph = get_compiled_action_graph()
+judge_agent_graph = get_compiled_judge_graph()
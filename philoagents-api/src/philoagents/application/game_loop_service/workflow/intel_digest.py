@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from typing import List
+
+from loguru import logger
+
+from philoagents.domain import Character
+
+
+@dataclass
+class IntelDigest:
+    """A character's rewritten digest and the reports it now summarizes."""
+
+    digest: str
+    folded_reports: List[str]
+
+
+def format_known_intel(character: Character) -> str:
+    """Renders a character's intelligence for a prompt: the digest of its
+    older reports, if any, followed by the recent ones verbatim."""
+    recent = "\n".join(character.known_intel)
+    if not character.intel_digest:
+        return recent or "None."
+    return (
+        f"Summary of earlier reports:\n{character.intel_digest}\n\n"
+        f"Recent reports:\n{recent or 'None.'}"
+    )
+
+
+def reports_to_fold(character: Character, keep_recent: int, batch: int) -> List[str]:
+    """
+    The oldest reports to fold into the digest, keeping the latest
+    `keep_recent` verbatim. Nothing is folded until at least `batch` reports
+    are due, so the digest is rewritten every few rounds, not every round.
+    """
+    due = len(character.known_intel) - keep_recent
+    if due < max(batch, 1):
+        return []
+    return character.known_intel[:due]
+
+
+def apply_intel_digest(character: Character, digest: IntelDigest) -> Character:
+    """
+    Replaces the folded reports with the digest. The reports delivered since
+    the digest was requested are appended after the folded ones, so they stay.
+    """
+    folded = len(digest.folded_reports)
+    if character.known_intel[:folded] != digest.folded_reports:
+        logger.warning(
+            f"Intel of '{character.id}' changed while it was being summarized; "
+            f"keeping it verbatim this round."
+        )
+        return character
+    return character.model_copy(
+        update={
+            "known_intel": character.known_intel[folded:],
+            "intel_digest": digest.digest,
+        }
+    )
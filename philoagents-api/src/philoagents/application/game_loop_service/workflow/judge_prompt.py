@@ -0,0 +1,177 @@
+import json
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from philoagents.domain import Action, Character
+
+# The tokenizer the RAG splitter uses (see rag/splitters.py). Groq's models
+# tokenize differently, so counts are an estimate for budgeting, not exact.
+ENCODING_NAME = "cl100k_base"
+# Characters per token assumed when the tokenizer cannot be loaded (its
+# vocabulary is downloaded on first use).
+FALLBACK_CHARS_PER_TOKEN = 4
+# Below this many tokens a truncated text is more noise than signal; it is
+# dropped instead.
+MIN_TRUNCATED_TOKENS = 16
+
+
+class TokenCounter:
+    """Counts and truncates text in tokens, estimating from its length when
+    no tokenizer is available."""
+
+    def __init__(self, encoding: Optional[Any] = None):
+        self.encoding = encoding
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            return math.ceil(len(text) / FALLBACK_CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if self.count(text) <= max_tokens:
+            return text
+        if self.encoding is None:
+            clipped = text[: max_tokens * FALLBACK_CHARS_PER_TOKEN]
+        else:
+            clipped = self.encoding.decode(self.encoding.encode(text)[:max_tokens])
+        return clipped.rstrip() + "…"
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> TokenCounter:
+    try:
+        import tiktoken
+
+        return TokenCounter(tiktoken.get_encoding(ENCODING_NAME))
+    except Exception as e:
+        logger.warning(
+            f"Could not load the {ENCODING_NAME} tokenizer ({e}); estimating "
+            f"judge prompt sizes from their length instead."
+        )
+        return TokenCounter()
+
+
+@dataclass
+class JudgePrompt:
+    """The judge prompt's variable sections and what they cost."""
+
+    game_state: str
+    actions: str
+    fixed_tokens: int
+    game_state_tokens: int
+    actions_tokens: int
+    budget: int
+    truncated: List[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return self.fixed_tokens + self.game_state_tokens + self.actions_tokens
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def _compact_actions(actions: List[Action]) -> List[dict]:
+    compact = []
+    for action in actions:
+        entry = {"by": action.character_id, "type": action.action_type.value}
+        if action.resource_cost:
+            entry["cost"] = action.resource_cost
+        entry["details"] = action.action_details
+        compact.append(entry)
+    return compact
+
+
+def _compact_character(character: Character) -> dict:
+    # Name, perspective and style only shape dialogue; past intel is written,
+    # never read, by the judge. Goals are added separately, within budget.
+    entry: Dict[str, Any] = {"res": character.resources}
+    if character.statuses:
+        entry["st"] = character.statuses
+    entry["vp"] = character.victory_points
+    return entry
+
+
+def build_judge_prompt(
+    round_number: int,
+    crisis_update: str,
+    characters: Dict[str, Character],
+    actions: List[Action],
+    fixed_text: str,
+    budget: int,
+    counter: Optional[TokenCounter] = None,
+) -> JudgePrompt:
+    """
+    Serializes the judge's inputs compactly (no indentation, short keys) and
+    fits them into `budget` tokens, counting `fixed_text` (the template and
+    the Undergame plot) against it.
+
+    The actions and each character's resources, statuses and VP are always
+    sent. The remaining budget goes first to the previous crisis update, then
+    is shared evenly by the characters' goals; whatever does not fit is
+    truncated, or dropped when too little room is left.
+    """
+    counter = counter or get_token_counter()
+    actions_json = _compact_json(_compact_actions(actions))
+    state = {
+        "round": round_number,
+        "crisis": "",
+        "characters": {
+            character_id: _compact_character(character)
+            for character_id, character in characters.items()
+        },
+    }
+    fixed_tokens = counter.count(fixed_text)
+    actions_tokens = counter.count(actions_json)
+    remaining = (
+        budget - fixed_tokens - actions_tokens - counter.count(_compact_json(state))
+    )
+    truncated: List[str] = []
+
+    def fit(
+        name: str, key: str, text: str, allowance: int
+    ) -> tuple[Optional[str], int]:
+        """Returns `text`, cut to fit `allowance`, and what it costs as `key`."""
+        cost = counter.count(_compact_json({key: text}))
+        if cost <= allowance:
+            return text, cost
+        truncated.append(name)
+        # Leave room for the key, the quotes and the ellipsis.
+        room = allowance - counter.count(_compact_json({key: ""})) - 1
+        if room < MIN_TRUNCATED_TOKENS:
+            return None, 0
+        text = counter.truncate(text, room)
+        return text, counter.count(_compact_json({key: text}))
+
+    crisis, cost = fit("crisis", "crisis", crisis_update, remaining)
+    if crisis is None:
+        del state["crisis"]
+    else:
+        state["crisis"] = crisis
+        remaining -= cost
+
+    # Shortest goals first, so the share a short goal leaves unused goes to
+    # the longer ones.
+    by_length = sorted(characters.values(), key=lambda c: len(c.goals))
+    for index, character in enumerate(by_length):
+        share = remaining // (len(by_length) - index) if remaining > 0 else 0
+        goals, cost = fit(f"goals:{character.id}", "goals", character.goals, share)
+        if goals is not None:
+            state["characters"][character.id]["goals"] = goals
+            remaining -= cost
+
+    game_state_json = _compact_json(state)
+    return JudgePrompt(
+        game_state=game_state_json,
+        actions=actions_json,
+        fixed_tokens=fixed_tokens,
+        game_state_tokens=counter.count(game_state_json),
+        actions_tokens=actions_tokens,
+        budget=budget,
+        truncated=truncated,
+    )
@@ -1,18 +1,36 @@
-import json
-from typing import Dict, List
+import os
+import time
+from typing import Dict, List, Optional
 
+from langchain_core.utils.json import parse_partial_json
+from langgraph.config import get_stream_writer
 from loguru import logger
 
 from philoagents.application.game_loop_service.workflow.chains import (
     get_character_action_chain,
     get_judge_resolution_chain,
 )
+from philoagents.application.game_loop_service.workflow.intel_digest import (
+    format_known_intel,
+)
+from philoagents.application.game_loop_service.workflow.judge_prompt import (
+    build_judge_prompt,
+)
 from philoagents.application.game_loop_service.workflow.state import (
     ActionState,
     ResolutionState,
 )
+from philoagents.config import settings
 from philoagents.domain import Character
-from philoagents.domain.resources import CharacterStatusUpdate, ResourceChange
+from philoagents.domain.prompts import JUDGE_RESOLUTION_PROMPT
+from philoagents.domain.resources import (
+    CharacterStatusUpdate,
+    JudgeOutput,
+    ResourceChange,
+)
+
+# Attempts at the judge's call before the round fails.
+JUDGE_ATTEMPTS = 3
 
 # --- Delegate Action Agent Node ---
 
@@ -38,7 +56,7 @@ async def action_decision_node(state: ActionState) -> Dict:
             "character_goals": character.goals,
             "character_resources": character.resources,
             "character_statuses": character.statuses or "None.",
-            "known_intel": "\n".join(character.known_intel) or "None.",
+            "known_intel": format_known_intel(character),
             "other_players_dossier": state["other_players_dossier"],
             "crisis_update": state["crisis_update"],
         }
@@ -79,9 +97,14 @@ def _apply_judge_output(
       resource is ignored.
     - Statuses are narrative, not arithmetic: each listed character's status
       dictionary is replaced wholesale; unlisted characters keep theirs.
+
+    The input characters may be shared with the live game state snapshot, so
+    they are never mutated: a changed character is copied on its first change
+    and untouched characters are returned as-is.
     """
+    updated = dict(characters)
     for change in resource_changes:
-        character = characters.get(change.character_id)
+        character = updated.get(change.character_id)
         if character is None:
             logger.warning(
                 f"Judge referenced unknown character '{change.character_id}'; "
@@ -106,6 +129,11 @@ def _apply_judge_output(
                 f"'{change.character_id}' with only {current} available; "
                 f"clamping to 0."
             )
+        if character is characters[change.character_id]:
+            character = character.model_copy(
+                update={"resources": dict(character.resources)}
+            )
+            updated[change.character_id] = character
         character.resources[change.resource] = new_value
         logger.info(
             f"{change.character_id}: {change.resource} "
@@ -113,16 +141,68 @@ def _apply_judge_output(
         )
 
     for update in status_updates:
-        character = characters.get(update.character_id)
+        character = updated.get(update.character_id)
         if character is None:
             logger.warning(
                 f"Judge referenced unknown character '{update.character_id}'; "
                 f"ignoring the status update."
             )
             continue
-        character.statuses = update.statuses
+        updated[update.character_id] = character.model_copy(
+            update={"statuses": update.statuses}
+        )
+
+    return updated
+
+
+def _narrative_update(sent: str, narrative: str) -> Dict:
+    """The part of `narrative` that differs from what was `sent` before."""
+    offset = len(os.path.commonprefix([sent, narrative]))
+    return {"offset": offset, "text": narrative[offset:]}
+
 
-    return characters
+def _partial_narrative(text: str) -> Optional[str]:
+    """The crisis update found so far in the judge's incomplete JSON output."""
+    partial = parse_partial_json(text) if text else None
+    if isinstance(partial, dict) and isinstance(partial.get("crisis_update"), str):
+        return partial["crisis_update"]
+    return None
+
+
+async def _stream_judge_output(chain, inputs: Dict) -> JudgeOutput:
+    """
+    Streams the judge's output, passing the crisis update to the graph's
+    custom stream as it is written (at most every JUDGE_NARRATIVE_FLUSH_MS),
+    and validates the complete text. A failed attempt is retried from scratch,
+    and the narrative it streamed is restarted.
+    """
+    write = get_stream_writer()
+    flush_interval = settings.JUDGE_NARRATIVE_FLUSH_MS / 1000
+    for attempt in range(1, JUDGE_ATTEMPTS + 1):
+        text = ""
+        sent = ""
+        flushed_at = 0.0
+        try:
+            async for chunk in chain.astream(inputs):
+                text += chunk.content
+                now = time.monotonic()
+                # Re-parsing the whole output is linear in its length, so it
+                # only happens when an update could be sent anyway.
+                if now - flushed_at < flush_interval:
+                    continue
+                narrative = _partial_narrative(text)
+                if narrative is not None and narrative != sent:
+                    write(_narrative_update(sent, narrative))
+                    sent, flushed_at = narrative, now
+            judge_output = JudgeOutput.model_validate_json(text)
+        except Exception as e:
+            if attempt == JUDGE_ATTEMPTS:
+                raise
+            logger.warning(f"Judge attempt {attempt} failed, retrying: {e}")
+            continue
+        if judge_output.crisis_update != sent:
+            write(_narrative_update(sent, judge_output.crisis_update))
+        return judge_output
 
 
 async def resolution_node(state: ResolutionState) -> Dict:
@@ -131,22 +211,41 @@ async def resolution_node(state: ResolutionState) -> Dict:
 
     It takes all submitted actions for the round, invokes the resolution chain
     to process them according to the secret Undergame, and produces the new
-    world state.
+    world state. The new crisis update is streamed as it is written; the
+    state changes are only returned once the whole output is valid.
     """
     logger.info("AI Judge is resolving the round...")
 
     resolution_chain = get_judge_resolution_chain()
 
-    # Convert the list of Action Pydantic models to a JSON string for the prompt.
-    actions_json_str = json.dumps([a.model_dump() for a in state["actions"]], indent=2)
-    current_game_state_json = state.get("current_game_state_json", "{}")
+    prompt = build_judge_prompt(
+        round_number=state["round_number"],
+        crisis_update=state["current_crisis_update"],
+        characters=state["characters"],
+        actions=state["actions"],
+        fixed_text=JUDGE_RESOLUTION_PROMPT.prompt + state["undergame_plot"],
+        budget=settings.JUDGE_PROMPT_TOKEN_BUDGET,
+    )
+    logger.info(
+        f"Judge prompt for round {state['round_number']}: ~{prompt.tokens} tokens "
+        f"(template and plot {prompt.fixed_tokens}, state "
+        f"{prompt.game_state_tokens}, actions {prompt.actions_tokens}; budget "
+        f"{prompt.budget})."
+    )
+    if prompt.truncated:
+        logger.info(f"Truncated to fit the budget: {', '.join(prompt.truncated)}.")
+    if prompt.tokens > prompt.budget:
+        logger.warning(
+            "The judge prompt exceeds its budget even without optional context."
+        )
 
-    judge_output = await resolution_chain.ainvoke(
+    judge_output = await _stream_judge_output(
+        resolution_chain,
         {
             "undergame_plot": state["undergame_plot"],
-            "actions_json": actions_json_str,
-            "current_game_state_json": current_game_state_json,
-        }
+            "actions_json": prompt.actions,
+            "current_game_state_json": prompt.game_state,
+        },
     )
 
     logger.info("Judge has made a decision. Crafting new crisis update...")
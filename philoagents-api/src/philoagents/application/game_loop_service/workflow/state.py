@@ -42,6 +42,8 @@ class ResolutionState(TypedDict):
                     resource updates correctly.
         undergame_plot: The secret narrative goal that only the Judge knows and
                         is trying to orchestrate.
+        round_number: The round being resolved.
+        current_crisis_update: The narrative the round's actions responded to.
         crisis_update: The narrative text for the *next* round, generated by the Judge.
                        This is a primary output of the graph.
         updated_characters: A dictionary mapping character IDs to their Character objects
@@ -52,7 +54,8 @@ class ResolutionState(TypedDict):
     actions: List[Action]
     characters: Dict[str, Character]
     undergame_plot: str
-    current_game_state_json: Optional[str]
+    round_number: int
+    current_crisis_update: str
     crisis_update: Optional[str]
     updated_characters: Optional[Dict[str, Character]]
     victory_point_awards: Optional[List[VictoryPointAward]]
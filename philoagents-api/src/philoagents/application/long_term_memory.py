@@ -1,21 +1,28 @@
-from typing import Dict, List
+from typing import Dict, List, Set
 
 from langchain_core.documents import Document
 from loguru import logger
 
+from philoagents.application.rag.ingestion import (
+    EmbeddingPipeline,
+    chunk_hash,
+    stored_chunk_ids,
+)
+from philoagents.application.rag.local_index import LocalVectorStore
 from philoagents.application.rag.retrievers import Retriever, get_retriever
 from philoagents.application.rag.splitters import Splitter, get_splitter
 from philoagents.config import settings
 from philoagents.domain.character_factory import CharacterFactory
 from philoagents.infrastructure.mongo import MongoClientWrapper, MongoIndex
+from philoagents.infrastructure.mongo.memory_generation import bump_memory_generation
 
-from .data import RagExtractor, deduplicate_documents
+from .data import DuplicateIndex, RagExtractor, deduplicate_documents
 
 
 class LongTermMemoryCreator:
     """
     Orchestrates the entire RAG ingestion pipeline: extracting, chunking,
-    embedding, and storing character knowledge in MongoDB.
+    embedding, and storing character knowledge in MongoDB or the local index.
     """
 
     def __init__(
@@ -44,6 +51,12 @@ class LongTermMemoryCreator:
         """
         Executes the full RAG ingestion pipeline for a given set of sources.
 
+        Ingestion is incremental: chunks are identified by a hash of their
+        content, only new or changed ones are embedded and stored, and stored
+        chunks that no longer come out of the sources are deleted. Chunks
+        that nearly duplicate a stored one, of any character, are dropped,
+        unless every chunk they duplicate is deleted as stale.
+
         Args:
             rag_sources: A list of dictionaries loaded from the scenario's rag_sources.json.
         """
@@ -51,28 +64,98 @@ class LongTermMemoryCreator:
             logger.warning("No RAG sources provided. Exiting.")
             return
 
-        logger.info("Clearing existing long-term memory collection...")
-        with MongoClientWrapper(
-            model=Document, collection_name=settings.MONGO_LONG_TERM_MEMORY_COLLECTION
-        ) as client:
-            client.clear_collection()
+        vectorstore = self.retriever.vectorstore
+        stored_ids = stored_chunk_ids(vectorstore)
+        seen_ids = set()
+        logger.info(f"Long-term memory holds {len(stored_ids)} chunks.")
+        duplicate_index = DuplicateIndex.load(
+            settings.RAG_DEDUP_INDEX_PATH, threshold=0.7
+        )
+        # Forgets chunks deleted since, e.g. by tools/delete_long_term_memory.py.
+        duplicate_index.retain(stored_ids)
 
         logger.info("Starting document extraction from web sources...")
         extraction_generator = self.extractor.get_extraction_generator(rag_sources)
 
-        for _, docs in extraction_generator:
-            if not docs:
-                continue
-
-            chunked_docs = self.splitter.split_documents(docs)
-            chunked_docs = deduplicate_documents(chunked_docs, threshold=0.7)
-
-            logger.info(f"Adding {len(chunked_docs)} chunks to vector store...")
-            self.retriever.vectorstore.add_documents(chunked_docs)
+        # Chunks are embedded and stored in the background, batched across
+        # characters, while the next characters are extracted.
+        dropped_docs: Dict[str, Document] = {}
+        with EmbeddingPipeline.build_from_settings(vectorstore) as pipeline:
+            for _, docs in extraction_generator:
+                if not docs:
+                    continue
+
+                chunked_docs = self.splitter.split_documents(docs)
+                for doc in chunked_docs:
+                    doc.id = chunk_hash(doc, settings.RAG_TEXT_EMBEDDING_MODEL_ID)
+                kept_docs = deduplicate_documents(chunked_docs, index=duplicate_index)
+                kept_ids = {doc.id for doc in kept_docs}
+                dropped_docs.update(
+                    (doc.id, doc) for doc in chunked_docs if doc.id not in kept_ids
+                )
+                pipeline.add(self.__unstored(kept_docs, stored_ids, seen_ids))
+
+            stale_ids = stored_ids - seen_ids
+            duplicate_index.remove(stale_ids)
+            # Chunks dropped as duplicates of stale ones would otherwise be
+            # lost with them; they are checked again against what remains.
+            orphaned_docs = [
+                doc
+                for doc_id, doc in dropped_docs.items()
+                if duplicate_index.anchors[doc_id] & stale_ids
+            ]
+            if orphaned_docs:
+                logger.info(
+                    f"Checking {len(orphaned_docs)} chunks that duplicated stale "
+                    f"chunks again..."
+                )
+                orphaned_docs = deduplicate_documents(
+                    orphaned_docs, index=duplicate_index
+                )
+                pipeline.add(self.__unstored(orphaned_docs, stored_ids, seen_ids))
+
+        if stale_ids:
+            logger.info(f"Deleting {len(stale_ids)} stale chunks...")
+            vectorstore.delete(list(stale_ids))
+        duplicate_index.save(settings.RAG_DEDUP_INDEX_PATH)
+        changed = bool(pipeline.stats.chunks or stale_ids)
+
+        if isinstance(vectorstore, LocalVectorStore):
+            if changed:
+                logger.info("Document ingestion complete. Saving the local index...")
+                # Saving changes the index's generation, which retrieval
+                # caches check, so there is nothing to bump.
+                vectorstore.save()
+            logger.info("Long-term memory is ready.")
+            return
 
-        logger.info("Document ingestion complete. Creating database index...")
+        logger.info("Document ingestion complete. Creating missing database indexes...")
         self.__create_index()
-        logger.info("Index created successfully. Long-term memory is ready.")
+        if changed:
+            # Retrieval caches (in this and other processes) drop results
+            # that point at deleted or replaced chunks.
+            with MongoClientWrapper(
+                model=Document,
+                collection_name=settings.MONGO_LONG_TERM_MEMORY_COLLECTION,
+            ) as client:
+                bump_memory_generation(client.database)
+        logger.info("Long-term memory is ready.")
+
+    @staticmethod
+    def __unstored(
+        docs: List[Document], stored_ids: Set[str], seen_ids: Set[str]
+    ) -> List[Document]:
+        """The chunks that are neither stored nor queued yet; marks all seen."""
+        new_docs = []
+        for doc in docs:
+            if doc.id not in stored_ids and doc.id not in seen_ids:
+                new_docs.append(doc)
+            seen_ids.add(doc.id)
+        logger.info(
+            f"Queueing {len(new_docs)} new or changed chunks (of {len(docs)}) "
+            f"for embedding..."
+        )
+        return new_docs
 
     def __create_index(self) -> None:
         """Creates the hybrid search index in MongoDB."""
@@ -2,6 +2,8 @@ from functools import lru_cache
 
 from langchain_huggingface import HuggingFaceEmbeddings
 
+from philoagents.config import settings
+
 
 @lru_cache
 def get_embedding_model(
@@ -18,10 +20,14 @@ def get_embedding_model(
 
     Returns:
         HuggingFaceEmbeddings: A configured HuggingFace embeddings model instance
-            with remote code trust enabled and embedding normalization disabled
+            with remote code trust enabled and embedding normalization disabled,
+            encoding documents in batches of `settings.RAG_EMBEDDING_BATCH_SIZE`
     """
     return HuggingFaceEmbeddings(
         model_name=model_id,
         model_kwargs={"device": device, "trust_remote_code": True},
-        encode_kwargs={"normalize_embeddings": False},
+        encode_kwargs={
+            "normalize_embeddings": False,
+            "batch_size": settings.RAG_EMBEDDING_BATCH_SIZE,
+        },
     )
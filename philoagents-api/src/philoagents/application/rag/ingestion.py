@@ -0,0 +1,205 @@
+import hashlib
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Set
+
+from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStore
+from langchain_mongodb.vectorstores import bulk_embed_and_insert_texts
+from loguru import logger
+
+from philoagents.config import settings
+
+from .local_index import LocalVectorStore
+
+# Tells a stage that its input is exhausted.
+_DONE = object()
+
+
+@dataclass
+class IngestionStats:
+    chunks: int = 0
+    batches: int = 0
+    embedding_seconds: float = 0.0
+    writing_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+def chunk_hash(document: Document, embedding_model_id: str) -> str:
+    """
+    Identifies a chunk by its character, source, text and embedding model, so
+    that ingesting it again finds it already stored, while a chunk whose text
+    changed, or that must be embedded by another model, does not.
+    """
+    return hashlib.sha256(
+        "\x00".join(
+            [
+                embedding_model_id,
+                str(document.metadata.get("character_id", "")),
+                str(document.metadata.get("source", "")),
+                document.page_content,
+            ]
+        ).encode()
+    ).hexdigest()
+
+
+def stored_chunk_ids(vectorstore: VectorStore) -> Set[str]:
+    """The ids of every chunk in the vector store."""
+    if isinstance(vectorstore, LocalVectorStore):
+        return vectorstore.get_ids()
+    return {str(doc["_id"]) for doc in vectorstore.collection.find({}, {"_id": 1})}
+
+
+def write_embedded_documents(
+    vectorstore: VectorStore, documents: List[Document], embeddings: List[List[float]]
+) -> None:
+    """Stores documents with embeddings computed beforehand."""
+    texts = [document.page_content for document in documents]
+    metadatas = [document.metadata for document in documents]
+    ids = [document.id for document in documents]
+    ids = ids if all(ids) else None
+    if isinstance(vectorstore, LocalVectorStore):
+        vectorstore.add_embeddings(texts, embeddings, metadatas, ids=ids)
+        return
+    # The same documents MongoDBAtlasVectorSearch.add_documents writes, in one
+    # bulk write, but without embedding the texts again.
+    bulk_embed_and_insert_texts(
+        texts=texts,
+        metadatas=metadatas,
+        embedding_func=lambda _: embeddings,
+        collection=vectorstore.collection,
+        text_key=vectorstore._text_key,
+        embedding_key=vectorstore._embedding_key,
+        ids=ids,
+    )
+
+
+class EmbeddingPipeline:
+    """
+    Embeds and stores chunks in the background while the caller keeps
+    extracting more.
+
+    Chunks added from any number of characters are grouped into batches of
+    `batch_size`, so the embedding model runs few, large encode calls. One
+    thread embeds batches while another writes the previous ones to the
+    vector store. The queues between the stages hold at most `queue_size`
+    batches, so a slow stage holds back the ones before it instead of
+    buffering the whole corpus.
+
+    Use it as a context manager. Leaving the block flushes the last partial
+    batch, waits for everything to be stored, and raises the first error
+    either stage ran into.
+    """
+
+    def __init__(
+        self,
+        vectorstore: VectorStore,
+        batch_size: int = 256,
+        queue_size: int = 4,
+        torch_threads: int = 0,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        self.vectorstore = vectorstore
+        self.batch_size = batch_size
+        self.torch_threads = torch_threads
+        self.clock = clock
+        self.stats = IngestionStats()
+        self._pending: List[Document] = []
+        self._to_embed: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._to_write: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._error: Optional[BaseException] = None
+        self._started_at = 0.0
+        self._threads = [
+            threading.Thread(target=self._embed, name="ingestion-embed", daemon=True),
+            threading.Thread(target=self._write, name="ingestion-write", daemon=True),
+        ]
+
+    @classmethod
+    def build_from_settings(cls, vectorstore: VectorStore) -> "EmbeddingPipeline":
+        return cls(
+            vectorstore,
+            batch_size=settings.RAG_EMBEDDING_BATCH_SIZE,
+            queue_size=settings.RAG_INGESTION_QUEUE_BATCHES,
+            torch_threads=settings.RAG_EMBEDDING_TORCH_THREADS,
+        )
+
+    def __enter__(self) -> "EmbeddingPipeline":
+        if self.torch_threads > 0:
+            import torch
+
+            torch.set_num_threads(self.torch_threads)
+        self._started_at = self.clock()
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def add(self, documents: List[Document]) -> None:
+        """Queues chunks, blocking while the stages are too far behind."""
+        self._raise_error()
+        self._pending.extend(documents)
+        while len(self._pending) >= self.batch_size:
+            self._to_embed.put(self._pending[: self.batch_size])
+            self._pending = self._pending[self.batch_size :]
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if exc_type is None and self._pending:
+            self._to_embed.put(self._pending)
+        self._pending = []
+        self._to_embed.put(_DONE)
+        for thread in self._threads:
+            thread.join()
+        self.stats.elapsed_seconds = self.clock() - self._started_at
+        if exc_type is None:
+            self._raise_error()
+            logger.info(
+                f"Embedded and stored {self.stats.chunks} chunks in "
+                f"{self.stats.elapsed_seconds:.1f}s "
+                f"({self.stats.chunks_per_second:.1f} chunks/s; embedding "
+                f"{self.stats.embedding_seconds:.1f}s, writing "
+                f"{self.stats.writing_seconds:.1f}s)."
+            )
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _embed(self) -> None:
+        embeddings = self.vectorstore.embeddings
+        while (batch := self._to_embed.get()) is not _DONE:
+            # After an error the stage keeps draining its queue, so the
+            # caller is never blocked on a queue nobody reads.
+            if self._error is not None:
+                continue
+            try:
+                started_at = self.clock()
+                vectors = embeddings.embed_documents(
+                    [document.page_content for document in batch]
+                )
+                self.stats.embedding_seconds += self.clock() - started_at
+                self._to_write.put((batch, vectors))
+            except BaseException as e:
+                self._error = e
+        self._to_write.put(_DONE)
+
+    def _write(self) -> None:
+        while (item := self._to_write.get()) is not _DONE:
+            if self._error is not None:
+                continue
+            batch, vectors = item
+            try:
+                started_at = self.clock()
+                write_embedded_documents(self.vectorstore, batch, vectors)
+                self.stats.writing_seconds += self.clock() - started_at
+                self.stats.chunks += len(batch)
+                self.stats.batches += 1
+                logger.debug(
+                    f"Stored {self.stats.chunks} chunks ({self.stats.batches} batches)."
+                )
+            except BaseException as e:
+                self._error = e
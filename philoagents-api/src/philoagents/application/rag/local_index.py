@@ -0,0 +1,422 @@
+import json
+import mmap
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores import VectorStore
+from loguru import logger
+from pydantic import ConfigDict
+
+MANIFEST_FILE = "manifest.json"
+# Times a reader rereads the manifest when its version is removed meanwhile.
+LOAD_ATTEMPTS = 3
+# Lucene's BM25 parameters, which Atlas Search uses as well.
+BM25_K1 = 1.2
+BM25_B = 0.75
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words, roughly what Atlas Search's standard analyzer indexes."""
+    return _TOKEN.findall(text.lower())
+
+
+def _top(scores: np.ndarray, k: int) -> np.ndarray:
+    """The indices of the `k` highest scores, best first."""
+    if k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    candidates = np.argpartition(-scores, k)[:k]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class _Snapshot:
+    """
+    One saved version of the index, memory-mapped from its files:
+
+    - `vectors.npy`: the embeddings, one row per chunk.
+    - `documents.jsonl` and `offsets.npy`: each chunk's record (text and
+      metadata) and where it starts, so only the returned ones are decoded.
+    - `terms.json` and the `postings.*.npy` arrays: an inverted index from
+      each term to the chunks containing it, with their precomputed BM25
+      weights.
+    """
+
+    def __init__(self, directory: Path, generation: str):
+        self.generation = generation
+        prefix = directory / generation
+        self.vectors = np.load(f"{prefix}.vectors.npy", mmap_mode="r")
+        self.offsets = np.load(f"{prefix}.offsets.npy", mmap_mode="r")
+        self.terms: Dict[str, int] = json.loads(
+            Path(f"{prefix}.terms.json").read_text(encoding="utf-8")
+        )
+        self.postings_start = np.load(f"{prefix}.postings.start.npy", mmap_mode="r")
+        self.postings_rows = np.load(f"{prefix}.postings.rows.npy", mmap_mode="r")
+        self.postings_weights = np.load(f"{prefix}.postings.weights.npy", mmap_mode="r")
+        self._documents: Optional[mmap.mmap] = None
+        if len(self):
+            with open(f"{prefix}.documents.jsonl", "rb") as file:
+                self._documents = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def record(self, row: int) -> Dict[str, Any]:
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return json.loads(self._documents[start:end])
+
+    def records(self) -> Iterable[Dict[str, Any]]:
+        return (self.record(row) for row in range(len(self)))
+
+    def vector_ranking(self, query_vector: List[float], k: int) -> np.ndarray:
+        """The rows of the `k` chunks closest to the query, by dot product."""
+        if not len(self):
+            return np.empty(0, dtype=np.int64)
+        scores = self.vectors @ np.asarray(query_vector, dtype=np.float32)
+        return _top(scores, k)
+
+    def text_ranking(self, query: str, k: int) -> np.ndarray:
+        """The rows of the `k` chunks matching the query best, by BM25."""
+        scores = np.zeros(len(self), dtype=np.float32)
+        for term in set(tokenize(query)):
+            term_id = self.terms.get(term)
+            if term_id is None:
+                continue
+            start, end = self.postings_start[term_id], self.postings_start[term_id + 1]
+            # A term's postings list each chunk once, so this cannot collide.
+            scores[self.postings_rows[start:end]] += self.postings_weights[start:end]
+        matching = np.flatnonzero(scores)
+        return matching[_top(scores[matching], k)]
+
+
+def _write_snapshot(
+    directory: Path,
+    records: List[Dict[str, Any]],
+    vectors: np.ndarray,
+    text_key: str,
+) -> str:
+    """Writes a new version of the index; returns its generation."""
+    generation = uuid.uuid4().hex
+    prefix = directory / generation
+
+    encoded = [
+        json.dumps(record, ensure_ascii=False, default=str).encode("utf-8")
+        for record in records
+    ]
+    with open(f"{prefix}.documents.jsonl", "wb") as file:
+        file.write(b"\n".join(encoded))
+    # Every record but the last is followed by a newline.
+    lengths = np.array([len(line) + 1 for line in encoded], dtype=np.int64)
+    np.save(f"{prefix}.offsets.npy", np.concatenate([[0], np.cumsum(lengths)]))
+    np.save(f"{prefix}.vectors.npy", vectors.astype(np.float32, copy=False))
+
+    terms: Dict[str, int] = {}
+    term_ids: List[int] = []
+    rows: List[int] = []
+    frequencies: List[int] = []
+    lengths = np.zeros(len(records), dtype=np.float32)
+    for row, record in enumerate(records):
+        tokens = tokenize(record[text_key])
+        lengths[row] = len(tokens)
+        for term, frequency in Counter(tokens).items():
+            term_ids.append(terms.setdefault(term, len(terms)))
+            rows.append(row)
+            frequencies.append(frequency)
+    term_ids_array = np.array(term_ids, dtype=np.int64)
+    order = np.argsort(term_ids_array, kind="stable")
+    term_ids_array = term_ids_array[order]
+    rows_array = np.array(rows, dtype=np.int32)[order]
+    tf = np.array(frequencies, dtype=np.float32)[order]
+
+    document_frequency = np.bincount(term_ids_array, minlength=len(terms))
+    idf = np.log1p(
+        (len(records) - document_frequency + 0.5) / (document_frequency + 0.5)
+    ).astype(np.float32)
+    average_length = lengths.mean() if len(records) else 1.0
+    norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths[rows_array] / average_length)
+    weights = idf[term_ids_array] * tf * (BM25_K1 + 1) / (tf + norms)
+
+    np.save(
+        f"{prefix}.postings.start.npy",
+        np.concatenate([[0], np.cumsum(document_frequency)]).astype(np.int64),
+    )
+    np.save(f"{prefix}.postings.rows.npy", rows_array)
+    np.save(f"{prefix}.postings.weights.npy", weights.astype(np.float32))
+    Path(f"{prefix}.terms.json").write_text(json.dumps(terms), encoding="utf-8")
+    return generation
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Long-term memory kept in files under `path` and searched in process, for
+    running without MongoDB Atlas.
+
+    Added texts are embedded right away but only become searchable once
+    `save` writes a new version of the index. Versions are written beside the
+    current one and published by replacing the manifest, so readers (in this
+    or another process) switch over on their next search and never see a
+    half-written index.
+    """
+
+    def __init__(self, path: Path, embedding: Embeddings, text_key: str = "chunk"):
+        self.path = Path(path)
+        self.embedding = embedding
+        self.text_key = text_key
+        self._snapshot: Optional[_Snapshot] = None
+        self._manifest_mtime: Optional[int] = None
+        self._lock = threading.Lock()
+        self._pending_records: List[Dict[str, Any]] = []
+        self._pending_vectors: List[List[float]] = []
+        self._deleted_ids: Set[str] = set()
+        self._cleared = False
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding
+
+    def snapshot(self) -> Optional[_Snapshot]:
+        """The latest saved version of the index, or None if there is none."""
+        manifest = self.path / MANIFEST_FILE
+        try:
+            mtime = manifest.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            for attempt in range(LOAD_ATTEMPTS):
+                if mtime == self._manifest_mtime:
+                    break
+                try:
+                    generation = self._saved_generation()
+                    snapshot = _Snapshot(self.path, generation)
+                except FileNotFoundError:
+                    # Writers keep the version they replace, so this one was
+                    # removed by a second save since the manifest was read.
+                    if attempt == LOAD_ATTEMPTS - 1:
+                        raise
+                    mtime = manifest.stat().st_mtime_ns
+                    continue
+                self._snapshot = snapshot
+                self._manifest_mtime = mtime
+                logger.info(
+                    f"Loaded the local long-term memory index ({len(snapshot)} "
+                    f"chunks, version {generation})."
+                )
+                break
+            return self._snapshot
+
+    def _saved_generation(self) -> Optional[str]:
+        try:
+            manifest = (self.path / MANIFEST_FILE).read_text()
+        except FileNotFoundError:
+            return None
+        return json.loads(manifest)["generation"]
+
+    def memory_generation(self) -> Optional[str]:
+        """The token identifying the saved index, as for the MongoDB store."""
+        snapshot = self.snapshot()
+        return snapshot.generation if snapshot else None
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+        **kwargs: Any,
+    ) -> List[str]:
+        texts = list(texts)
+        return self.add_embeddings(
+            texts, self.embedding.embed_documents(texts), metadatas, ids=ids
+        )
+
+    def add_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[dict]] = None,
+        *,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Adds texts that were already embedded, e.g. by the ingestion pipeline."""
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [uuid.uuid4().hex for _ in texts]
+        self._pending_records.extend(
+            {**metadata, "_id": id_, self.text_key: text}
+            for id_, text, metadata in zip(ids, texts, metadatas)
+        )
+        self._pending_vectors.extend(embeddings)
+        return ids
+
+    def delete(self, ids: Optional[List[str]] = None, **kwargs: Any) -> bool:
+        """Drops the chunks with these ids from the next version."""
+        self._deleted_ids.update(ids or [])
+        return True
+
+    def get_ids(self) -> Set[str]:
+        """The ids of the saved chunks."""
+        snapshot = self.snapshot()
+        return {record["_id"] for record in snapshot.records()} if snapshot else set()
+
+    def clear(self) -> None:
+        """Drops every chunk, including unsaved ones, from the next version."""
+        self._pending_records = []
+        self._pending_vectors = []
+        self._deleted_ids = set()
+        self._cleared = True
+
+    def save(self) -> str:
+        """
+        Publishes the saved chunks (unless cleared) plus the ones added since,
+        minus the deleted ones, as a new version of the index; returns its
+        generation. Like an upsert, a chunk added with the id of a saved one
+        replaces it.
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        snapshot = None if self._cleared else self.snapshot()
+        records = list(snapshot.records()) if snapshot else []
+        vectors = [np.asarray(snapshot.vectors)] if snapshot else []
+        records.extend(self._pending_records)
+        if self._pending_vectors:
+            vectors.append(np.asarray(self._pending_vectors, dtype=np.float32))
+        dimensions = len(self._pending_vectors[0]) if self._pending_vectors else 0
+        vectors = (
+            np.concatenate(vectors)
+            if vectors
+            else np.empty((0, dimensions), dtype=np.float32)
+        )
+        latest = {record["_id"]: row for row, record in enumerate(records)}
+        keep = np.array(
+            [
+                row
+                for row, record in enumerate(records)
+                if latest[record["_id"]] == row
+                and record["_id"] not in self._deleted_ids
+            ],
+            dtype=np.int64,
+        )
+        records = [records[row] for row in keep]
+        vectors = vectors[keep]
+
+        previous = self._saved_generation()
+        generation = _write_snapshot(self.path, records, vectors, self.text_key)
+        manifest = self.path / MANIFEST_FILE
+        temporary = manifest.with_suffix(".tmp")
+        temporary.write_text(json.dumps({"generation": generation}))
+        os.replace(temporary, manifest)
+        self._remove_old_versions(keep={generation, previous})
+
+        self._pending_records = []
+        self._pending_vectors = []
+        self._deleted_ids = set()
+        self._cleared = False
+        logger.info(f"Saved {len(records)} chunks to the local index at {self.path}.")
+        return generation
+
+    def _remove_old_versions(self, keep: Set[Optional[str]]) -> None:
+        # The replaced version stays for readers that read the old manifest
+        # but have not opened its files yet. Processes still reading an older
+        # version keep their memory maps; on platforms that refuse to delete
+        # mapped files, the files are left.
+        for file in self.path.iterdir():
+            if file.name != MANIFEST_FILE and file.name.split(".")[0] not in keep:
+                try:
+                    file.unlink()
+                except OSError:
+                    pass
+
+    def similarity_search(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> List[Document]:
+        snapshot = self.snapshot()
+        if snapshot is None:
+            return []
+        rows = snapshot.vector_ranking(self.embedding.embed_query(query), k)
+        return [self._document(snapshot.record(row)) for row in rows]
+
+    def _document(self, record: Dict[str, Any], **scores: float) -> Document:
+        text = record.pop(self.text_key)
+        return Document(page_content=text, metadata={**record, **scores})
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: List[str],
+        embedding: Embeddings,
+        metadatas: Optional[List[dict]] = None,
+        *,
+        path: Path,
+        **kwargs: Any,
+    ) -> "LocalVectorStore":
+        store = cls(path, embedding, **kwargs)
+        store.clear()
+        store.add_texts(texts, metadatas)
+        store.save()
+        return store
+
+
+class LocalHybridSearchRetriever(BaseRetriever):
+    """
+    Hybrid search over a LocalVectorStore that ranks like
+    MongoDBAtlasHybridSearchRetriever: the top `top_k` chunks by vector
+    similarity and by full-text (BM25) relevance are fused by reciprocal rank,
+    each scoring 1 / (rank + penalty + 1) in its list.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: LocalVectorStore
+    top_k: int = 4
+    vector_penalty: float = 60
+    fulltext_penalty: float = 60
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        snapshot = self.vectorstore.snapshot()
+        if snapshot is None:
+            logger.warning(
+                f"No local long-term memory index at {self.vectorstore.path}; "
+                f"run the ingestion first."
+            )
+            return []
+
+        query_vector = self.vectorstore.embeddings.embed_query(query)
+        scores: Dict[int, Dict[str, float]] = {}
+        for field, penalty, ranking in (
+            (
+                "vector_score",
+                self.vector_penalty,
+                snapshot.vector_ranking(query_vector, self.top_k),
+            ),
+            (
+                "fulltext_score",
+                self.fulltext_penalty,
+                snapshot.text_ranking(query, self.top_k),
+            ),
+        ):
+            for rank, row in enumerate(ranking):
+                scores.setdefault(
+                    int(row), {"vector_score": 0.0, "fulltext_score": 0.0}
+                )[field] = 1.0 / (rank + penalty + 1)
+
+        fused = sorted(
+            scores.items(),
+            key=lambda item: -(item[1]["vector_score"] + item[1]["fulltext_score"]),
+        )[: self.top_k]
+        return [
+            self.vectorstore._document(
+                snapshot.record(row),
+                **row_scores,
+                score=row_scores["vector_score"] + row_scores["fulltext_score"],
+            )
+            for row, row_scores in fused
+        ]
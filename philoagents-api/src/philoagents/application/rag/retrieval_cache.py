@@ -0,0 +1,192 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from loguru import logger
+from pydantic import PrivateAttr
+
+from philoagents.infrastructure.mongo.memory_generation import get_memory_generation
+
+
+def normalize_query(query: str) -> str:
+    """Lowercases and collapses whitespace and trailing punctuation."""
+    return re.sub(r"\s+", " ", query).strip().rstrip("?!. ").lower()
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """
+    Wraps an embedding model with an LRU cache of query embeddings keyed by the
+    normalized query. Document embeddings (ingestion) are not cached.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_entries: int):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = normalize_query(text)
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return embedding
+            self.misses += 1
+
+        # The normalized query is only the key: the model embeds the query as
+        # written, so a cold cache retrieves exactly what no cache would.
+        embedding = self.embeddings.embed_query(text)
+        with self._lock:
+            self._cache[key] = embedding
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+class RetrievalResultCache:
+    """
+    Maps query embeddings to the documents they retrieved. A lookup is served
+    by the most similar cached query if its cosine similarity reaches
+    `similarity_threshold`; the least recently used entries are evicted beyond
+    `max_entries`.
+    """
+
+    def __init__(self, max_entries: int, similarity_threshold: float):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._vectors: Optional[np.ndarray] = None  # unit-length, one per row
+        self._results: List[List[Document]] = []
+        self._last_used: List[int] = []
+        self._uses = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, embedding: List[float]) -> Optional[List[Document]]:
+        vector = self._unit(embedding)
+        with self._lock:
+            if self._vectors is not None and len(self._results):
+                similarities = self._vectors @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.similarity_threshold:
+                    self.hits += 1
+                    self._uses += 1
+                    self._last_used[best] = self._uses
+                    return list(self._results[best])
+            self.misses += 1
+            return None
+
+    def put(self, embedding: List[float], documents: List[Document]):
+        vector = self._unit(embedding)[np.newaxis, :]
+        with self._lock:
+            self._uses += 1
+            if self._vectors is not None and len(self._results) >= self.max_entries:
+                evict = int(np.argmin(self._last_used))
+                self._vectors[evict] = vector
+                self._results[evict] = list(documents)
+                self._last_used[evict] = self._uses
+                return
+            self._vectors = (
+                vector if self._vectors is None else np.vstack([self._vectors, vector])
+            )
+            self._results.append(list(documents))
+            self._last_used.append(self._uses)
+
+    def clear(self):
+        with self._lock:
+            self._vectors = None
+            self._results = []
+            self._last_used = []
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+
+class CachedRetriever(BaseRetriever):
+    """
+    Serves repeated and near-identical queries from memory: the query
+    embedding is cached by normalized text, and the retrieved documents by
+    embedding similarity. Both caches are dropped when long-term memory is
+    re-ingested, which is checked every `generation_check_seconds`.
+    """
+
+    retriever: Any
+    query_embeddings: CachedQueryEmbeddings
+    results: RetrievalResultCache
+    generation_check_seconds: float
+    clock: Callable[[], float] = time.monotonic
+
+    _generation: Optional[str] = PrivateAttr(default=None)
+    _checked_at: Optional[float] = PrivateAttr(default=None)
+    _generation_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def invalidate(self):
+        self.query_embeddings.clear()
+        self.results.clear()
+
+    def _memory_generation(self) -> Optional[str]:
+        vectorstore = self.retriever.vectorstore
+        if hasattr(vectorstore, "memory_generation"):
+            return vectorstore.memory_generation()
+        return get_memory_generation(vectorstore.collection.database)
+
+    def _refresh_generation(self):
+        now = self.clock()
+        with self._generation_lock:
+            if (
+                self._checked_at is not None
+                and now - self._checked_at < self.generation_check_seconds
+            ):
+                return
+            self._checked_at = now
+            try:
+                generation = self._memory_generation()
+            except Exception as e:
+                logger.warning(f"Could not check the long-term memory version: {e}")
+                return
+            if generation != self._generation:
+                if self._generation is not None:
+                    logger.info("Long-term memory changed; dropping retrieval caches.")
+                self._generation = generation
+                self.invalidate()
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        self._refresh_generation()
+        embedding = self.query_embeddings.embed_query(query)
+        documents = self.results.lookup(embedding)
+        if documents is not None:
+            return documents
+
+        # The hybrid search embeds the query through `query_embeddings` as
+        # well, so it reuses the embedding computed above.
+        documents = self.retriever.invoke(
+            query, config={"callbacks": run_manager.get_child()}
+        )
+        self.results.put(embedding, documents)
+        return documents
@@ -1,3 +1,6 @@
+from typing import Optional, Union
+
+from langchain_core.embeddings import Embeddings
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain_mongodb.retrievers import (
     MongoDBAtlasHybridSearchRetriever,
@@ -7,33 +10,64 @@ from loguru import logger
 from philoagents.config import settings
 
 from .embeddings import get_embedding_model
+from .local_index import LocalHybridSearchRetriever, LocalVectorStore
+from .retrieval_cache import (
+    CachedQueryEmbeddings,
+    CachedRetriever,
+    RetrievalResultCache,
+)
+
+Retriever = Union[MongoDBAtlasHybridSearchRetriever, LocalHybridSearchRetriever]
 
-Retriever = MongoDBAtlasHybridSearchRetriever
+# Reciprocal rank fusion: each result scores 1 / (rank + penalty + 1) in the
+# vector and the full-text rankings.
+VECTOR_PENALTY = 50
+FULLTEXT_PENALTY = 50
 
 
 def get_retriever(
     embedding_model_id: str,
     k: int = 3,
     device: str = "cpu",
+    embedding: Optional[Embeddings] = None,
 ) -> Retriever:
     """Creates and returns a hybrid search retriever with the specified embedding model.
 
+    The backend, MongoDB Atlas or a local index, is chosen by
+    `settings.RAG_RETRIEVER_BACKEND`.
+
     Args:
         embedding_model_id (str): The identifier for the embedding model to use.
         k (int, optional): Number of documents to retrieve. Defaults to 3.
         device (str, optional): Device to run the embedding model on. Defaults to "cpu".
+        embedding (Embeddings, optional): Wraps the embedding model, e.g. with a
+            query cache. Defaults to the model itself.
 
     Returns:
         Retriever: A configured hybrid search retriever using both vector and
             text search capabilities.
     """
     logger.info(
-        f"Initializing retriever | model: {embedding_model_id} | device: {device} | top_k: {k}"
+        f"Initializing retriever | backend: {settings.RAG_RETRIEVER_BACKEND} | "
+        f"model: {embedding_model_id} | device: {device} | top_k: {k}"
     )
+    embedding = embedding or get_embedding_model(embedding_model_id, device)
+
+    if settings.RAG_RETRIEVER_BACKEND == "local":
+        return LocalHybridSearchRetriever(
+            vectorstore=LocalVectorStore(
+                path=settings.RAG_LOCAL_INDEX_PATH,
+                embedding=embedding,
+                text_key="chunk",
+            ),
+            top_k=k,
+            vector_penalty=VECTOR_PENALTY,
+            fulltext_penalty=FULLTEXT_PENALTY,
+        )
 
     vectorstore = MongoDBAtlasVectorSearch.from_connection_string(
         connection_string=settings.MONGO_URI,
-        embedding=get_embedding_model(embedding_model_id, device),
+        embedding=embedding,
         namespace=f"{settings.MONGO_DB_NAME}.{settings.MONGO_LONG_TERM_MEMORY_COLLECTION}",
         text_key="chunk",
         embedding_key="embedding",
@@ -44,6 +78,39 @@ def get_retriever(
         vectorstore=vectorstore,
         search_index_name="hybrid_search_index",
         top_k=k,
-        vector_penalty=50,
-        fulltext_penalty=50,
+        vector_penalty=VECTOR_PENALTY,
+        fulltext_penalty=FULLTEXT_PENALTY,
+    )
+
+
+def get_cached_retriever(
+    embedding_model_id: str,
+    k: int = 3,
+    device: str = "cpu",
+) -> CachedRetriever:
+    """Creates a hybrid search retriever behind the query and retrieval caches.
+
+    Args:
+        embedding_model_id (str): The identifier for the embedding model to use.
+        k (int, optional): Number of documents to retrieve. Defaults to 3.
+        device (str, optional): Device to run the embedding model on. Defaults to "cpu".
+
+    Returns:
+        CachedRetriever: A retriever that answers repeated and near-identical
+            queries without embedding them again or searching the index.
+    """
+    query_embeddings = CachedQueryEmbeddings(
+        get_embedding_model(embedding_model_id, device),
+        max_entries=settings.RAG_QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+    )
+    return CachedRetriever(
+        retriever=get_retriever(
+            embedding_model_id, k=k, device=device, embedding=query_embeddings
+        ),
+        query_embeddings=query_embeddings,
+        results=RetrievalResultCache(
+            max_entries=settings.RAG_RETRIEVAL_CACHE_MAX_ENTRIES,
+            similarity_threshold=settings.RAG_RETRIEVAL_CACHE_SIMILARITY_THRESHOLD,
+        ),
+        generation_check_seconds=settings.RAG_RETRIEVAL_CACHE_GENERATION_CHECK_SECONDS,
     )
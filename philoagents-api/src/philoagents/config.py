@@ -1,9 +1,17 @@
 from pathlib import Path
+from typing import Literal
 
-from pydantic import Field, field_validator
+from pydantic import BaseModel, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class GroqRateLimit(BaseModel):
+    """The per-minute budget Groq grants one model ID."""
+
+    requests_per_minute: int = Field(gt=0)
+    tokens_per_minute: int = Field(gt=0)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env", extra="ignore", env_file_encoding="utf-8"
@@ -27,6 +35,60 @@ class Settings(BaseSettings):
     # as small as the output format allows. The judge emits deltas, not full
     # character states, so its output is compact.
     GROQ_JUDGE_MAX_TOKENS: int = 3000
+    # gpt-oss reasons before answering, and that counts against max_tokens
+    # too; the digest itself is asked to stay under 150 words.
+    GROQ_INTEL_DIGEST_MAX_TOKENS: int = 800
+    GROQ_API_BASE: str | None = Field(
+        default=None,
+        description=(
+            "Overrides the Groq endpoint, e.g. http://localhost:8100 to run "
+            "against tools/fake_groq_server.py. Defaults to api.groq.com."
+        ),
+    )
+
+    # --- GROQ Rate Limits ---
+    # Every Groq call waits for its model's budget instead of failing with a
+    # 429 and burning its retries. Defaults are the free-tier limits; override
+    # them (JSON in the environment) for other plans.
+    GROQ_RATE_LIMITS_ENABLED: bool = True
+    GROQ_RATE_LIMITS: dict[str, GroqRateLimit] = Field(
+        default={
+            "qwen/qwen3.6-27b": GroqRateLimit(
+                requests_per_minute=60, tokens_per_minute=6_000
+            ),
+            "openai/gpt-oss-20b": GroqRateLimit(
+                requests_per_minute=30, tokens_per_minute=8_000
+            ),
+            "openai/gpt-oss-120b": GroqRateLimit(
+                requests_per_minute=30, tokens_per_minute=8_000
+            ),
+        },
+        description="Requests- and tokens-per-minute budget per Groq model ID.",
+    )
+    GROQ_DEFAULT_RATE_LIMIT: GroqRateLimit = Field(
+        default=GroqRateLimit(requests_per_minute=30, tokens_per_minute=6_000),
+        description="Budget for models missing from GROQ_RATE_LIMITS.",
+    )
+    GROQ_DEFAULT_COMPLETION_TOKENS: int = Field(
+        default=1_024,
+        description=(
+            "Completion size assumed when budgeting a call that sets no max_tokens."
+        ),
+    )
+
+    # --- LLM Response Cache ---
+    # "record" answers repeated requests from the cache and stores new ones;
+    # "replay" answers only from the cache and fails on anything unrecorded,
+    # so recorded game rounds can be re-run offline.
+    LLM_CACHE_MODE: Literal["off", "record", "replay"] = "off"
+    LLM_CACHE_PATH: Path = Field(
+        default=Path("data/llm_cache.sqlite3"),
+        description="SQLite file holding the recorded LLM responses.",
+    )
+    LLM_CACHE_MAX_ENTRIES: int = Field(
+        default=10_000,
+        description="Responses kept before the least recently used are evicted.",
+    )
 
     # --- MongoDB Configuration ---
     MONGO_URI: str = Field(
@@ -37,7 +99,41 @@ class Settings(BaseSettings):
     MONGO_STATE_CHECKPOINT_COLLECTION: str = "philosopher_state_checkpoints"
     MONGO_STATE_WRITES_COLLECTION: str = "philosopher_state_writes"
     MONGO_LONG_TERM_MEMORY_COLLECTION: str = "philosopher_long_term_memory"
+    MONGO_LONG_TERM_MEMORY_METADATA_COLLECTION: str = (
+        "philosopher_long_term_memory_metadata"
+    )
     MONGO_GAME_STATE_COLLECTION: str = "game_state"
+    MONGO_GAME_STATE_JOURNAL_COLLECTION: str = "game_state_journal"
+    MONGO_CHECKPOINTER_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description=(
+            "Maximum connections in the pool shared by every conversation's "
+            "checkpoint reads and writes."
+        ),
+    )
+    MONGO_GAME_STATE_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description=(
+            "Maximum connections in the async pool shared by every game's "
+            "state reads and writes."
+        ),
+    )
+    GAME_STATE_WRITE_DELAY_MS: int = Field(
+        default=200,
+        ge=0,
+        description=(
+            "How long a game state save waits before being written, so saves "
+            "in quick succession coalesce into one write of the newest state."
+        ),
+    )
+    GAME_STATE_SNAPSHOT_INTERVAL: int = Field(
+        default=5,
+        gt=0,
+        description=(
+            "Every how many saves a game's journal stores a full snapshot; "
+            "the saves in between store only their delta."
+        ),
+    )
 
     # --- Comet ML & Opik Configuration ---
     COMET_API_KEY: str | None = Field(
@@ -55,6 +151,45 @@ class Settings(BaseSettings):
     # --- Game Loop Configuration ---
     AI_ACTION_TIMEOUT_SECONDS: int = 120
     JUDGE_TIMEOUT_SECONDS: int = 300
+    JUDGE_PROMPT_TOKEN_BUDGET: int = Field(
+        default=5_000,
+        description=(
+            "Token budget for the judge's prompt. Groq also counts "
+            "GROQ_JUDGE_MAX_TOKENS against the per-minute limit, so the two "
+            "together should stay under the judge model's tokens-per-minute. "
+            "The previous crisis update and the characters' goals are "
+            "truncated to fit."
+        ),
+    )
+    JUDGE_NARRATIVE_FLUSH_MS: int = Field(
+        default=300,
+        description=(
+            "Shortest interval between judge_narrative events while the "
+            "judge's crisis update is streamed; tokens in between are sent "
+            "together."
+        ),
+    )
+    SPECULATIVE_AI_ACTIONS: bool = Field(
+        default=True,
+        description=(
+            "Compute the AI delegates' actions in the background as soon as a "
+            "round opens, so resolving it only waits for the Judge."
+        ),
+    )
+    GAME_EVENTS_HEARTBEAT_SECONDS: int = Field(
+        default=15,
+        description=(
+            "Interval between keep-alive comments on an idle round event "
+            "stream, so proxies don't close it while a round resolves."
+        ),
+    )
+    GAME_STATUS_LONG_POLL_SECONDS: int = Field(
+        default=25,
+        description=(
+            "Longest a /game/status request with ?wait_for_version parks "
+            "before answering with the unchanged state."
+        ),
+    )
     MAX_VP_AWARD_PER_ROUND: int = Field(
         default=20,
         description=(
@@ -62,6 +197,42 @@ class Settings(BaseSettings):
             "character in one round; larger awards are clamped."
         ),
     )
+    INTEL_RECENT_REPORTS: int = Field(
+        default=5,
+        description=(
+            "Intelligence reports an AI character keeps verbatim. Older ones "
+            "are folded into a rolling digest, so the delegate prompt stays "
+            "bounded however long the game runs."
+        ),
+    )
+    INTEL_COMPACTION_BATCH: int = Field(
+        default=3,
+        description=(
+            "Older reports that must accumulate before they are folded into "
+            "the digest, so it is rewritten every few rounds, not every round."
+        ),
+    )
+
+    # --- Game Session Configuration ---
+    GAME_SESSION_IDLE_TIMEOUT_SECONDS: int = Field(
+        default=1800,
+        description=(
+            "How long a game may go without requests before its session is "
+            "evicted from memory. Its state stays persisted and resumes on the "
+            "next request."
+        ),
+    )
+    GAME_SESSION_SWEEP_INTERVAL_SECONDS: int = Field(
+        default=60,
+        description="How often idle game sessions are looked for and evicted.",
+    )
+    GAME_SESSION_MAX_ACTIVE: int = Field(
+        default=500,
+        description=(
+            "Maximum number of games held in memory at once. When full, the "
+            "least recently used idle game is evicted to make room."
+        ),
+    )
 
     # --- API Security Configuration ---
     CORS_ALLOW_ORIGINS: list[str] = Field(
@@ -77,6 +248,39 @@ class Settings(BaseSettings):
         description="Maximum length of a chat message's text content.",
     )
 
+    # --- WebSocket Streaming Configuration ---
+    # Reply tokens are coalesced into chunk frames flushed by age or size, and
+    # a bounded queue of frames decouples the LLM stream from slow clients.
+    WS_CHUNK_FLUSH_MS: int = Field(
+        default=40,
+        ge=0,
+        description=(
+            "Longest a streamed token waits to be coalesced with later ones "
+            "before its chunk frame is sent."
+        ),
+    )
+    WS_CHUNK_FLUSH_BYTES: int = Field(
+        default=512,
+        gt=0,
+        description="Buffered reply size that sends a chunk frame immediately.",
+    )
+    WS_SEND_QUEUE_MAX_FRAMES: int = Field(
+        default=8,
+        gt=0,
+        description=(
+            "Chunk frames queued for one client. While the queue is full, new "
+            "tokens are merged into the next frame instead of waiting."
+        ),
+    )
+    WS_MAX_INFLIGHT_CHATS: int = Field(
+        default=4,
+        gt=0,
+        description=(
+            "Chat messages one connection may have in flight at once; further "
+            "messages are not read until a reply finishes."
+        ),
+    )
+
     @field_validator("CORS_ALLOW_ORIGINS")
     @classmethod
     def _reject_wildcard_origin(cls, value: list[str]) -> list[str]:
@@ -96,6 +300,118 @@ class Settings(BaseSettings):
     RAG_TOP_K: int = 3
     RAG_DEVICE: str = "cpu"
     RAG_CHUNK_SIZE: int = 256
+    RAG_EXTRACTION_WORKERS: int = Field(
+        default=8,
+        gt=0,
+        description="Sources downloaded concurrently during extraction.",
+    )
+    # "revalidate" reads sources fetched within the max age from the cache and
+    # revalidates older web pages with their ETag/Last-Modified; "offline"
+    # reads only from the cache and fails on anything never fetched, so
+    # ingestion and dataset generation can run without network.
+    RAG_SOURCE_CACHE_MODE: Literal["off", "revalidate", "offline"] = "revalidate"
+    RAG_SOURCE_CACHE_PATH: Path = Field(
+        default=Path("data/source_cache.sqlite3"),
+        description="SQLite file holding the downloaded RAG sources.",
+    )
+    RAG_SOURCE_CACHE_MAX_AGE_SECONDS: int = Field(
+        default=7 * 24 * 3600,
+        description=(
+            "How long a downloaded source is used without checking whether it changed."
+        ),
+    )
+    RAG_EMBEDDING_BATCH_SIZE: int = Field(
+        default=256,
+        gt=0,
+        description=(
+            "Chunks embedded per encode call during ingestion, gathered "
+            "across characters."
+        ),
+    )
+    RAG_EMBEDDING_TORCH_THREADS: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "Threads torch uses for embedding during ingestion; 0 keeps "
+            "torch's default (one per core)."
+        ),
+    )
+    RAG_INGESTION_QUEUE_BATCHES: int = Field(
+        default=4,
+        gt=0,
+        description=(
+            "Batches waiting to be embedded, or to be stored, before "
+            "extraction pauses to let ingestion catch up."
+        ),
+    )
+    RAG_DEDUP_INDEX_PATH: Path = Field(
+        default=Path("data/dedup_index.npz"),
+        description=(
+            "MinHash signatures of the ingested chunks, kept between ingests "
+            "so near-duplicates are removed across characters and runs."
+        ),
+    )
+    RAG_RETRIEVER_BACKEND: Literal["atlas", "local"] = Field(
+        default="atlas",
+        description=(
+            "Where long-term memory is stored and searched: MongoDB Atlas, or "
+            "an index in local files searched in process (no database needed)."
+        ),
+    )
+    RAG_LOCAL_INDEX_PATH: Path = Field(
+        default=Path("data/long_term_memory_index"),
+        description="Directory holding the local long-term memory index.",
+    )
+    RAG_RETRIEVAL_CACHE_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Cache query embeddings and retrieval results, so repeated or "
+            "near-identical questions skip the embedding model and MongoDB."
+        ),
+    )
+    RAG_QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = Field(
+        default=5_000,
+        description="Normalized queries whose embeddings are kept in memory.",
+    )
+    RAG_RETRIEVAL_CACHE_MAX_ENTRIES: int = Field(
+        default=1_000,
+        description="Query embeddings whose top-k results are kept in memory.",
+    )
+    RAG_RETRIEVAL_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        default=0.95,
+        ge=0,
+        le=1,
+        description=(
+            "Cosine similarity above which a new query reuses the results of "
+            "a cached one."
+        ),
+    )
+    RAG_RETRIEVAL_CACHE_GENERATION_CHECK_SECONDS: int = Field(
+        default=30,
+        description=(
+            "How often the retrieval cache checks whether long-term memory "
+            "was re-ingested (possibly by another process) and must be dropped."
+        ),
+    )
+    RAG_CONTEXT_SUMMARY_CACHE_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Reuse the summary of a set of retrieved chunks instead of asking "
+            "the LLM to summarize the same chunks again."
+        ),
+    )
+    RAG_CONTEXT_SUMMARY_CACHE_PATH: Path = Field(
+        default=Path("data/context_summary_cache.sqlite3"),
+        description="SQLite file holding the cached context summaries.",
+    )
+    RAG_CONTEXT_SUMMARY_CACHE_TTL_SECONDS: int = Field(
+        default=7 * 24 * 3600,
+        description="How long a cached context summary stays valid.",
+    )
+    RAG_CONTEXT_SUMMARY_CACHE_MAX_ENTRIES: int = Field(
+        default=5_000,
+        description="Summaries kept before the least recently used are evicted.",
+    )
 
     # --- Paths Configuration ---
     EVALUATION_DATASET_FILE_PATH: Path = Path("data/evaluation_dataset.json")
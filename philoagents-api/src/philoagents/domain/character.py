@@ -35,6 +35,10 @@ class Character(BaseModel):
         default_factory=list,
         description="A list of intelligence reports this character has received.",
     )
+    intel_digest: str = Field(
+        default="",
+        description="A rolling summary of the older reports folded out of known_intel.",
+    )
     victory_points: int = Field(
         default=0,
         description="The character's current score towards a Factional Supremacy victory.",
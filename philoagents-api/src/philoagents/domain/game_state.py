@@ -14,6 +14,16 @@ class GameState(BaseModel):
     round_number: int = Field(
         default=1, description="The current round number of the simulation."
     )
+    version: int = Field(
+        default=0,
+        description=(
+            "Increases with every change to the state (start, round commit, "
+            "reset, ...). Persisted, resets included, so it keeps increasing "
+            "when a game resumes. A change not yet written when the server "
+            "stopped is lost, so a resumed game can reach a version again "
+            "with another state; ETags also name the hosting instance."
+        ),
+    )
     crisis_update: str = Field(
         description="The narrative text describing the current world situation."
     )
@@ -0,0 +1,212 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+from philoagents.domain import Character
+from philoagents.domain.game_state import GameState
+
+
+class CharacterDelta(BaseModel):
+    """
+    How one character changed between two game states. Only the fields a round
+    changes are recorded; any other change replaces the character outright.
+    """
+
+    resources: Dict[str, int] = Field(
+        default_factory=dict, description="New values of the changed resources."
+    )
+    removed_resources: List[str] = Field(default_factory=list)
+    statuses: Dict[str, Union[str, int, bool]] = Field(
+        default_factory=dict, description="New values of the changed statuses."
+    )
+    removed_statuses: List[str] = Field(default_factory=list)
+    new_intel: List[str] = Field(
+        default_factory=list, description="Reports appended to known_intel."
+    )
+    folded_intel: int = Field(
+        default=0,
+        description="How many of the oldest reports were folded into the digest.",
+    )
+    intel_digest: Optional[str] = Field(
+        default=None, description="The new intel digest, if it changed."
+    )
+    victory_points: Optional[int] = Field(
+        default=None, description="The new score, if it changed."
+    )
+    character: Optional[Character] = Field(
+        default=None,
+        description=(
+            "The whole character, for characters that are new or changed in a "
+            "way the fields above cannot express."
+        ),
+    )
+
+    @classmethod
+    def between(cls, before: Optional[Character], after: Character) -> "CharacterDelta":
+        if before is None:
+            return cls(character=after)
+        folded = _folded_intel(before, after)
+        unchanged = {
+            "resources",
+            "statuses",
+            "known_intel",
+            "intel_digest",
+            "victory_points",
+        }
+        if folded is None or before.model_dump(exclude=unchanged) != (
+            after.model_dump(exclude=unchanged)
+        ):
+            return cls(character=after)
+        return cls(
+            resources=_changed(before.resources, after.resources),
+            removed_resources=_removed(before.resources, after.resources),
+            statuses=_changed(before.statuses, after.statuses),
+            removed_statuses=_removed(before.statuses, after.statuses),
+            new_intel=after.known_intel[len(before.known_intel) - folded :],
+            folded_intel=folded,
+            intel_digest=(
+                after.intel_digest
+                if after.intel_digest != before.intel_digest
+                else None
+            ),
+            victory_points=(
+                after.victory_points
+                if after.victory_points != before.victory_points
+                else None
+            ),
+        )
+
+    def is_empty(self) -> bool:
+        return self == CharacterDelta()
+
+    def apply(self, character: Character) -> Character:
+        if self.character is not None:
+            return self.character
+        resources = {
+            name: value
+            for name, value in {**character.resources, **self.resources}.items()
+            if name not in self.removed_resources
+        }
+        statuses = {
+            name: value
+            for name, value in {**character.statuses, **self.statuses}.items()
+            if name not in self.removed_statuses
+        }
+        return character.model_copy(
+            update={
+                "resources": resources,
+                "statuses": statuses,
+                "known_intel": [
+                    *character.known_intel[self.folded_intel :],
+                    *self.new_intel,
+                ],
+                "intel_digest": (
+                    character.intel_digest
+                    if self.intel_digest is None
+                    else self.intel_digest
+                ),
+                "victory_points": (
+                    character.victory_points
+                    if self.victory_points is None
+                    else self.victory_points
+                ),
+            }
+        )
+
+
+class GameStateDelta(BaseModel):
+    """
+    The difference between two game states: the top-level fields that changed
+    and a delta per changed character. Its size depends on what a round changed,
+    not on how long the game has run.
+    """
+
+    fields: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="New JSON values of the changed top-level fields.",
+    )
+    characters: Dict[str, CharacterDelta] = Field(default_factory=dict)
+    removed_characters: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def between(cls, before: GameState, after: GameState) -> "GameStateDelta":
+        fields = {
+            name: value
+            for name, value in after.model_dump(
+                mode="json", exclude={"characters"}
+            ).items()
+            if getattr(before, name) != getattr(after, name)
+        }
+        characters = {}
+        for character_id, character in after.characters.items():
+            previous = before.characters.get(character_id)
+            if previous is character or previous == character:
+                continue
+            characters[character_id] = CharacterDelta.between(previous, character)
+        return cls(
+            fields=fields,
+            characters={
+                character_id: delta
+                for character_id, delta in characters.items()
+                if not delta.is_empty()
+            },
+            removed_characters=_removed(before.characters, after.characters),
+        )
+
+    def apply(self, state: GameState) -> GameState:
+        characters = {
+            character_id: (
+                self.characters[character_id].apply(character)
+                if character_id in self.characters
+                else character
+            )
+            for character_id, character in state.characters.items()
+            if character_id not in self.removed_characters
+        }
+        for character_id, delta in self.characters.items():
+            if character_id not in characters:
+                # Characters new in this delta are always recorded whole.
+                characters[character_id] = delta.character
+        return state.model_copy(
+            update={
+                **{
+                    name: _field_adapter(name).validate_python(value)
+                    for name, value in self.fields.items()
+                },
+                "characters": characters,
+            }
+        )
+
+
+@lru_cache
+def _field_adapter(name: str) -> TypeAdapter:
+    return TypeAdapter(GameState.model_fields[name].annotation)
+
+
+def _folded_intel(before: Character, after: Character) -> Optional[int]:
+    """
+    How many of `before`'s oldest reports `after` folded into its digest, when
+    `after`'s known_intel is the rest followed by new reports; None otherwise.
+    Reports are only folded when the digest changes.
+    """
+    foldable = (
+        len(before.known_intel) if after.intel_digest != before.intel_digest else 0
+    )
+    for folded in range(foldable + 1):
+        kept = before.known_intel[folded:]
+        if after.known_intel[: len(kept)] == kept:
+            return folded
+    return None
+
+
+def _changed(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        name: value
+        for name, value in after.items()
+        if name not in before or before[name] != value
+    }
+
+
+def _removed(before: Dict[str, Any], after: Dict[str, Any]) -> List[str]:
+    return [name for name in before if name not in after]
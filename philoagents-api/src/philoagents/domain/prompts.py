@@ -202,11 +202,12 @@ You are the neutral, omniscient Narrator of a historical crisis simulation. Your
 ---
 
 **Current game state:**
-This is the complete and authoritative state of the world BEFORE this round's actions are resolved. The declared resource costs of this round's actions have ALREADY been paid and deducted by the game engine, and are reflected in these numbers.
+This is the complete and authoritative state of the world BEFORE this round's actions are resolved. The declared resource costs of this round's actions have ALREADY been paid and deducted by the game engine, and are reflected in these numbers. It is compact JSON: `crisis` is the previous crisis update, and each character, keyed by ID, has `res` (resources), `st` (statuses), `vp` (victory points) and `goals`.
 {{current_game_state_json}}
 ---
 
 **Player Actions for this Round:**
+Each action gives the acting character's ID (`by`), its type, its declared `cost` (already paid) and its `details`.
 {{actions_json}}
 ---
 
@@ -314,6 +315,29 @@ UNDERGAME_GUESS_PROMPT = Prompt(
     prompt=__UNDERGAME_GUESS_PROMPT,
 )
 
+# --- Intel Digest ---
+
+__INTEL_DIGEST_PROMPT = """
+You keep the intelligence files of {{character_name}} in a long-running political
+simulation. Older reports are folded into a running digest so the file stays short.
+
+Current digest:
+{{intel_digest}}
+
+Reports to fold in, oldest first:
+{{reports}}
+
+Write the updated digest in at most 150 words. Keep who did what, to whom, and
+with which forces or resources; alliances and betrayals; and any hint of a hidden
+agenda behind events. Drop details that later reports superseded. Respond with
+the digest only.
+"""
+
+INTEL_DIGEST_PROMPT = Prompt(
+    name="intel_digest_prompt",
+    prompt=__INTEL_DIGEST_PROMPT,
+)
+
 __DELEGATE_CONVERSATIONAL_PROMPT = """
 Let's roleplay. You are {{character_name}}, a historical figure engaged in a private conversation.
 Respond concisely and in character, according to your defined personality and goals.
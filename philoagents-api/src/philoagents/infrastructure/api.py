@@ -1,3 +1,4 @@
+import asyncio
 import json
 from contextlib import asynccontextmanager
 
@@ -6,6 +7,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from opik.integrations.langchain import OpikTracer
 from pydantic import BaseModel, Field
 
+from philoagents.application.conversation_service.conversation_graph import (
+    close_conversation_graph,
+    warm_up_conversation_graph,
+)
+from philoagents.application.conversation_service.conversation_summary import (
+    cancel_pending_summaries,
+)
 from philoagents.application.conversation_service.generate_response import (
     get_response,
     get_streaming_response,
@@ -16,9 +24,14 @@ from philoagents.application.conversation_service.reset_conversation import (
 from philoagents.application.game_loop_service.api import router as game_loop_router
 from philoagents.config import settings
 from philoagents.domain.character_factory import CharacterFactory
-from philoagents.infrastructure.dependencies import get_character_factory
+from philoagents.infrastructure.dependencies import (
+    get_character_factory,
+    get_game_session_registry,
+    get_game_state_repository,
+)
 
 from .opik_utils import configure
+from .ws_stream import ChatMultiplexer, ChunkStreamer
 
 configure()
 
@@ -26,9 +39,16 @@ configure()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handles startup and shutdown events for the API."""
-    # Startup code (if any) goes here
+    eviction_task = asyncio.create_task(get_game_session_registry().run_eviction_loop())
+    # Connect the checkpointer in the background so startup doesn't wait on MongoDB.
+    warm_up_task = asyncio.create_task(warm_up_conversation_graph())
     yield
-    # Shutdown code goes here
+    eviction_task.cancel()
+    warm_up_task.cancel()
+    cancel_pending_summaries()
+    # Write the game states still waiting in the write-behind queue.
+    await get_game_state_repository().close()
+    close_conversation_graph()
     opik_tracer = OpikTracer()
     opik_tracer.flush()
 
@@ -77,9 +97,61 @@ async def chat(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _stream_chat(chats: ChatMultiplexer, data: dict, tag: dict):
+    """Streams one reply over the socket, tagging every frame with `tag`."""
+    try:
+        character_factory = get_character_factory()
+        receiver_character = character_factory.get_character(data["receiver_id"])
+
+        # Use streaming response instead of get_response
+        response_stream = get_streaming_response(
+            messages=data["message"],
+            sender_id=data["sender_id"],
+            receiver_character=receiver_character,
+        )
+
+        # Send initial message to indicate streaming has started
+        await chats.send({**tag, "streaming": True})
+
+        # Coalesce the chunks into a few frames, sent by a separate task so a
+        # slow client doesn't hold up the LLM stream.
+        streamer = ChunkStreamer(
+            chats.send_text,
+            flush_ms=settings.WS_CHUNK_FLUSH_MS,
+            flush_bytes=settings.WS_CHUNK_FLUSH_BYTES,
+            max_queued_frames=settings.WS_SEND_QUEUE_MAX_FRAMES,
+            extra=tag,
+        )
+        streamer.start()
+        try:
+            async for chunk in response_stream:
+                streamer.feed(chunk)
+            await streamer.close()
+        finally:
+            await streamer.aclose()
+            await response_stream.aclose()
+
+        await chats.send({**tag, "response": streamer.text, "streaming": False})
+
+    except Exception as e:
+        opik_tracer = OpikTracer()
+        opik_tracer.flush()
+
+        await chats.send({**tag, "error": str(e)})
+
+
 @app.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
+    """
+    Streams chat replies. A message may carry a `request_id`; the frames of
+    its reply then carry it as `id`, and it runs concurrently with requests to
+    other characters, while messages in the same conversation are answered in
+    order. Messages without a `request_id` are answered one after another.
+    """
     await websocket.accept()
+    chats = ChatMultiplexer(
+        websocket.send_text, max_inflight=settings.WS_MAX_INFLIGHT_CHATS
+    )
 
     try:
         while True:
@@ -90,13 +162,11 @@ async def websocket_chat(websocket: WebSocket):
             except Exception:
                 # A non-text frame (e.g. binary) makes receive_text() raise.
                 # Reject it but keep the connection usable.
-                await websocket.send_json(
-                    {"error": "Only text (JSON) messages are supported."}
-                )
+                await chats.send({"error": "Only text (JSON) messages are supported."})
                 continue
 
             if len(raw.encode("utf-8")) > settings.MAX_WS_MESSAGE_BYTES:
-                await websocket.send_json(
+                await chats.send(
                     {
                         "error": (
                             "Message too large. Limit is "
@@ -109,68 +179,60 @@ async def websocket_chat(websocket: WebSocket):
             try:
                 data = json.loads(raw)
             except json.JSONDecodeError:
-                await websocket.send_json({"error": "Message must be valid JSON."})
+                await chats.send({"error": "Message must be valid JSON."})
                 continue
 
+            request_id = data.get("request_id") if isinstance(data, dict) else None
+            if request_id is not None and (
+                not isinstance(request_id, (str, int)) or isinstance(request_id, bool)
+            ):
+                await chats.send(
+                    {"error": "'request_id' must be a string or an integer."}
+                )
+                continue
+            tag = {} if request_id is None else {"id": request_id}
+
             if not isinstance(data, dict) or not all(
                 isinstance(data.get(field), str)
                 for field in ("message", "sender_id", "receiver_id")
             ):
-                await websocket.send_json(
+                await chats.send(
                     {
+                        **tag,
                         "error": (
                             "Invalid message format. Required string fields: "
                             "'message', 'sender_id', 'receiver_id'."
-                        )
+                        ),
                     }
                 )
                 continue
 
             if len(data["message"]) > settings.MAX_CHAT_MESSAGE_CHARS:
-                await websocket.send_json(
+                await chats.send(
                     {
+                        **tag,
                         "error": (
                             "Chat message too long. Limit is "
                             f"{settings.MAX_CHAT_MESSAGE_CHARS} characters."
-                        )
+                        ),
                     }
                 )
                 continue
 
-            try:
-                character_factory = get_character_factory()
-                receiver_character = character_factory.get_character(
-                    data["receiver_id"]
-                )
-
-                # Use streaming response instead of get_response
-                response_stream = get_streaming_response(
-                    messages=data["message"],
-                    sender_id=data["sender_id"],
-                    receiver_character=receiver_character,
-                )
-
-                # Send initial message to indicate streaming has started
-                await websocket.send_json({"streaming": True})
-
-                # Stream each chunk of the response
-                full_response = ""
-                async for chunk in response_stream:
-                    full_response += chunk
-                    await websocket.send_json({"chunk": chunk})
-
-                await websocket.send_json(
-                    {"response": full_response, "streaming": False}
-                )
-
-            except Exception as e:
-                opik_tracer = OpikTracer()
-                opik_tracer.flush()
-
-                await websocket.send_json({"error": str(e)})
+            # Untagged replies can't be told apart, so they share one queue.
+            thread = (
+                None
+                if request_id is None
+                else tuple(sorted((data["sender_id"], data["receiver_id"])))
+            )
+            await chats.submit(
+                thread, lambda data=data, tag=tag: _stream_chat(chats, data, tag)
+            )
 
     except WebSocketDisconnect:
         pass
+    finally:
+        await chats.aclose()
 
 
 @app.post("/reset-memory")
@@ -0,0 +1,158 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from langchain_core.documents import Document
+from loguru import logger
+
+from philoagents.config import settings
+
+
+def chunk_ids(documents: List[Document]) -> List[str]:
+    """
+    The ids of retrieved chunks: their MongoDB ids, or a hash of their text
+    when a chunk has none.
+    """
+    return [
+        str(
+            document.metadata.get("_id")
+            or hashlib.sha256(document.page_content.encode()).hexdigest()
+        )
+        for document in documents
+    ]
+
+
+def context_summary_key(ids: List[str], summarizer: str) -> str:
+    """
+    Keys a summary by the set of retrieved chunk ids and by `summarizer`,
+    which identifies the model and prompt that produced it.
+    """
+    return hashlib.sha256("\x00".join([summarizer, *sorted(ids)]).encode()).hexdigest()
+
+
+class ContextSummaryCache:
+    """
+    Persistent cache of RAG context summaries stored in a single SQLite file.
+
+    Entries expire `ttl_seconds` after they were written, and the least
+    recently used are evicted beyond `max_entries`. Hits and misses are
+    counted for the lifetime of the process.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: float,
+        max_entries: int,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS context_summaries ("
+            "key TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS context_summaries_last_used "
+            "ON context_summaries (last_used)"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self),
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        now = self._clock()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT summary FROM context_summaries "
+                "WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._connection.execute(
+                    "UPDATE context_summaries SET last_used = ? WHERE key = ?",
+                    (now, key),
+                )
+                self._connection.commit()
+        logger.info(
+            f"Context summary cache {'hit' if row else 'miss'} "
+            f"(hit rate {self.hit_rate:.0%} over {self.hits + self.misses} lookups)."
+        )
+        return row[0] if row else None
+
+    def put(self, key: str, summary: str):
+        now = self._clock()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO context_summaries "
+                "(key, summary, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, summary, now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM context_summaries WHERE created_at <= ?",
+                (now - self.ttl_seconds,),
+            )
+            self._evict_least_recently_used()
+            self._connection.commit()
+
+    def _evict_least_recently_used(self):
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM context_summaries"
+        ).fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM context_summaries WHERE key IN ("
+                "SELECT key FROM context_summaries ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM context_summaries")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM context_summaries"
+            ).fetchone()
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_context_summary_cache() -> Optional[ContextSummaryCache]:
+    """Returns the process-wide context summary cache, or None when disabled."""
+    if not settings.RAG_CONTEXT_SUMMARY_CACHE_ENABLED:
+        return None
+    return ContextSummaryCache(
+        settings.RAG_CONTEXT_SUMMARY_CACHE_PATH,
+        ttl_seconds=settings.RAG_CONTEXT_SUMMARY_CACHE_TTL_SECONDS,
+        max_entries=settings.RAG_CONTEXT_SUMMARY_CACHE_MAX_ENTRIES,
+    )
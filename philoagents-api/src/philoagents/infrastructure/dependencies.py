@@ -1,8 +1,12 @@
 # This file is for creating and providing shared, singleton instances of services, factories, and other dependencies.
 
+from fastapi import HTTPException, Query
 from loguru import logger
 
 from philoagents.application.game_loop_service.service import GameLoopService
+from philoagents.application.game_loop_service.session_registry import (
+    GameSessionRegistry,
+)
 from philoagents.application.scenario_loader import ScenarioLoader
 from philoagents.config import settings
 from philoagents.domain.character_factory import CharacterFactory
@@ -19,17 +23,15 @@ initial_game_state = scenario_loader.create_initial_game_state()
 undergame_plot = scenario_loader.get_undergame_plot()
 undergame_plot_display = scenario_loader.get_undergame_plot_for_display()
 game_state_repository = GameStateRepository()
-game_service_instance = GameLoopService(
+game_session_registry = GameSessionRegistry(
     initial_state=initial_game_state,
     undergame_plot=undergame_plot,
     factory=character_factory_instance,
     undergame_plot_display=undergame_plot_display,
     state_repository=game_state_repository,
 )
-if not game_service_instance.try_resume():
-    logger.info("No saved game found; starting a new game.")
 logger.info(
-    f"Game service initialized for scenario: '{scenario_loader.manifest['name']}'"
+    f"Game session registry initialized for scenario: '{scenario_loader.manifest['name']}'"
 )
 
 
@@ -41,6 +43,27 @@ def get_character_factory() -> CharacterFactory:
     return character_factory_instance
 
 
-def get_game_service() -> GameLoopService:
-    """A FastAPI dependency that provides the singleton GameLoopService instance."""
-    return game_service_instance
+def get_game_state_repository() -> GameStateRepository:
+    """Provides the singleton GameStateRepository shared by every game session."""
+    return game_state_repository
+
+
+def get_game_session_registry() -> GameSessionRegistry:
+    """A FastAPI dependency that provides the singleton GameSessionRegistry instance."""
+    return game_session_registry
+
+
+async def get_game_service(
+    game_id: str = Query(
+        default=GameStateRepository.DEFAULT_GAME_ID,
+        min_length=1,
+        max_length=64,
+        pattern=r"^[A-Za-z0-9_-]+$",
+        description="The game to act on. Omit it to use the default game.",
+    ),
+) -> GameLoopService:
+    """A FastAPI dependency that provides the GameLoopService hosting `game_id`."""
+    try:
+        return await game_session_registry.get(game_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -0,0 +1,274 @@
+import asyncio
+import json
+import math
+import threading
+import time
+from functools import lru_cache
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import get_llm_cache
+from langchain_core.load import dumps
+from langchain_core.messages import (
+    AIMessageChunk,
+    BaseMessage,
+    message_chunk_to_message,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.outputs.chat_generation import merge_chat_generation_chunks
+from langchain_groq import ChatGroq
+from loguru import logger
+
+from philoagents.config import settings
+
+# Rough characters-per-token ratio used to estimate prompt sizes without
+# loading a tokenizer on every call. Slightly pessimistic for English.
+CHARS_PER_TOKEN = 3.5
+TOKENS_PER_MESSAGE = 4
+
+
+class TokenBucket:
+    """
+    A budget that refills continuously up to `capacity_per_minute`.
+
+    Reservations are always granted but may overdraw the bucket; the caller
+    is told how long to wait until the debt is repaid. Later reservations
+    wait behind earlier ones, so callers are served in arrival order.
+    """
+
+    def __init__(
+        self, capacity_per_minute: float, clock: Callable[[], float] = time.monotonic
+    ):
+        self.capacity = float(capacity_per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self._clock = clock
+        self._level = self.capacity
+        self._updated_at = clock()
+
+    def reserve(self, amount: float) -> float:
+        """Takes `amount` and returns how many seconds to wait before using it."""
+        # A single request larger than the whole budget could never be served.
+        amount = min(amount, self.capacity)
+        now = self._clock()
+        self._level = min(
+            self.capacity,
+            self._level + (now - self._updated_at) * self.refill_per_second,
+        )
+        self._updated_at = now
+        self._level -= amount
+        return max(0.0, -self._level / self.refill_per_second)
+
+    def refund(self, amount: float):
+        """Gives back a reservation that will not be used."""
+        self._level = min(self.capacity, self._level + min(amount, self.capacity))
+
+
+class ModelRateLimiter:
+    """
+    The requests-per-minute and tokens-per-minute budgets of one Groq model,
+    shared by every chain that calls it (from the event loop or threads).
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model_name = model_name
+        self._requests = TokenBucket(requests_per_minute, clock)
+        self._tokens = TokenBucket(tokens_per_minute, clock)
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Reserves one request and `tokens`; returns the seconds to wait first."""
+        with self._lock:
+            return max(self._requests.reserve(1), self._tokens.reserve(tokens))
+
+    def refund(self, tokens: int):
+        """Gives back a reservation whose request was never sent."""
+        with self._lock:
+            self._requests.refund(1)
+            self._tokens.refund(tokens)
+
+    def _log_wait(self, wait: float, tokens: int):
+        logger.info(
+            f"Rate limit for '{self.model_name}': queuing a ~{tokens}-token "
+            f"request for {wait:.1f}s."
+        )
+
+    async def acquire(self, tokens: int):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._log_wait(wait, tokens)
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                # Cancelled calls (discarded speculation, evicted sessions,
+                # closed chats) must not hold back the ones still waiting.
+                self.refund(tokens)
+                raise
+
+    def acquire_blocking(self, tokens: int):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._log_wait(wait, tokens)
+            time.sleep(wait)
+
+
+@lru_cache(maxsize=None)
+def get_model_rate_limiter(model_name: str) -> ModelRateLimiter:
+    """Returns the process-wide limiter for `model_name`."""
+    limits = settings.GROQ_RATE_LIMITS.get(model_name, settings.GROQ_DEFAULT_RATE_LIMIT)
+    return ModelRateLimiter(
+        model_name,
+        requests_per_minute=limits.requests_per_minute,
+        tokens_per_minute=limits.tokens_per_minute,
+    )
+
+
+def estimate_request_tokens(
+    messages: List[BaseMessage], max_tokens: Optional[int], call_kwargs: dict
+) -> int:
+    """
+    Estimates what Groq will count against the tokens-per-minute budget: the
+    prompt (including tool and response schemas) plus the completion budget.
+    """
+    chars = sum(len(str(message.content)) for message in messages)
+    for key in ("tools", "response_format"):
+        if call_kwargs.get(key):
+            chars += len(json.dumps(call_kwargs[key], default=str))
+    prompt_tokens = math.ceil(chars / CHARS_PER_TOKEN) + TOKENS_PER_MESSAGE * len(
+        messages
+    )
+    completion_tokens = max_tokens or settings.GROQ_DEFAULT_COMPLETION_TOKENS
+    return prompt_tokens + completion_tokens
+
+
+def _cached_chunk(generation: ChatGeneration) -> ChatGenerationChunk:
+    """A cached response replayed as a single stream chunk."""
+    message = generation.message
+    return ChatGenerationChunk(
+        message=AIMessageChunk(
+            content=message.content,
+            additional_kwargs=message.additional_kwargs,
+            response_metadata=message.response_metadata,
+            usage_metadata=getattr(message, "usage_metadata", None),
+        ),
+        generation_info=generation.generation_info,
+    )
+
+
+def _recorded_generation(chunks: List[ChatGenerationChunk]) -> List[ChatGeneration]:
+    """The streamed chunks as the generation the invoke path would cache."""
+    generation = merge_chat_generation_chunks(chunks)
+    if generation is None:
+        return []
+    return [
+        ChatGeneration(
+            message=message_chunk_to_message(generation.message),
+            generation_info=generation.generation_info,
+        )
+    ]
+
+
+class RateLimitedChatGroq(ChatGroq):
+    """
+    ChatGroq that waits for its model's rate-limit budget before every request
+    (each retry included), queuing calls instead of letting them fail with 429.
+
+    LangChain only consults the model's `cache` when invoking it, so streamed
+    calls look it up themselves: a hit is replayed as one chunk without
+    reserving any budget, and a miss is recorded once the stream completes.
+    """
+
+    def _estimate(self, messages: List[BaseMessage], kwargs: dict) -> int:
+        return estimate_request_tokens(messages, self.max_tokens, kwargs)
+
+    def _limiter(self, delegates_to_stream: bool = False) -> Optional[ModelRateLimiter]:
+        # With streaming=True, ChatGroq's _generate/_agenerate run through
+        # _stream/_astream, which reserve the budget themselves.
+        if not settings.GROQ_RATE_LIMITS_ENABLED or delegates_to_stream:
+            return None
+        return get_model_rate_limiter(self.model_name)
+
+    def _generate(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        limiter = self._limiter(delegates_to_stream=self.streaming)
+        if limiter is not None:
+            limiter.acquire_blocking(self._estimate(messages, kwargs))
+        return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> ChatResult:
+        limiter = self._limiter(delegates_to_stream=self.streaming)
+        if limiter is not None:
+            await limiter.acquire(self._estimate(messages, kwargs))
+        return await super()._agenerate(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        )
+
+    def _stream_cache(
+        self, messages: List[BaseMessage], stop: Any, kwargs: dict
+    ) -> Tuple[Optional[BaseCache], str, str]:
+        """The cache streamed calls use, with the keys the invoke path uses."""
+        if isinstance(self.cache, BaseCache):
+            cache = self.cache
+        else:
+            cache = get_llm_cache() if self.cache is not False else None
+        if cache is None:
+            return None, "", ""
+        prompt = dumps(
+            [
+                message.model_copy(update={"id": None}) if message.id else message
+                for message in messages
+            ]
+        )
+        return cache, prompt, self._get_llm_string(stop=stop, **kwargs)
+
+    def _stream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        cache, prompt, llm_string = self._stream_cache(messages, stop, kwargs)
+        if cache is not None:
+            # Raises LLMCacheMiss in replay mode.
+            cached = cache.lookup(prompt, llm_string)
+            if cached:
+                yield _cached_chunk(cached[0])
+                return
+        limiter = self._limiter()
+        if limiter is not None:
+            limiter.acquire_blocking(self._estimate(messages, kwargs))
+        chunks = []
+        for chunk in super()._stream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            chunks.append(chunk)
+            yield chunk
+        if cache is not None and chunks:
+            cache.update(prompt, llm_string, _recorded_generation(chunks))
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        cache, prompt, llm_string = self._stream_cache(messages, stop, kwargs)
+        if cache is not None:
+            # Raises LLMCacheMiss in replay mode.
+            cached = await cache.alookup(prompt, llm_string)
+            if cached:
+                yield _cached_chunk(cached[0])
+                return
+        limiter = self._limiter()
+        if limiter is not None:
+            await limiter.acquire(self._estimate(messages, kwargs))
+        chunks = []
+        async for chunk in super()._astream(
+            messages, stop=stop, run_manager=run_manager, **kwargs
+        ):
+            chunks.append(chunk)
+            yield chunk
+        if cache is not None and chunks:
+            await cache.aupdate(prompt, llm_string, _recorded_generation(chunks))
@@ -0,0 +1,143 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from loguru import logger
+
+from philoagents.config import settings
+
+
+class LLMCacheMode(str, Enum):
+    """
+    OFF: every call goes to Groq.
+    RECORD: answer from the cache when possible, otherwise call Groq and store
+        the response.
+    REPLAY: answer only from the cache; a miss raises LLMCacheMiss instead of
+        calling Groq, so a run is guaranteed to be offline and reproducible.
+    """
+
+    OFF = "off"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    Content-addressed LLM response cache stored in a single SQLite file.
+
+    Entries are keyed by a hash of the model configuration (model, temperature,
+    max_tokens, bound tools and response schema) and of the rendered prompt,
+    so any change to either misses. The least recently used entries are
+    evicted beyond `max_entries`.
+    """
+
+    def __init__(self, path: Path, mode: LLMCacheMode, max_entries: int):
+        self.path = Path(path)
+        self.mode = mode
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # LangChain's async lookups run in executor threads.
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key TEXT PRIMARY KEY, generations TEXT NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS llm_responses_last_used "
+            "ON llm_responses (last_used)"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode()).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT generations FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self._connection.execute(
+                    "UPDATE llm_responses SET last_used = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._connection.commit()
+
+        if row is None:
+            if self.mode == LLMCacheMode.REPLAY:
+                raise LLMCacheMiss(
+                    f"No recorded LLM response for this request (key {key[:12]}) "
+                    f"in {self.path}. Record it first with LLM_CACHE_MODE=record."
+                )
+            return None
+        return [
+            loads(generation, allowed_objects="core")
+            for generation in json.loads(row[0])
+        ]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE):
+        if self.mode != LLMCacheMode.RECORD:
+            return
+        key = self._key(prompt, llm_string)
+        generations = json.dumps([dumps(generation) for generation in return_val])
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, generations, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, generations, time.time()),
+            )
+            self._evict_least_recently_used()
+            self._connection.commit()
+
+    def _evict_least_recently_used(self):
+        (count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM llm_responses"
+        ).fetchone()
+        excess = count - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                "SELECT key FROM llm_responses ORDER BY last_used ASC LIMIT ?)",
+                (excess,),
+            )
+
+    def clear(self, **kwargs: Any):
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_responses")
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM llm_responses"
+            ).fetchone()
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """Returns the process-wide LLM response cache, or None when it is off."""
+    mode = LLMCacheMode(settings.LLM_CACHE_MODE)
+    if mode == LLMCacheMode.OFF:
+        return None
+    logger.info(
+        f"LLM response cache in '{mode.value}' mode at {settings.LLM_CACHE_PATH}."
+    )
+    return SQLiteLLMCache(
+        settings.LLM_CACHE_PATH, mode=mode, max_entries=settings.LLM_CACHE_MAX_ENTRIES
+    )
@@ -1,65 +1,286 @@
-from typing import Optional
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
 
 from loguru import logger
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, AsyncMongoClient
 from pymongo.errors import PyMongoError
 
 from philoagents.config import settings
 from philoagents.domain.game_state import GameState
+from philoagents.domain.game_state_delta import GameStateDelta
+
+
+@dataclass
+class _JournalPosition:
+    """The last journal entry written for a game and the state it produced."""
+
+    seq: int
+    state: Optional[GameState]
+    deltas_since_snapshot: int = 0
+
+
+@dataclass
+class _SharedWrites:
+    """Write-behind bookkeeping shared by every repository from `for_game`."""
+
+    unsaved: Dict[str, GameState] = field(default_factory=dict)
+    writes: Dict[str, asyncio.Task] = field(default_factory=dict)
+    positions: Dict[str, _JournalPosition] = field(default_factory=dict)
+    indexed: bool = False
 
 
 class GameStateRepository:
-    """Persists the active game state so a server restart can resume an in-progress game.
+    """Persists a game's state so a server restart can resume an in-progress game.
+
+    Each game is stored as an append-only journal: every save appends the delta
+    from the previously saved state (resource and status changes, new intel, VP
+    awards, ...), and every `snapshot_interval` saves the entry also carries a
+    full snapshot. Loading replays the deltas after the latest snapshot, so a
+    round's write stays small however long the game runs, and `history`
+    replays a whole game. Games saved before the journal existed are read from
+    their single document and continue in the journal.
+
+    Repositories scoped to different games via `for_game` share one
+    AsyncMongoClient (and its connection pool), so writes never occupy
+    executor threads.
+
+    Saves are write-behind: `save` only records the latest state and returns.
+    A background task per game writes it after `write_delay_seconds`, so
+    successive saves (start, round commit, finalize) coalesce into one write of
+    the newest state. `load` and `clear` wait for the game's pending write, and
+    `close` for every game's.
 
     All operations are best-effort: persistence failures are logged but never
     interrupt the game loop, which keeps running on its in-memory state.
     """
 
-    GAME_STATE_DOC_ID = "active_game"
+    # The id of the single game hosted before multi-game sessions existed;
+    # kept as the default so that saved game still resumes.
+    DEFAULT_GAME_ID = "active_game"
 
     def __init__(
         self,
         mongodb_uri: str = settings.MONGO_URI,
         database_name: str = settings.MONGO_DB_NAME,
         collection_name: str = settings.MONGO_GAME_STATE_COLLECTION,
+        journal_collection_name: str = settings.MONGO_GAME_STATE_JOURNAL_COLLECTION,
+        game_id: str = DEFAULT_GAME_ID,
+        client: Optional[AsyncMongoClient] = None,
+        write_delay_seconds: float = settings.GAME_STATE_WRITE_DELAY_MS / 1000,
+        snapshot_interval: int = settings.GAME_STATE_SNAPSHOT_INTERVAL,
     ) -> None:
-        self.client = MongoClient(
-            mongodb_uri, appname="philoagents", serverSelectionTimeoutMS=5000
+        self.client = client or AsyncMongoClient(
+            mongodb_uri,
+            appname="philoagents",
+            serverSelectionTimeoutMS=5000,
+            maxPoolSize=settings.MONGO_GAME_STATE_MAX_POOL_SIZE,
         )
+        self.database_name = database_name
+        self.collection_name = collection_name
+        self.journal_collection_name = journal_collection_name
+        # Holds the one-document saves from before the journal; only read.
         self.collection = self.client[database_name][collection_name]
+        self.journal = self.client[database_name][journal_collection_name]
+        self.game_id = game_id
+        self.write_delay_seconds = write_delay_seconds
+        self.snapshot_interval = snapshot_interval
+        self._shared = _SharedWrites()
+
+    def for_game(self, game_id: str) -> "GameStateRepository":
+        """Returns a repository for another game that reuses this client."""
+        repository = GameStateRepository(
+            database_name=self.database_name,
+            collection_name=self.collection_name,
+            journal_collection_name=self.journal_collection_name,
+            game_id=game_id,
+            client=self.client,
+            write_delay_seconds=self.write_delay_seconds,
+            snapshot_interval=self.snapshot_interval,
+        )
+        repository._shared = self._shared
+        return repository
+
+    async def save(self, state: GameState) -> None:
+        """
+        Schedules `state` to be written. The state is kept by reference, which
+        is safe because the game loop never modifies a published snapshot.
+        """
+        self._shared.unsaved[self.game_id] = state
+        if self.game_id not in self._shared.writes:
+            self._shared.writes[self.game_id] = asyncio.create_task(
+                self._write_behind()
+            )
+
+    async def _write_behind(self) -> None:
+        try:
+            await asyncio.sleep(self.write_delay_seconds)
+            while (state := self._shared.unsaved.pop(self.game_id, None)) is not None:
+                await self._write(state)
+        finally:
+            self._shared.writes.pop(self.game_id, None)
 
-    def save(self, state: GameState) -> None:
+    async def _write(self, state: GameState) -> None:
         try:
-            self.collection.replace_one(
-                {"_id": self.GAME_STATE_DOC_ID},
-                {
-                    "_id": self.GAME_STATE_DOC_ID,
-                    "state": state.model_dump(mode="json"),
-                },
-                upsert=True,
+            await self._ensure_indexes()
+            position = await self._position()
+            entry = {
+                "game_id": self.game_id,
+                "seq": position.seq + 1,
+                "round_number": state.round_number,
+                "version": state.version,
+            }
+            if position.state is not None:
+                entry["delta"] = GameStateDelta.between(
+                    position.state, state
+                ).model_dump(mode="json", exclude_defaults=True)
+            snapshot = (
+                position.state is None
+                or position.deltas_since_snapshot + 1 >= self.snapshot_interval
             )
-            logger.debug(f"Persisted game state at round {state.round_number}.")
+            if snapshot:
+                entry["snapshot"] = state.model_dump(mode="json")
+            await self.journal.insert_one(entry)
         except PyMongoError as e:
-            logger.error(f"Failed to persist game state: {e}")
+            # The entry may have been written anyway; find out where the
+            # journal stands before writing the next one.
+            self._shared.positions.pop(self.game_id, None)
+            logger.error(f"Failed to persist game '{self.game_id}': {e}")
+            return
+        except Exception:
+            # Any other failure (e.g. building or serializing the entry) would
+            # otherwise end the write-behind task with nothing logged. The
+            # cached position is dropped too, so the next entry is a snapshot.
+            self._shared.positions.pop(self.game_id, None)
+            logger.exception(f"Failed to persist game '{self.game_id}'.")
+            return
+
+        self._shared.positions[self.game_id] = _JournalPosition(
+            seq=entry["seq"],
+            state=state,
+            deltas_since_snapshot=(
+                0 if snapshot else position.deltas_since_snapshot + 1
+            ),
+        )
+        logger.debug(
+            f"Persisted game '{self.game_id}' at round {state.round_number} "
+            f"({'snapshot' if snapshot else 'delta'} #{entry['seq']})."
+        )
+
+    async def _ensure_indexes(self) -> None:
+        if not self._shared.indexed:
+            await self.journal.create_index(
+                [("game_id", ASCENDING), ("seq", ASCENDING)], unique=True
+            )
+            self._shared.indexed = True
 
-    def load(self) -> Optional[GameState]:
+    async def _position(self) -> _JournalPosition:
+        position = self._shared.positions.get(self.game_id)
+        if position is None:
+            # Without the last saved state at hand, the next entry must be a
+            # snapshot.
+            last = await self.journal.find_one(
+                {"game_id": self.game_id},
+                projection={"seq": True},
+                sort=[("seq", DESCENDING)],
+            )
+            position = _JournalPosition(seq=last["seq"] if last else -1, state=None)
+        return position
+
+    async def flush(self) -> None:
+        """Waits until this game's saved state has been written."""
+        write = self._shared.writes.get(self.game_id)
+        if write is not None:
+            await asyncio.shield(write)
+
+    async def close(self) -> None:
+        """Waits for every game's pending write, then closes the client."""
+        await asyncio.gather(
+            *(asyncio.shield(write) for write in list(self._shared.writes.values())),
+            return_exceptions=True,
+        )
+        await self.client.close()
+
+    async def load(self) -> Optional[GameState]:
+        # A session evicted and reopened right away must not read the state
+        # from before its last, still pending, save.
+        await self.flush()
         try:
-            document = self.collection.find_one({"_id": self.GAME_STATE_DOC_ID})
+            snapshot = await self.journal.find_one(
+                {"game_id": self.game_id, "snapshot": {"$exists": True}},
+                sort=[("seq", DESCENDING)],
+            )
+            if snapshot is None:
+                return await self._load_document()
+            entries = await self._entries({"$gt": snapshot["seq"]})
         except PyMongoError as e:
-            logger.warning(f"Could not load saved game state: {e}")
+            logger.warning(f"Could not load saved game '{self.game_id}': {e}")
             return None
 
+        try:
+            state = GameState.model_validate(snapshot["snapshot"])
+            for entry in entries:
+                state = GameStateDelta.model_validate(entry["delta"]).apply(state)
+        except Exception as e:
+            logger.warning(
+                f"Saved game '{self.game_id}' is invalid and will be ignored: {e}"
+            )
+            return None
+
+        self._shared.positions[self.game_id] = _JournalPosition(
+            seq=entries[-1]["seq"] if entries else snapshot["seq"],
+            state=state,
+            deltas_since_snapshot=len(entries),
+        )
+        return state
+
+    async def _load_document(self) -> Optional[GameState]:
+        """Loads a game saved as a single document, before the journal."""
+        document = await self.collection.find_one({"_id": self.game_id})
         if document is None:
             return None
 
         try:
             return GameState.model_validate(document["state"])
         except Exception as e:
-            logger.warning(f"Saved game state is invalid and will be ignored: {e}")
+            logger.warning(
+                f"Saved game '{self.game_id}' is invalid and will be ignored: {e}"
+            )
             return None
 
-    def clear(self) -> None:
+    async def _entries(self, seq_filter: Optional[dict] = None) -> List[dict]:
+        query = {"game_id": self.game_id}
+        if seq_filter is not None:
+            query["seq"] = seq_filter
+        return await self.journal.find(query).sort("seq", ASCENDING).to_list()
+
+    async def history(self) -> List[GameState]:
+        """
+        Replays the journal from its first snapshot, returning the state after
+        every save in order (one per round commit, plus start and finalize).
+        """
+        await self.flush()
+        states: List[GameState] = []
+        try:
+            entries = await self._entries()
+        except PyMongoError as e:
+            logger.warning(f"Could not load the history of '{self.game_id}': {e}")
+            return states
+
+        for entry in entries:
+            if "snapshot" in entry:
+                states.append(GameState.model_validate(entry["snapshot"]))
+            elif states:
+                delta = GameStateDelta.model_validate(entry["delta"])
+                states.append(delta.apply(states[-1]))
+        return states
+
+    async def clear(self) -> None:
+        self._shared.unsaved.pop(self.game_id, None)
+        await self.flush()
+        self._shared.positions.pop(self.game_id, None)
         try:
-            self.collection.delete_one({"_id": self.GAME_STATE_DOC_ID})
+            await self.journal.delete_many({"game_id": self.game_id})
+            await self.collection.delete_one({"_id": self.game_id})
         except PyMongoError as e:
-            logger.error(f"Failed to clear saved game state: {e}")
+            logger.error(f"Failed to clear saved game '{self.game_id}': {e}")
@@ -1,4 +1,5 @@
 from langchain_mongodb.index import create_fulltext_search_index
+from loguru import logger
 
 from .client import MongoClientWrapper
 
@@ -16,13 +17,24 @@ class MongoIndex:
         self,
         embedding_dim: int,
     ) -> None:
+        """Creates the vector and full-text search indexes that do not exist yet."""
         vectorstore = self.retriever.vectorstore
+        collection = self.mongodb_client.collection
+        existing = {index["name"] for index in collection.list_search_indexes()}
 
-        vectorstore.create_vector_search_index(
-            dimensions=embedding_dim,
-        )
-        create_fulltext_search_index(
-            collection=self.mongodb_client.collection,
-            field=vectorstore._text_key,
-            index_name=self.retriever.search_index_name,
-        )
+        if vectorstore._index_name in existing:
+            logger.info(f"Search index '{vectorstore._index_name}' already exists.")
+        else:
+            vectorstore.create_vector_search_index(
+                dimensions=embedding_dim,
+            )
+        if self.retriever.search_index_name in existing:
+            logger.info(
+                f"Search index '{self.retriever.search_index_name}' already exists."
+            )
+        else:
+            create_fulltext_search_index(
+                collection=collection,
+                field=vectorstore._text_key,
+                index_name=self.retriever.search_index_name,
+            )
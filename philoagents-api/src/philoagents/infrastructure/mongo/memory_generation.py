@@ -0,0 +1,29 @@
+import uuid
+from typing import Optional
+
+from pymongo.database import Database
+
+from philoagents.config import settings
+
+_GENERATION_ID = "long_term_memory_generation"
+
+
+def get_memory_generation(database: Database) -> Optional[str]:
+    """
+    Returns the token identifying the current contents of long-term memory,
+    or None if it was never recorded. The token changes on every re-ingestion,
+    so caches derived from long-term memory know when to drop their entries.
+    """
+    document = database[settings.MONGO_LONG_TERM_MEMORY_METADATA_COLLECTION].find_one(
+        {"_id": _GENERATION_ID}
+    )
+    return document["generation"] if document else None
+
+
+def bump_memory_generation(database: Database) -> str:
+    """Records that long-term memory changed; returns the new token."""
+    generation = uuid.uuid4().hex
+    database[settings.MONGO_LONG_TERM_MEMORY_METADATA_COLLECTION].update_one(
+        {"_id": _GENERATION_ID}, {"$set": {"generation": generation}}, upsert=True
+    )
+    return generation
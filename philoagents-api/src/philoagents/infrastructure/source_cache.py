@@ -0,0 +1,176 @@
+import sqlite3
+import threading
+import time
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from loguru import logger
+
+from philoagents.config import settings
+
+
+class SourceCacheMode(str, Enum):
+    """
+    OFF: every source is downloaded again.
+    REVALIDATE: sources fetched within the max age are read from the cache;
+        older web pages are revalidated with their ETag/Last-Modified and only
+        downloaded again if they changed.
+    OFFLINE: sources are read only from the cache, whatever their age; a miss
+        raises SourceCacheMiss instead of touching the network.
+    """
+
+    OFF = "off"
+    REVALIDATE = "revalidate"
+    OFFLINE = "offline"
+
+
+class SourceCacheMiss(RuntimeError):
+    """Raised in offline mode for a source that was never fetched."""
+
+
+class SourceCache:
+    """
+    Cache of downloaded RAG sources stored in a single SQLite file, keyed by
+    URL or by the query that produced them.
+
+    Thread safe, so an extractor's workers can share one instance; the lock
+    is never held while downloading.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        mode: SourceCacheMode,
+        max_age_seconds: float,
+        session: Optional[requests.Session] = None,
+        timeout_seconds: float = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.path = Path(path)
+        self.mode = mode
+        self.max_age_seconds = max_age_seconds
+        self.session = session or requests.Session()
+        self.timeout_seconds = timeout_seconds
+        self._clock = clock
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS sources ("
+            "key TEXT PRIMARY KEY, content TEXT NOT NULL, etag TEXT, "
+            "last_modified TEXT, fetched_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def fetch_url(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
+        """The body of the page at `url`, downloaded only if it changed."""
+        entry = self._cached(url)
+        if entry is not None and self._is_fresh(entry):
+            return entry["content"]
+
+        conditional_headers = dict(headers or {})
+        if entry is not None:
+            if entry["etag"]:
+                conditional_headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                conditional_headers["If-Modified-Since"] = entry["last_modified"]
+        response = self.session.get(
+            url, headers=conditional_headers, timeout=self.timeout_seconds
+        )
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"{url} has not changed since it was cached.")
+            self._store(
+                url,
+                entry["content"],
+                etag=response.headers.get("ETag", entry["etag"]),
+                last_modified=response.headers.get(
+                    "Last-Modified", entry["last_modified"]
+                ),
+            )
+            return entry["content"]
+        response.raise_for_status()
+        self._store(
+            url,
+            response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return response.text
+
+    def fetch(self, key: str, load: Callable[[], str]) -> str:
+        """
+        The cached content for `key`, or what `load` returns, for sources
+        such as search queries that cannot be revalidated.
+        """
+        entry = self._cached(key)
+        if entry is not None and self._is_fresh(entry):
+            return entry["content"]
+        content = load()
+        self._store(key, content)
+        return content
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.mode == SourceCacheMode.OFF:
+            return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT content, etag, last_modified, fetched_at FROM sources "
+                "WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            if self.mode == SourceCacheMode.OFFLINE:
+                raise SourceCacheMiss(
+                    f"{key} is not in the source cache at {self.path}. Fetch it "
+                    f"first with RAG_SOURCE_CACHE_MODE=revalidate."
+                )
+            return None
+        return dict(zip(("content", "etag", "last_modified", "fetched_at"), row))
+
+    def _is_fresh(self, entry: Dict[str, Any]) -> bool:
+        return (
+            self.mode == SourceCacheMode.OFFLINE
+            or self._clock() - entry["fetched_at"] < self.max_age_seconds
+        )
+
+    def _store(
+        self,
+        key: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        if self.mode == SourceCacheMode.OFF:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sources "
+                "(key, content, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, content, etag, last_modified, self._clock()),
+            )
+            self._connection.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM sources"
+            ).fetchone()
+        return count
+
+
+@lru_cache(maxsize=1)
+def get_source_cache() -> SourceCache:
+    """Returns the process-wide cache of downloaded RAG sources."""
+    mode = SourceCacheMode(settings.RAG_SOURCE_CACHE_MODE)
+    logger.info(
+        f"RAG source cache in '{mode.value}' mode at {settings.RAG_SOURCE_CACHE_PATH}."
+    )
+    return SourceCache(
+        settings.RAG_SOURCE_CACHE_PATH,
+        mode=mode,
+        max_age_seconds=settings.RAG_SOURCE_CACHE_MAX_AGE_SECONDS,
+    )
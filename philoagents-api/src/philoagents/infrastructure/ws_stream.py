@@ -0,0 +1,201 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from loguru import logger
+
+
+def encode_frame(payload: dict) -> str:
+    """Encodes a WebSocket frame as JSON without whitespace or ASCII escaping."""
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+
+
+class ChunkStreamer:
+    """
+    Relays a token stream to a WebSocket as coalesced chunk frames.
+
+    Chunks are buffered and flushed as one `{"c": text}` frame once the buffer
+    reaches `flush_bytes` or its oldest chunk is `flush_ms` old. Flushed frames
+    wait in a queue of at most `max_queued_frames` for a separate sender task,
+    so a slow client never blocks the producer: while the queue is full, new
+    chunks keep accumulating in the buffer and go out as one larger frame when
+    the client catches up.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[str], Awaitable[Any]],
+        flush_ms: float,
+        flush_bytes: int,
+        max_queued_frames: int,
+        extra: Optional[dict] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._send = send
+        self.flush_seconds = flush_ms / 1000
+        self.flush_bytes = flush_bytes
+        self._extra = extra or {}
+        self._clock = clock
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(max_queued_frames)
+        self._parts: List[str] = []
+        self._pending: List[str] = []
+        self._pending_bytes = 0
+        self._pending_since: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._error: Optional[BaseException] = None
+        self._sender: Optional[asyncio.Task] = None
+        self.chunks = 0
+        self.frames = 0
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return "".join(self._parts)
+
+    def start(self):
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def feed(self, chunk: str):
+        """
+        Buffers a chunk without waiting on the client. Raises the sender's
+        error if the client is gone, so the caller can stop generating.
+        """
+        if self._error is not None:
+            raise self._error
+        if not chunk:
+            return
+        self.chunks += 1
+        self._parts.append(chunk)
+        self._pending.append(chunk)
+        self._pending_bytes += len(chunk.encode("utf-8"))
+        if self._pending_since is None:
+            self._pending_since = self._clock()
+
+        if self._should_flush():
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_seconds, self._flush
+            )
+
+    async def close(self):
+        """Sends whatever is still buffered and waits until the client has it."""
+        self._cancel_timer()
+        if self._error is None and self._pending:
+            await self._queue.put(self._take_frame())
+        await self._queue.put(None)
+        if self._sender is not None:
+            await self._sender
+        if self._error is not None:
+            raise self._error
+
+    async def aclose(self):
+        """Stops the sender without delivering the rest, e.g. after a failure."""
+        self._cancel_timer()
+        if self._sender is not None and not self._sender.done():
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+
+    def _should_flush(self) -> bool:
+        return self._pending_since is not None and (
+            self._pending_bytes >= self.flush_bytes
+            or self._clock() - self._pending_since >= self.flush_seconds
+        )
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _take_frame(self) -> str:
+        frame = encode_frame({**self._extra, "c": "".join(self._pending)})
+        self._pending = []
+        self._pending_bytes = 0
+        self._pending_since = None
+        self.frames += 1
+        return frame
+
+    def _flush(self):
+        self._cancel_timer()
+        if not self._pending or self._queue.full():
+            # The sender flushes the buffer as soon as it frees a slot.
+            return
+        self._queue.put_nowait(self._take_frame())
+
+    async def _send_loop(self):
+        while True:
+            frame = await self._queue.get()
+            if frame is None:
+                return
+            if self._error is not None:
+                # Keep draining so close() never waits on a full queue.
+                continue
+            try:
+                await self._send(frame)
+            except Exception as e:
+                self._error = e
+                continue
+            if self._should_flush():
+                self._flush()
+
+
+class ChatMultiplexer:
+    """
+    Runs the chats received on one WebSocket concurrently.
+
+    Requests submitted under the same key (a conversation thread) run one after
+    another in arrival order; requests under different keys run in parallel.
+    At most `max_inflight` requests are accepted and unanswered at once, and
+    `submit` waits for a free slot, which stops the connection from being read
+    until one frees up. All frames go through `send`, so concurrent replies
+    never write to the socket at the same time.
+    """
+
+    def __init__(self, send_text: Callable[[str], Awaitable[Any]], max_inflight: int):
+        self._send_text = send_text
+        self._send_lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def send(self, payload: dict):
+        await self.send_text(encode_frame(payload))
+
+    async def send_text(self, frame: str):
+        async with self._send_lock:
+            await self._send_text(frame)
+
+    async def submit(self, key: Hashable, handler: Callable[[], Awaitable[Any]]):
+        """Schedules `handler` after the earlier requests under `key`."""
+        await self._slots.acquire()
+        task = asyncio.create_task(self._run(self._tails.get(key), handler))
+        self._tails[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finish(key, done))
+
+    async def aclose(self):
+        """Cancels the requests still running, e.g. once the client is gone."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(
+        self, previous: Optional[asyncio.Task], handler: Callable[[], Awaitable[Any]]
+    ):
+        if previous is not None:
+            await asyncio.wait([previous])
+        await handler()
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        self._slots.release()
+        self._tasks.discard(task)
+        if self._tails.get(key) is task:
+            del self._tails[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Usually the client disconnecting mid-reply.
+            logger.debug(f"WebSocket chat request failed: {task.exception()}")
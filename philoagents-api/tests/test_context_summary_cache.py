@@ -0,0 +1,123 @@
+import asyncio
+
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, ToolMessage
+
+from philoagents.application.conversation_service.workflow import nodes
+from philoagents.infrastructure.context_summary_cache import (
+    ContextSummaryCache,
+    chunk_ids,
+    context_summary_key,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(tmp_path, ttl_seconds=60, max_entries=100, clock=None):
+    return ContextSummaryCache(
+        tmp_path / "summaries.sqlite3",
+        ttl_seconds=ttl_seconds,
+        max_entries=max_entries,
+        clock=clock or FakeClock(),
+    )
+
+
+def test_key_depends_on_the_set_of_chunks_and_the_summarizer():
+    key = context_summary_key(["a", "b"], "model:prompt")
+
+    assert key == context_summary_key(["b", "a"], "model:prompt")
+    assert key != context_summary_key(["a", "c"], "model:prompt")
+    assert key != context_summary_key(["a", "b"], "other-model:prompt")
+
+
+def test_chunks_without_an_id_are_identified_by_their_text():
+    documents = [
+        Document(page_content="Hannibal crossed the Alps.", metadata={"_id": "c1"}),
+        Document(page_content="Rome raised new legions."),
+    ]
+
+    ids = chunk_ids(documents)
+
+    assert ids[0] == "c1"
+    assert ids[1] == chunk_ids([Document(page_content="Rome raised new legions.")])[0]
+
+
+def test_cache_counts_hits_and_misses(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.get("key") is None
+
+    cache.put("key", "summary")
+
+    assert cache.get("key") == "summary"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1}
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    clock = FakeClock()
+    cache = make_cache(tmp_path, ttl_seconds=60, clock=clock)
+    cache.put("key", "summary")
+
+    clock.now += 59
+    assert cache.get("key") == "summary"
+    clock.now += 2
+    assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    clock = FakeClock()
+    cache = make_cache(tmp_path, max_entries=2, clock=clock)
+    cache.put("a", "A")
+    clock.now += 1
+    cache.put("b", "B")
+    clock.now += 1
+    cache.get("a")  # "b" is now the least recently used
+
+    clock.now += 1
+    cache.put("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+
+
+def test_summaries_persist_across_processes(tmp_path):
+    make_cache(tmp_path).put("key", "summary")
+
+    assert make_cache(tmp_path).get("key") == "summary"
+
+
+class CountingSummaryChain:
+    def __init__(self):
+        self.calls = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        return AIMessage(content=f"summary {self.calls}")
+
+
+def test_context_node_reuses_the_summary_of_the_same_chunks(tmp_path, monkeypatch):
+    cache = make_cache(tmp_path)
+    chain = CountingSummaryChain()
+    monkeypatch.setattr(nodes, "get_context_summary_cache", lambda: cache)
+    monkeypatch.setattr(nodes, "get_context_summary_chain", lambda: chain)
+
+    def retrieval(ids):
+        message = ToolMessage(
+            content="[Document(...), Document(...)]",
+            tool_call_id="call-1",
+            artifact=ids,
+        )
+        asyncio.run(nodes.summarize_context_node({"messages": [message]}))
+        return message.content
+
+    assert retrieval(["c1", "c2"]) == "summary 1"
+    assert retrieval(["c2", "c1"]) == "summary 1"
+    assert retrieval(["c1", "c3"]) == "summary 2"
+    assert chain.calls == 2
+    assert cache.hits == 1
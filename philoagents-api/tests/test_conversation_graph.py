@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+from langgraph.checkpoint.memory import InMemorySaver
+
+from philoagents.application.conversation_service import conversation_graph
+
+
+class FakeSaver(InMemorySaver):
+    """Records every checkpointer built; MongoDBSaver would create indexes here."""
+
+    instances: list = []
+
+    def __init__(self, client, **kwargs):
+        super().__init__()
+        self.client = client
+        FakeSaver.instances.append(self)
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_mongo(monkeypatch):
+    FakeSaver.instances = []
+    client = FakeClient()
+    monkeypatch.setattr(conversation_graph, "MongoDBSaver", FakeSaver)
+    monkeypatch.setattr(conversation_graph, "MongoClient", lambda *a, **kw: client)
+    conversation_graph.close_conversation_graph()
+    yield client
+    conversation_graph.close_conversation_graph()
+
+
+def test_graph_and_checkpointer_are_built_once_per_process(fake_mongo):
+    async def run_turns():
+        return await asyncio.gather(
+            *(conversation_graph.aget_conversation_graph() for _ in range(5))
+        )
+
+    results = asyncio.run(run_turns())
+
+    assert len(FakeSaver.instances) == 1
+    assert all(graph is results[0][0] for graph, _ in results)
+    assert results[0][0].checkpointer is FakeSaver.instances[0]
+
+
+def test_invalidate_rebuilds_checkpointer_on_the_same_client(fake_mongo):
+    first_graph, _ = conversation_graph.get_conversation_graph()
+
+    conversation_graph.invalidate_conversation_graph()
+    second_graph, _ = conversation_graph.get_conversation_graph()
+
+    assert second_graph is not first_graph
+    assert len(FakeSaver.instances) == 2
+    assert FakeSaver.instances[0].client is FakeSaver.instances[1].client
+    assert not fake_mongo.closed
+
+
+def test_close_releases_the_pooled_client(fake_mongo):
+    conversation_graph.get_conversation_graph()
+
+    conversation_graph.close_conversation_graph()
+
+    assert fake_mongo.closed
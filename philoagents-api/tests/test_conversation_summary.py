@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.memory import InMemorySaver
+
+from philoagents.application.conversation_service import conversation_summary
+from philoagents.application.conversation_service.workflow import nodes
+from philoagents.application.conversation_service.workflow.graph import (
+    create_workflow_graph,
+)
+from philoagents.config import settings
+
+THREAD_ID = "conv-a-b"
+CONFIG = {"configurable": {"thread_id": THREAD_ID}}
+
+
+class GatedSummaryChain:
+    """Stands in for the summary LLM; holds each call until `release` is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        await self.release.wait()
+        return AIMessage(content=f"summary of {len(inputs['messages'])} messages")
+
+
+@pytest.fixture
+def summary_chain(monkeypatch):
+    chain = GatedSummaryChain()
+    monkeypatch.setattr(nodes, "get_conversation_summary_chain", lambda summary: chain)
+    yield chain
+    conversation_summary.cancel_pending_summaries()
+
+
+def make_graph():
+    return create_workflow_graph().compile(checkpointer=InMemorySaver())
+
+
+async def add_messages(graph, count, start=0):
+    await graph.aupdate_state(
+        CONFIG,
+        {
+            "messages": [
+                HumanMessage(content=f"message {i}", id=f"m{i}")
+                for i in range(start, start + count)
+            ],
+            "character_name": "Hannibal",
+        },
+        as_node="connector_node",
+    )
+    return (await graph.aget_state(CONFIG)).values
+
+
+def test_long_threads_are_summarized_in_the_background(summary_chain):
+    async def scenario():
+        graph = make_graph()
+        state = await add_messages(graph, settings.TOTAL_MESSAGES_SUMMARY_TRIGGER + 1)
+
+        conversation_summary.schedule_conversation_summary(graph, THREAD_ID, state)
+        await asyncio.sleep(0)
+        assert summary_chain.calls == 1  # started, but the turn did not wait
+
+        summary_chain.release.set()
+        await conversation_summary.wait_for_pending_summary(THREAD_ID)
+        return (await graph.aget_state(CONFIG)).values
+
+    values = asyncio.run(scenario())
+
+    assert values["summary"].startswith("summary of")
+    assert len(values["messages"]) == settings.TOTAL_MESSAGES_AFTER_SUMMARY
+
+
+def test_short_threads_are_not_summarized(summary_chain):
+    async def scenario():
+        graph = make_graph()
+        state = await add_messages(graph, 3)
+        conversation_summary.schedule_conversation_summary(graph, THREAD_ID, state)
+        await conversation_summary.wait_for_pending_summary(THREAD_ID)
+
+    asyncio.run(scenario())
+
+    assert summary_chain.calls == 0
+
+
+def test_one_summary_per_thread_and_the_next_turn_waits_for_it(summary_chain):
+    async def scenario():
+        graph = make_graph()
+        state = await add_messages(graph, settings.TOTAL_MESSAGES_SUMMARY_TRIGGER + 1)
+        conversation_summary.schedule_conversation_summary(graph, THREAD_ID, state)
+        conversation_summary.schedule_conversation_summary(graph, THREAD_ID, state)
+
+        next_turn = asyncio.create_task(
+            conversation_summary.wait_for_pending_summary(THREAD_ID)
+        )
+        await asyncio.sleep(0.01)
+        assert not next_turn.done()
+
+        summary_chain.release.set()
+        await next_turn
+        return (await graph.aget_state(CONFIG)).values
+
+    values = asyncio.run(scenario())
+
+    assert summary_chain.calls == 1
+    assert values["summary"]
+
+
+def test_messages_added_during_a_summary_are_kept(summary_chain):
+    async def scenario():
+        graph = make_graph()
+        count = settings.TOTAL_MESSAGES_SUMMARY_TRIGGER + 1
+        state = await add_messages(graph, count)
+        conversation_summary.schedule_conversation_summary(graph, THREAD_ID, state)
+        await asyncio.sleep(0)
+
+        await add_messages(graph, 2, start=count)
+        summary_chain.release.set()
+        await conversation_summary.wait_for_pending_summary(THREAD_ID)
+        return (await graph.aget_state(CONFIG)).values
+
+    values = asyncio.run(scenario())
+
+    assert len(values["messages"]) == settings.TOTAL_MESSAGES_AFTER_SUMMARY + 2
+    assert values["messages"][-1].content.endswith(
+        str(settings.TOTAL_MESSAGES_SUMMARY_TRIGGER + 2)
+    )
@@ -0,0 +1,57 @@
+from langchain_core.documents import Document
+
+from philoagents.application.data import DuplicateIndex, deduplicate_documents
+from philoagents.application.data.deduplicate_documents import find_duplicates
+
+CANNAE = (
+    "At Cannae in 216 BC Hannibal encircled and destroyed a much larger Roman "
+    "army under the consuls Varro and Paullus, one of the worst defeats in "
+    "the history of the Republic"
+)
+ZAMA = (
+    "At Zama in 202 BC Scipio defeated Hannibal, ending the Second Punic War "
+    "and forcing Carthage to surrender its fleet and pay a heavy indemnity"
+)
+
+
+def chunk(text, id_=None):
+    return Document(page_content=text, id=id_)
+
+
+def test_duplicates_are_paired_once_and_the_longer_is_kept():
+    documents = [chunk(CANNAE), chunk(ZAMA), chunk(CANNAE + " ever")]
+
+    assert [(i, j) for i, j, _ in find_duplicates(documents)] == [(0, 2)]
+    assert deduplicate_documents(documents) == [documents[1], documents[2]]
+
+
+def test_index_removes_duplicates_across_batches_but_keeps_indexed_chunks():
+    index = DuplicateIndex()
+
+    hannibal = [chunk(CANNAE, "hannibal-cannae"), chunk(ZAMA, "hannibal-zama")]
+    assert deduplicate_documents(hannibal, index=index) == hannibal
+
+    # Another character's biography retells Cannae.
+    scipio = [chunk(CANNAE + " ever", "scipio-cannae")]
+    assert deduplicate_documents(scipio, index=index) == []
+
+    # Ingesting the first character again keeps its chunks.
+    assert deduplicate_documents(hannibal, index=index) == hannibal
+    assert len(index) == 2
+
+
+def test_saved_index_forgets_chunks_deleted_from_the_store(tmp_path):
+    index = DuplicateIndex()
+    deduplicate_documents(
+        [chunk(CANNAE, "hannibal-cannae"), chunk(ZAMA, "hannibal-zama")], index=index
+    )
+    index.save(tmp_path / "dedup.npz")
+
+    loaded = DuplicateIndex.load(tmp_path / "dedup.npz")
+    loaded.retain({"hannibal-zama"})
+
+    assert "hannibal-cannae" not in loaded
+    retold = [chunk(CANNAE + " ever", "scipio-cannae")]
+    assert deduplicate_documents(retold, index=loaded) == retold
+    # Built for another threshold, the saved index is not used.
+    assert len(DuplicateIndex.load(tmp_path / "dedup.npz", threshold=0.9)) == 0
@@ -4,6 +4,11 @@ from typing import Optional
 import pytest
 
 from philoagents.application.game_loop_service import service as service_module
+from philoagents.application.game_loop_service.events import (
+    RoundEvent,
+    RoundEventBroadcaster,
+    RoundEventType,
+)
 from philoagents.application.game_loop_service.service import GameLoopService
 from philoagents.domain import Action, Character
 from philoagents.domain.action import ActionType
@@ -11,6 +16,17 @@ from philoagents.domain.game_state import GameState
 from philoagents.domain.resources import PrivateIntel, VictoryPointAward
 
 
+@pytest.fixture(autouse=True)
+def no_speculative_actions(monkeypatch):
+    """Keeps AI actions from being precomputed (with real LLM calls) unless a
+    test opts in via `enable_speculation`."""
+    monkeypatch.setattr(service_module.settings, "SPECULATIVE_AI_ACTIONS", False)
+
+
+def enable_speculation(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "SPECULATIVE_AI_ACTIONS", True)
+
+
 class FakeStateRepository:
     """In-memory stand-in for GameStateRepository."""
 
@@ -19,14 +35,14 @@ class FakeStateRepository:
         self.save_calls = 0
         self.clear_calls = 0
 
-    def save(self, state: GameState) -> None:
+    async def save(self, state: GameState) -> None:
         self.saved = state.model_copy(deep=True)
         self.save_calls += 1
 
-    def load(self) -> Optional[GameState]:
+    async def load(self) -> Optional[GameState]:
         return self.saved
 
-    def clear(self) -> None:
+    async def clear(self) -> None:
         self.saved = None
         self.clear_calls += 1
 
@@ -331,13 +347,141 @@ def test_failed_round_does_not_charge_costs():
     assert service.game_state.characters["hannibal"].resources["Gold"] == 10
 
 
+# --- state snapshots ---
+
+
+def test_current_state_is_shared_not_copied():
+    service = make_service()
+    assert service.get_current_state() is service.get_current_state()
+
+
+def test_round_publishes_a_new_snapshot_and_leaves_the_old_one_intact():
+    service = make_service()
+    stub_round(
+        service,
+        judge_result=(
+            "A new crisis unfolds.",
+            service.game_state.characters,
+            [PrivateIntel(recipient_id="hannibal", report="Scipio is bluffing.")],
+            [VictoryPointAward(character_id="scipio", points_awarded=3, reason="x")],
+        ),
+    )
+    before = service.get_current_state()
+    version_before = service.game_state.version
+
+    service.submit_player_action(make_action("hannibal", {"Gold": 4}))
+    after = asyncio.run(service.advance_round())
+
+    assert after is not before
+    assert service.game_state.version == version_before + 1
+    assert before.round_number == 1
+    assert before.characters["hannibal"].known_intel == []
+    assert before.characters["hannibal"].resources["Gold"] == 10
+    assert before.characters["scipio"].victory_points == 0
+    assert after.characters["hannibal"].known_intel == ["Scipio is bluffing."]
+    assert after.characters["scipio"].victory_points == 3
+
+
+def test_failed_round_keeps_the_same_snapshot():
+    service = make_service()
+    stub_round(service, judge_error=RuntimeError("judge LLM unavailable"))
+    before = service.get_current_state()
+    version_before = service.game_state.version
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(service.advance_round())
+
+    assert service.get_current_state() is before
+    assert service.game_state.version == version_before
+
+
+def test_state_version_increases_on_start_commit_and_reset():
+    service = make_service(FakeStateRepository())
+    stub_echo_judge(service)
+    versions = [service.game_state.version]
+
+    asyncio.run(service.start_game("hannibal"))
+    versions.append(service.game_state.version)
+    asyncio.run(service.advance_round())
+    versions.append(service.game_state.version)
+    asyncio.run(service.reset())
+    versions.append(service.game_state.version)
+
+    # Strictly increasing, even across the reset to the initial state.
+    assert versions == sorted(set(versions))
+
+
+def test_version_keeps_increasing_when_a_reset_game_is_resumed():
+    repository = FakeStateRepository()
+    service = make_service(repository)
+    stub_echo_judge(service)
+    asyncio.run(service.start_game("hannibal"))
+    asyncio.run(service.advance_round())
+    asyncio.run(service.reset())
+
+    resumed = make_service(repository)
+    assert asyncio.run(resumed.try_resume()) is True
+
+    assert resumed.game_state.round_number == 1
+    assert resumed.game_state.version == service.game_state.version
+    # Status ETags name the instance, so the first one's never match.
+    assert resumed.instance_id != service.instance_id
+
+
+def test_wait_for_state_change_returns_at_once_for_a_stale_version():
+    service = make_service()
+    asyncio.run(service.start_game("hannibal"))
+
+    asyncio.run(asyncio.wait_for(service.wait_for_state_change(0, timeout=30), 1))
+
+
+def test_wait_for_state_change_wakes_on_round_commit():
+    async def scenario():
+        service = make_service()
+        stub_echo_judge(service)
+        version = service.game_state.version
+
+        waiter = asyncio.create_task(service.wait_for_state_change(version, 30))
+        await asyncio.sleep(0)
+        assert service.has_state_waiters
+        await service.advance_round()
+        await asyncio.wait_for(waiter, 1)
+        return service
+
+    service = asyncio.run(scenario())
+    assert not service.has_state_waiters
+
+
+def test_wait_for_state_change_wakes_on_failed_round():
+    async def scenario():
+        service = make_service()
+        stub_round(service, judge_error=RuntimeError("judge LLM unavailable"))
+        waiter = asyncio.create_task(
+            service.wait_for_state_change(service.game_state.version, 30)
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            await service.advance_round()
+        await asyncio.wait_for(waiter, 1)
+
+    asyncio.run(scenario())
+
+
+def test_wait_for_state_change_times_out_without_changes():
+    service = make_service()
+    asyncio.run(service.wait_for_state_change(service.game_state.version, 0.01))
+    assert not service.has_state_waiters
+
+
 # --- victory point clamping ---
 
 
 def test_vp_awards_are_clamped_to_the_per_round_cap():
     service = make_service()
     cap = service_module.settings.MAX_VP_AWARD_PER_ROUND
+    characters = dict(service.game_state.characters)
     service._apply_victory_points(
+        characters,
         [
             VictoryPointAward(
                 character_id="hannibal", points_awarded=999, reason="Judge went wild"
@@ -348,45 +492,41 @@ def test_vp_awards_are_clamped_to_the_per_round_cap():
             VictoryPointAward(
                 character_id="caesar", points_awarded=5, reason="Unknown character"
             ),
-        ]
+        ],
     )
 
-    assert service.game_state.characters["hannibal"].victory_points == cap
-    assert service.game_state.characters["scipio"].victory_points == 0
+    assert characters["hannibal"].victory_points == cap
+    assert characters["scipio"].victory_points == 0
 
 
 # --- AI delegate timeout and fallback ---
 
 
-class FakeGraphBuilder:
-    def __init__(self, graph):
-        self._graph = graph
-
-    def compile(self):
-        return self._graph
-
-
 class FailingGraph:
-    def get_graph(self, xray=True):
-        return None
-
     async def ainvoke(self, input, config):
         raise RuntimeError("model exploded")
 
 
 class HangingGraph:
-    def get_graph(self, xray=True):
-        return None
-
     async def ainvoke(self, input, config):
         await asyncio.sleep(30)
 
 
+class RecordingGraph:
+    """Returns a fixed action for whichever character it is invoked for."""
+
+    def __init__(self):
+        self.invocations = 0
+
+    async def ainvoke(self, input, config):
+        self.invocations += 1
+        return {"action": make_action(input["character"].id)}
+
+
 def _patch_graph(monkeypatch, graph):
-    monkeypatch.setattr(
-        service_module, "create_action_graph", lambda: FakeGraphBuilder(graph)
-    )
-    monkeypatch.setattr(service_module, "OpikTracer", lambda graph=None: object())
+    monkeypatch.setattr(service_module, "get_compiled_action_graph", lambda: graph)
+    monkeypatch.setattr(service_module, "get_action_graph_description", lambda: None)
+    monkeypatch.setattr(service_module, "OpikTracer", lambda **kwargs: object())
 
 
 def test_ai_delegate_error_falls_back_to_safe_action(monkeypatch):
@@ -411,6 +551,114 @@ def test_ai_delegate_timeout_falls_back_to_safe_action(monkeypatch):
     assert all("holds position" in a.action_details for a in actions)
 
 
+def test_ai_delegates_share_one_compiled_graph(monkeypatch):
+    service = make_service()
+    graph = RecordingGraph()
+    _patch_graph(monkeypatch, graph)
+
+    actions = asyncio.run(service._run_ai_delegate_turns())
+
+    assert graph.invocations == 2
+    assert all(a.action_type == ActionType.MILITARY for a in actions)
+
+
+def test_compiled_graphs_are_built_once_per_process():
+    from philoagents.application.game_loop_service.workflow import graph
+
+    assert graph.get_compiled_action_graph() is graph.get_compiled_action_graph()
+    assert graph.get_compiled_judge_graph() is graph.get_compiled_judge_graph()
+    assert graph.get_action_graph_description() is graph.get_action_graph_description()
+
+
+def test_ai_delegate_finished_events_report_fallbacks(monkeypatch):
+    service = make_service()
+    _patch_graph(monkeypatch, FailingGraph())
+
+    with service.events.subscribe() as queue:
+        asyncio.run(service._run_ai_delegate_turns())
+        events = [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert [e.type for e in events] == [RoundEventType.DELEGATE_FINISHED] * 2
+    assert {e.character_id for e in events} == {"hannibal", "scipio"}
+    assert all(e.used_fallback for e in events)
+
+
+# --- round events ---
+
+
+def _drain(queue) -> list:
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_advance_round_publishes_phase_events_in_order():
+    service = make_service()
+    stub_echo_judge(service)
+
+    with service.events.subscribe() as queue:
+        asyncio.run(service.advance_round())
+        events = _drain(queue)
+
+    assert [e.type for e in events] == [
+        RoundEventType.DELEGATES_STARTED,
+        RoundEventType.JUDGE_STARTED,
+        RoundEventType.ROUND_COMMITTED,
+    ]
+    assert events[-1].round_number == 2
+    assert events[-1].is_game_over is False
+
+
+def test_failed_round_publishes_round_failed():
+    service = make_service()
+    stub_round(service, judge_error=RuntimeError("judge LLM unavailable"))
+
+    with service.events.subscribe() as queue:
+        with pytest.raises(RuntimeError):
+            asyncio.run(service.advance_round())
+        events = _drain(queue)
+
+    assert events[-1].type == RoundEventType.ROUND_FAILED
+    assert events[-1].round_number == 1
+
+
+def test_slow_subscriber_is_closed_without_blocking_the_round():
+    service = make_service()
+    service.events.max_queued_events = 1
+    stub_echo_judge(service)
+
+    with service.events.subscribe() as queue:
+        asyncio.run(service.advance_round())
+        assert _drain(queue) == [None]
+        assert not service.events.has_subscribers
+
+    assert service.game_state.round_number == 2
+
+
+def test_full_queue_closes_the_stream_instead_of_dropping_the_commit():
+    events = RoundEventBroadcaster(max_queued_events=2)
+
+    with events.subscribe() as slow, events.subscribe() as fast:
+        for character_id in ("hannibal", "scipio"):
+            events.publish(
+                RoundEvent(
+                    type=RoundEventType.DELEGATE_FINISHED,
+                    round_number=1,
+                    character_id=character_id,
+                )
+            )
+        fast.get_nowait()
+        fast.get_nowait()
+        events.publish(RoundEvent(type=RoundEventType.ROUND_COMMITTED, round_number=2))
+
+        # The commit is never silently lost: the lagging stream is closed,
+        # and its client polls for the new round.
+        assert _drain(slow) == [None]
+        assert [event.type for event in _drain(fast)] == [
+            RoundEventType.ROUND_COMMITTED
+        ]
+        events.publish(RoundEvent(type=RoundEventType.STATUS, round_number=2))
+        assert slow.empty()
+
+
 # --- persistence: resume and reset ---
 
 
@@ -418,7 +666,7 @@ def test_try_resume_restores_saved_state():
     saved = make_state(round_number=3)
     service = make_service(FakeStateRepository(saved=saved))
 
-    assert service.try_resume() is True
+    assert asyncio.run(service.try_resume()) is True
     assert service.game_state.round_number == 3
     assert service.is_game_over is False
 
@@ -427,23 +675,22 @@ def test_try_resume_marks_finished_game_as_over():
     saved = make_state(round_number=5)  # past max_rounds=4
     service = make_service(FakeStateRepository(saved=saved))
 
-    assert service.try_resume() is True
+    assert asyncio.run(service.try_resume()) is True
     assert service.is_game_over is True
 
 
 def test_try_resume_without_saved_game():
-    assert make_service(FakeStateRepository()).try_resume() is False
+    assert asyncio.run(make_service(FakeStateRepository()).try_resume()) is False
 
 
 def test_try_resume_without_repository():
-    assert make_service().try_resume() is False
+    assert asyncio.run(make_service().try_resume()) is False
 
 
 def test_reset_restores_initial_state_and_clears_persistence():
     repository = FakeStateRepository()
     service = make_service(repository)
-    service.game_state.round_number = 3
-    service.game_state.crisis_update = "Late-game crisis"
+    service._update_state(round_number=3, crisis_update="Late-game crisis")
     service.submitted_actions["hannibal"] = make_action("hannibal")
     service.is_game_over = True
 
@@ -580,3 +827,92 @@ def test_reset_clears_player_binding():
     asyncio.run(service.start_game("hannibal"))
     asyncio.run(service.reset())
     assert service.game_state.player_character_id is None
+
+
+# --- speculative AI actions ---
+
+
+def test_start_game_precomputes_ai_actions_for_the_round(monkeypatch):
+    enable_speculation(monkeypatch)
+
+    async def scenario():
+        service = make_service()
+        graph = RecordingGraph()
+        _patch_graph(monkeypatch, graph)
+        stub_echo_judge(service)
+        del service._run_ai_delegate_turns  # use the real delegate turns
+
+        await service.start_game("hannibal")
+        await asyncio.gather(*service._speculative_actions.values())
+        assert graph.invocations == 1  # only scipio; hannibal is the human
+
+        service.submit_player_action(make_action("hannibal"))
+        new_state = await service.advance_round()
+        return graph, new_state
+
+    graph, new_state = asyncio.run(scenario())
+
+    # The round reused the precomputed action instead of asking again.
+    assert new_state.round_number == 2
+    assert {a.character_id for a in new_state.last_round_actions} == {
+        "hannibal",
+        "scipio",
+    }
+    # Committing the round started precomputing the next one.
+    assert graph.invocations == 2
+
+
+def test_failed_speculative_action_falls_back_to_safe_action(monkeypatch):
+    enable_speculation(monkeypatch)
+
+    async def scenario():
+        service = make_service()
+        _patch_graph(monkeypatch, FailingGraph())
+        await service.start_game("hannibal")
+        service.submit_player_action(make_action("hannibal"))
+        return await service._run_ai_delegate_turns()
+
+    actions = asyncio.run(scenario())
+
+    assert [a.character_id for a in actions] == ["scipio"]
+    assert "holds position" in actions[0].action_details
+
+
+def test_speculation_waits_for_a_bound_player(monkeypatch):
+    enable_speculation(monkeypatch)
+
+    async def scenario():
+        service = make_service()
+        _patch_graph(monkeypatch, RecordingGraph())
+        service.speculate_ai_actions()
+        return service._speculative_actions
+
+    assert asyncio.run(scenario()) == {}
+
+
+def test_speculation_can_be_disabled(monkeypatch):
+    async def scenario():
+        service = make_service()
+        _patch_graph(monkeypatch, RecordingGraph())
+        await service.start_game("hannibal")
+        return service._speculative_actions
+
+    assert asyncio.run(scenario()) == {}
+
+
+def test_reset_cancels_speculative_actions(monkeypatch):
+    enable_speculation(monkeypatch)
+
+    async def scenario():
+        service = make_service()
+        _patch_graph(monkeypatch, HangingGraph())
+        await service.start_game("hannibal")
+        tasks = list(service._speculative_actions.values())
+        await service.reset()
+        await asyncio.sleep(0)
+        return service, tasks
+
+    service, tasks = asyncio.run(scenario())
+
+    assert all(task.cancelled() for task in tasks)
+    assert service._speculative_actions == {}
@@ -0,0 +1,287 @@
+import asyncio
+
+from loguru import logger
+from test_game_loop_service import make_action, make_state
+
+from philoagents.domain.game_state import GameState
+from philoagents.domain.game_state_delta import GameStateDelta
+from philoagents.infrastructure.mongo import GameStateRepository
+
+
+def _matches(document, query):
+    for name, condition in query.items():
+        if isinstance(condition, dict):
+            if "$gt" in condition and not document.get(name, -1) > condition["$gt"]:
+                return False
+            if "$exists" in condition and (name in document) != condition["$exists"]:
+                return False
+        elif document.get(name) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, key, direction):
+        self.documents.sort(key=lambda document: document[key] * direction)
+        return self
+
+    async def to_list(self):
+        return self.documents
+
+
+class FakeCollection:
+    """In-memory stand-in for an async pymongo collection."""
+
+    def __init__(self):
+        self.documents = []
+
+    async def create_index(self, keys, unique=False):
+        pass
+
+    async def insert_one(self, document):
+        await asyncio.sleep(0)
+        self.documents.append(dict(document))
+
+    async def find_one(self, query, projection=None, sort=None):
+        documents = self.find(query)
+        if sort:
+            documents.sort(*sort[0])
+        return documents.documents[0] if documents.documents else None
+
+    def find(self, query):
+        return FakeCursor([doc for doc in self.documents if _matches(doc, query)])
+
+    async def delete_one(self, query):
+        await self.delete_many(query)
+
+    async def delete_many(self, query):
+        self.documents = [doc for doc in self.documents if not _matches(doc, query)]
+
+
+class FakeClient:
+    def __init__(self):
+        self.collections = {"game_state": FakeCollection(), "journal": FakeCollection()}
+        self.closed = False
+
+    def __getitem__(self, name):
+        return self.collections
+
+    async def close(self):
+        self.closed = True
+
+
+def make_repository(game_id="game-a", write_delay_seconds=0.01, client=None):
+    return GameStateRepository(
+        collection_name="game_state",
+        journal_collection_name="journal",
+        game_id=game_id,
+        client=client or FakeClient(),
+        write_delay_seconds=write_delay_seconds,
+        snapshot_interval=3,
+    )
+
+
+def journal(repository):
+    return repository.client.collections["journal"].documents
+
+
+def play_round(state: GameState) -> GameState:
+    hannibal = state.characters["hannibal"]
+    return state.model_copy(
+        update={
+            "round_number": state.round_number + 1,
+            "version": state.version + 1,
+            "crisis_update": f"Crisis of round {state.round_number + 1}",
+            "last_round_actions": [make_action("hannibal")],
+            "characters": {
+                **state.characters,
+                "hannibal": hannibal.model_copy(
+                    update={
+                        "resources": {"Gold": hannibal.resources["Gold"] - 1},
+                        "known_intel": [
+                            *hannibal.known_intel,
+                            f"Report {state.round_number}",
+                        ],
+                        "victory_points": hannibal.victory_points + 2,
+                    }
+                ),
+            },
+        }
+    )
+
+
+def test_delta_between_rounds_replays_to_the_same_state():
+    before = make_state()
+    after = play_round(play_round(before))
+
+    delta = GameStateDelta.between(before, after)
+
+    assert set(delta.characters) == {"hannibal"}
+    assert delta.characters["hannibal"].new_intel == ["Report 1", "Report 2"]
+    assert delta.characters["hannibal"].character is None
+    assert GameStateDelta.model_validate_json(delta.model_dump_json()).apply(
+        before
+    ) == (after)
+
+
+def test_saves_in_quick_succession_coalesce_into_one_write():
+    async def scenario():
+        repository = make_repository()
+        for round_number in (1, 2, 3):
+            await repository.save(make_state(round_number=round_number))
+        assert journal(repository) == []  # not written yet
+
+        await repository.flush()
+        return repository, await repository.load()
+
+    repository, loaded = asyncio.run(scenario())
+
+    assert len(journal(repository)) == 1
+    assert loaded.round_number == 3
+
+
+def test_rounds_are_journaled_as_deltas_between_snapshots():
+    async def scenario():
+        repository = make_repository(write_delay_seconds=0)
+        state = make_state()
+        for _ in range(5):
+            await repository.save(state)
+            await repository.flush()
+            state = play_round(state)
+        return repository, state
+
+    repository, _ = asyncio.run(scenario())
+
+    entries = journal(repository)
+    assert [entry["seq"] for entry in entries] == [0, 1, 2, 3, 4]
+    assert ["snapshot" in entry for entry in entries] == [
+        True,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert all("delta" in entry for entry in entries[1:])
+    assert "known_intel" not in str(entries[4]["delta"])
+
+
+def test_failed_write_is_logged_and_the_next_save_is_a_snapshot(monkeypatch):
+    between = GameStateDelta.between
+
+    def failing_between(before, after):
+        monkeypatch.setattr(GameStateDelta, "between", between)
+        raise ValueError("cannot diff")
+
+    async def scenario():
+        repository = make_repository(write_delay_seconds=0)
+        state = make_state()
+        await repository.save(state)
+        await repository.flush()
+        monkeypatch.setattr(GameStateDelta, "between", failing_between)
+        for _ in range(2):
+            state = play_round(state)
+            await repository.save(state)
+            await repository.flush()
+        return repository, state, await repository.load()
+
+    errors = []
+    handler = logger.add(errors.append, level="ERROR")
+    try:
+        repository, state, loaded = asyncio.run(scenario())
+    finally:
+        logger.remove(handler)
+
+    assert len(errors) == 1 and "cannot diff" in errors[0]
+    assert ["snapshot" in entry for entry in journal(repository)] == [True, True]
+    assert loaded == state
+
+
+def test_loading_replays_the_deltas_after_the_latest_snapshot():
+    async def scenario():
+        client = FakeClient()
+        repository = make_repository(write_delay_seconds=0, client=client)
+        states = [make_state()]
+        for _ in range(4):
+            states.append(play_round(states[-1]))
+        for state in states:
+            await repository.save(state)
+            await repository.flush()
+
+        # A new process: nothing is known about the journal yet.
+        restarted = make_repository(write_delay_seconds=0, client=client)
+        loaded = await restarted.load()
+        await restarted.save(play_round(loaded))
+        await restarted.flush()
+        return states, loaded, await restarted.history(), journal(restarted)
+
+    states, loaded, history, entries = asyncio.run(scenario())
+
+    assert loaded == states[-1]
+    assert history[:-1] == states
+    assert entries[-1]["seq"] == 5 and "snapshot" not in entries[-1]
+
+
+def test_games_saved_before_the_journal_still_resume():
+    async def scenario():
+        client = FakeClient()
+        legacy = make_state(round_number=3).model_dump(mode="json")
+        client.collections["game_state"].documents.append(
+            {"_id": "game-a", "state": legacy}
+        )
+        repository = make_repository(write_delay_seconds=0, client=client)
+        loaded = await repository.load()
+        await repository.save(play_round(loaded))
+        await repository.flush()
+        return loaded, journal(repository)
+
+    loaded, entries = asyncio.run(scenario())
+
+    assert loaded.round_number == 3
+    assert "snapshot" in entries[0]
+
+
+def test_loading_waits_for_the_pending_write():
+    async def scenario():
+        repository = make_repository(write_delay_seconds=0.05)
+        await repository.save(make_state(round_number=2))
+        # A session reopened right after eviction resumes through a fresh
+        # repository for the same game.
+        return await repository.for_game("game-a").load()
+
+    assert asyncio.run(scenario()).round_number == 2
+
+
+def test_each_game_is_written_to_its_own_journal():
+    async def scenario():
+        repository = make_repository()
+        await asyncio.gather(
+            repository.for_game("game-a").save(make_state(round_number=2)),
+            repository.for_game("game-b").save(make_state(round_number=4)),
+        )
+        await repository.close()
+        return repository
+
+    repository = asyncio.run(scenario())
+
+    assert repository.client.closed
+    rounds = {entry["game_id"]: entry["round_number"] for entry in journal(repository)}
+    assert rounds == {"game-a": 2, "game-b": 4}
+
+
+def test_clearing_drops_the_pending_write_and_the_journal():
+    async def scenario():
+        repository = make_repository(write_delay_seconds=0)
+        await repository.save(make_state())
+        await repository.flush()
+        await repository.save(make_state(round_number=2))
+        await repository.clear()
+        await asyncio.sleep(0.02)
+        return repository, await repository.load()
+
+    repository, loaded = asyncio.run(scenario())
+
+    assert loaded is None
+    assert journal(repository) == []
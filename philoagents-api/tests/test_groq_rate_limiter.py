@@ -0,0 +1,159 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_groq import ChatGroq
+
+from philoagents.infrastructure import groq_rate_limiter
+from philoagents.infrastructure.groq_rate_limiter import (
+    ModelRateLimiter,
+    RateLimitedChatGroq,
+    TokenBucket,
+    estimate_request_tokens,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bucket_grants_its_capacity_without_waiting():
+    bucket = TokenBucket(600, clock=FakeClock())
+    assert bucket.reserve(400) == 0
+    assert bucket.reserve(200) == 0
+
+
+def test_bucket_queues_overdraws_in_arrival_order():
+    bucket = TokenBucket(600, clock=FakeClock())  # refills 10 per second
+    bucket.reserve(600)
+
+    assert bucket.reserve(100) == pytest.approx(10)
+    assert bucket.reserve(100) == pytest.approx(20)
+
+
+def test_bucket_refills_over_time_up_to_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(600, clock=clock)
+    bucket.reserve(600)
+
+    clock.now = 30
+    assert bucket.reserve(300) == 0
+    clock.now = 1000
+    assert bucket.reserve(600) == 0
+    assert bucket.reserve(1) > 0
+
+
+def test_request_larger_than_the_budget_is_capped():
+    bucket = TokenBucket(600, clock=FakeClock())
+    assert bucket.reserve(10_000) == 0
+    assert bucket.reserve(600) == pytest.approx(60)
+
+
+def test_limiter_waits_for_the_scarcer_budget():
+    limiter = ModelRateLimiter(
+        "model", requests_per_minute=2, tokens_per_minute=6_000, clock=FakeClock()
+    )
+    assert limiter.reserve(10) == 0
+    assert limiter.reserve(10) == 0
+    assert limiter.reserve(10) == pytest.approx(30)  # out of requests
+
+    limiter = ModelRateLimiter(
+        "model", requests_per_minute=100, tokens_per_minute=600, clock=FakeClock()
+    )
+    assert limiter.reserve(500) == 0
+    assert limiter.reserve(200) == pytest.approx(10)  # out of tokens
+
+
+def test_cancelled_wait_gives_its_reservation_back():
+    limiter = ModelRateLimiter(
+        "model", requests_per_minute=100, tokens_per_minute=600, clock=FakeClock()
+    )
+    limiter.reserve(600)
+
+    async def scenario():
+        queued = asyncio.create_task(limiter.acquire(300))
+        await asyncio.sleep(0)  # now waiting for its budget
+        queued.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await queued
+
+    asyncio.run(scenario())
+
+    # Queued behind the first reservation only, not the cancelled one.
+    assert limiter.reserve(100) == pytest.approx(10)
+
+
+def test_estimate_counts_prompt_schema_and_completion_budget():
+    messages = [HumanMessage(content="x" * 350)]
+
+    base = estimate_request_tokens(messages, max_tokens=1_000, call_kwargs={})
+    with_schema = estimate_request_tokens(
+        messages, max_tokens=1_000, call_kwargs={"response_format": {"a": "b" * 70}}
+    )
+
+    assert base == 100 + groq_rate_limiter.TOKENS_PER_MESSAGE + 1_000
+    assert with_schema > base
+    assert (
+        estimate_request_tokens(messages, max_tokens=None, call_kwargs={})
+        == base - 1_000 + groq_rate_limiter.settings.GROQ_DEFAULT_COMPLETION_TOKENS
+    )
+
+
+class RecordingLimiter:
+    def __init__(self):
+        self.acquired = []
+
+    async def acquire(self, tokens: int):
+        self.acquired.append(tokens)
+
+
+def test_chat_model_reserves_budget_before_each_request(monkeypatch):
+    limiter = RecordingLimiter()
+    requested = []
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        requested.append(len(limiter.acquired))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("ok"))])
+
+    monkeypatch.setattr(ChatGroq, "_agenerate", fake_agenerate)
+    monkeypatch.setattr(
+        groq_rate_limiter, "get_model_rate_limiter", lambda model_name: limiter
+    )
+    model = RateLimitedChatGroq(
+        api_key="test-key", model="openai/gpt-oss-20b", max_tokens=500
+    )
+
+    result = asyncio.run(model.ainvoke("hello"))
+
+    assert result.content == "ok"
+    assert requested == [1]  # the budget was reserved before the call
+    assert limiter.acquired[0] >= 500
+
+
+def test_rate_limiting_can_be_disabled(monkeypatch):
+    limiter = RecordingLimiter()
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("ok"))])
+
+    monkeypatch.setattr(ChatGroq, "_agenerate", fake_agenerate)
+    monkeypatch.setattr(
+        groq_rate_limiter, "get_model_rate_limiter", lambda model_name: limiter
+    )
+    monkeypatch.setattr(groq_rate_limiter.settings, "GROQ_RATE_LIMITS_ENABLED", False)
+    model = RateLimitedChatGroq(api_key="test-key", model="openai/gpt-oss-20b")
+
+    asyncio.run(model.ainvoke("hello"))
+
+    assert limiter.acquired == []
+
+
+def test_limiters_are_shared_per_model():
+    get = groq_rate_limiter.get_model_rate_limiter
+    assert get("openai/gpt-oss-20b") is get("openai/gpt-oss-20b")
+    assert get("openai/gpt-oss-20b") is not get("openai/gpt-oss-120b")
@@ -0,0 +1,192 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from philoagents.application import long_term_memory
+from philoagents.application.long_term_memory import LongTermMemoryCreator
+from philoagents.application.rag.ingestion import EmbeddingPipeline
+from philoagents.application.rag.local_index import LocalVectorStore
+
+
+class RecordingEmbeddings(Embeddings):
+    """Embeds each text as its length, recording the size of every call."""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    def embed_documents(self, texts):
+        if self.error is not None:
+            raise self.error
+        self.batches.append(len(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+def chunks(character, count):
+    return [
+        Document(page_content=f"{character} fact {n}", metadata={"id": character})
+        for n in range(count)
+    ]
+
+
+def test_chunks_are_embedded_in_batches_across_characters(tmp_path):
+    embeddings = RecordingEmbeddings()
+    store = LocalVectorStore(tmp_path, embeddings)
+
+    with EmbeddingPipeline(store, batch_size=4) as pipeline:
+        pipeline.add(chunks("hannibal", 3))
+        pipeline.add(chunks("scipio", 3))
+        pipeline.add(chunks("fabius", 1))
+    store.save()
+
+    assert embeddings.batches == [4, 3]
+    assert pipeline.stats.chunks == 7
+    assert pipeline.stats.batches == 2
+    assert pipeline.stats.chunks_per_second > 0
+    records = list(store.snapshot().records())
+    assert [record["chunk"] for record in records] == [
+        *[f"hannibal fact {n}" for n in range(3)],
+        *[f"scipio fact {n}" for n in range(3)],
+        "fabius fact 0",
+    ]
+    assert records[0]["id"] == "hannibal"
+
+
+def test_extraction_continues_while_a_batch_is_stored(tmp_path):
+    store = LocalVectorStore(tmp_path, RecordingEmbeddings())
+    writing = threading.Event()
+    release = threading.Event()
+    add_embeddings = store.add_embeddings
+
+    def slow_add_embeddings(*args, **kwargs):
+        writing.set()
+        assert release.wait(timeout=5)
+        return add_embeddings(*args, **kwargs)
+
+    store.add_embeddings = slow_add_embeddings
+
+    with EmbeddingPipeline(store, batch_size=2, queue_size=2) as pipeline:
+        pipeline.add(chunks("hannibal", 2))
+        assert writing.wait(timeout=5)
+        # The first batch is still being written.
+        pipeline.add(chunks("scipio", 2))
+        release.set()
+
+    assert pipeline.stats.chunks == 4
+
+
+def test_embedding_error_is_raised_to_the_caller(tmp_path):
+    store = LocalVectorStore(tmp_path, RecordingEmbeddings(RuntimeError("OOM")))
+
+    with pytest.raises(RuntimeError, match="OOM"):
+        with EmbeddingPipeline(store, batch_size=2, queue_size=1) as pipeline:
+            for _ in range(5):
+                pipeline.add(chunks("hannibal", 2))
+
+    assert pipeline.stats.chunks == 0
+
+
+class FakeExtractor:
+    def __init__(self):
+        self.docs = {}
+
+    def get_extraction_generator(self, rag_sources):
+        for source in rag_sources:
+            yield source["character_id"], self.docs[source["character_id"]]
+
+
+class WholeDocumentSplitter:
+    def split_documents(self, docs):
+        return [doc.model_copy() for doc in docs]
+
+
+def test_reingestion_embeds_only_new_chunks_and_deletes_stale_ones(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        long_term_memory.settings, "RAG_DEDUP_INDEX_PATH", tmp_path / "dedup.npz"
+    )
+    embeddings = RecordingEmbeddings()
+    store = LocalVectorStore(tmp_path / "index", embeddings)
+    extractor = FakeExtractor()
+    creator = LongTermMemoryCreator(
+        SimpleNamespace(vectorstore=store), WholeDocumentSplitter(), extractor
+    )
+    sources = [{"character_id": "hannibal"}, {"character_id": "scipio"}]
+    facts = {
+        "hannibal": [
+            "Hannibal crossed the Alps with elephants.",
+            "Hannibal won at Cannae in 216 BC.",
+        ],
+        "scipio": ["Scipio took New Carthage in Spain."],
+    }
+
+    def ingest():
+        extractor.docs = {
+            character_id: [
+                Document(page_content=text, metadata={"character_id": character_id})
+                for text in texts
+            ]
+            for character_id, texts in facts.items()
+        }
+        embeddings.batches = []
+        creator(sources)
+        return sorted(record["chunk"] for record in store.snapshot().records())
+
+    assert len(ingest()) == 3
+    generation = store.memory_generation()
+
+    # Nothing changed: nothing is embedded and the index is not rewritten.
+    assert len(ingest()) == 3
+    assert embeddings.batches == []
+    assert store.memory_generation() == generation
+
+    facts["scipio"] = ["Scipio defeated Hannibal at Zama in 202 BC."]
+    facts["hannibal"] = facts["hannibal"][:1]
+    assert ingest() == [
+        "Hannibal crossed the Alps with elephants.",
+        "Scipio defeated Hannibal at Zama in 202 BC.",
+    ]
+    assert embeddings.batches == [1]
+
+
+def test_chunk_dropped_as_duplicate_is_kept_when_its_original_goes_stale(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(
+        long_term_memory.settings, "RAG_DEDUP_INDEX_PATH", tmp_path / "dedup.npz"
+    )
+    store = LocalVectorStore(tmp_path / "index", RecordingEmbeddings())
+    extractor = FakeExtractor()
+    creator = LongTermMemoryCreator(
+        SimpleNamespace(vectorstore=store), WholeDocumentSplitter(), extractor
+    )
+    cannae = (
+        "At Cannae in 216 BC Hannibal encircled and destroyed a far larger "
+        "Roman army commanded by the consuls Varro and Paullus"
+    )
+    extractor.docs = {
+        "hannibal": [
+            Document(page_content=cannae, metadata={"character_id": "hannibal"})
+        ],
+        "fabius": [
+            Document(page_content=cannae + ".", metadata={"character_id": "fabius"})
+        ],
+    }
+
+    creator([{"character_id": "hannibal"}, {"character_id": "fabius"}])
+    assert [record["character_id"] for record in store.snapshot().records()] == [
+        "hannibal"
+    ]
+
+    # Hannibal's sources are removed: Fabius's copy is all that is left.
+    creator([{"character_id": "fabius"}])
+    assert [record["character_id"] for record in store.snapshot().records()] == [
+        "fabius"
+    ]
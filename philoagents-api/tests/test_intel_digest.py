@@ -0,0 +1,142 @@
+import asyncio
+
+from test_game_loop_service import (
+    make_action,
+    make_character,
+    make_service,
+    make_state,
+    stub_round,
+)
+
+from philoagents.application.game_loop_service import service as service_module
+from philoagents.application.game_loop_service.workflow.intel_digest import (
+    format_known_intel,
+    reports_to_fold,
+)
+from philoagents.domain.game_state_delta import GameStateDelta
+from philoagents.domain.resources import PrivateIntel
+
+
+def with_intel(character, count, digest=""):
+    return character.model_copy(
+        update={
+            "known_intel": [f"Report {n}" for n in range(count)],
+            "intel_digest": digest,
+        }
+    )
+
+
+class FakeDigestChain:
+    def __init__(self, error=None):
+        self.inputs = []
+        self.error = error
+
+    async def ainvoke(self, inputs):
+        self.inputs.append(inputs)
+        if self.error is not None:
+            raise self.error
+        return f" Digest of {inputs['reports'].count('Report')} reports. "
+
+
+def make_long_game(monkeypatch, chain):
+    monkeypatch.setattr(service_module.settings, "INTEL_RECENT_REPORTS", 2)
+    monkeypatch.setattr(service_module.settings, "INTEL_COMPACTION_BATCH", 3)
+    monkeypatch.setattr(service_module, "get_intel_digest_chain", lambda: chain)
+    state = make_state()
+    state = state.model_copy(
+        update={
+            "player_character_id": "hannibal",
+            "characters": {
+                character_id: with_intel(character, 6)
+                for character_id, character in state.characters.items()
+            },
+        }
+    )
+    service = make_service(state=state)
+    stub_round(
+        service,
+        judge_result=(
+            "A new crisis unfolds.",
+            dict(state.characters),
+            [PrivateIntel(recipient_id="scipio", report="Fresh report.")],
+            [],
+        ),
+    )
+    service.submit_player_action(make_action("hannibal"))
+    return service
+
+
+def test_prompt_intel_puts_the_digest_before_the_recent_reports():
+    character = with_intel(make_character("scipio"), 2, digest="Rome is arming.")
+
+    assert format_known_intel(make_character("scipio")) == "None."
+    assert format_known_intel(character) == (
+        "Summary of earlier reports:\nRome is arming.\n\n"
+        "Recent reports:\nReport 0\nReport 1"
+    )
+
+
+def test_reports_are_folded_in_batches_beyond_the_recent_ones():
+    assert reports_to_fold(with_intel(make_character("scipio"), 6), 4, 3) == []
+    assert reports_to_fold(with_intel(make_character("scipio"), 7), 4, 3) == [
+        "Report 0",
+        "Report 1",
+        "Report 2",
+    ]
+
+
+def test_round_folds_the_ai_characters_older_intel(monkeypatch):
+    chain = FakeDigestChain()
+    service = make_long_game(monkeypatch, chain)
+
+    asyncio.run(service.advance_round())
+
+    scipio = service.game_state.characters["scipio"]
+    assert scipio.intel_digest == "Digest of 4 reports."
+    # The two most recent reports stay verbatim, followed by this round's.
+    assert scipio.known_intel == ["Report 4", "Report 5", "Fresh report."]
+    assert chain.inputs[0]["intel_digest"] == "None yet."
+    # The human player's intel is shown in full in the HUD and never folded.
+    assert len(service.game_state.characters["hannibal"].known_intel) == 6
+
+
+def test_failed_digest_keeps_the_reports_verbatim(monkeypatch):
+    service = make_long_game(monkeypatch, FakeDigestChain(error=RuntimeError("429")))
+
+    new_state = asyncio.run(service.advance_round())
+
+    assert new_state.round_number == 2
+    scipio = service.game_state.characters["scipio"]
+    assert scipio.intel_digest == ""
+    assert len(scipio.known_intel) == 7
+
+
+def test_delta_records_folded_intel_without_the_whole_character():
+    before = make_state()
+    scipio = with_intel(before.characters["scipio"], 6)
+    before = before.model_copy(
+        update={"characters": {**before.characters, "scipio": scipio}}
+    )
+    after = before.model_copy(
+        update={
+            "characters": {
+                **before.characters,
+                "scipio": scipio.model_copy(
+                    update={
+                        "known_intel": ["Report 4", "Report 5", "Fresh report."],
+                        "intel_digest": "Digest of 4 reports.",
+                    }
+                ),
+            }
+        }
+    )
+
+    delta = GameStateDelta.between(before, after)
+
+    scipio_delta = delta.characters["scipio"]
+    assert scipio_delta.character is None
+    assert scipio_delta.folded_intel == 4
+    assert scipio_delta.new_intel == ["Fresh report."]
+    assert GameStateDelta.model_validate_json(delta.model_dump_json()).apply(
+        before
+    ) == (after)
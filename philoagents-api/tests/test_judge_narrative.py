@@ -0,0 +1,205 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_groq import ChatGroq
+from test_game_loop_service import make_action, make_service
+
+from philoagents.application.game_loop_service import service as service_module
+from philoagents.application.game_loop_service.events import (
+    RoundEvent,
+    RoundEventBroadcaster,
+    RoundEventType,
+)
+from philoagents.application.game_loop_service.workflow import (
+    chains,
+    judge_prompt,
+    nodes,
+)
+from philoagents.infrastructure import groq_rate_limiter
+from philoagents.infrastructure.llm_cache import LLMCacheMode, SQLiteLLMCache
+
+NARRATIVE = "Hannibal crosses the Alps while Rome debates in the Senate."
+JUDGE_OUTPUT = json.dumps(
+    {
+        "crisis_update": NARRATIVE,
+        "resource_changes": [
+            {
+                "character_id": "scipio",
+                "resource": "Gold",
+                "change": -4,
+                "reason": "War",
+            }
+        ],
+    }
+)
+
+
+class FakeJudgeChain:
+    """Streams each attempt's output a few characters at a time; an attempt
+    given as (text, error) breaks off with `error` after `text`."""
+
+    def __init__(self, *attempts):
+        self.attempts = list(attempts)
+
+    async def astream(self, inputs):
+        attempt = self.attempts.pop(0)
+        text, error = attempt if isinstance(attempt, tuple) else (attempt, None)
+        for start in range(0, len(text), 5):
+            yield AIMessageChunk(content=text[start : start + 5])
+        if error is not None:
+            raise error
+
+
+def use_judge(monkeypatch, *attempts, flush_ms=0):
+    chain = FakeJudgeChain(*attempts)
+    monkeypatch.setattr(nodes, "get_judge_resolution_chain", lambda: chain)
+    monkeypatch.setattr(nodes.settings, "JUDGE_NARRATIVE_FLUSH_MS", flush_ms)
+    monkeypatch.setattr(judge_prompt, "get_token_counter", judge_prompt.TokenCounter)
+    monkeypatch.setattr(
+        service_module, "OpikTracer", lambda **kwargs: BaseCallbackHandler()
+    )
+
+
+def resolve_round():
+    """Runs the real judge graph, returning its result and the events sent."""
+    service = make_service()
+    actions = [make_action("hannibal"), make_action("scipio")]
+
+    # Recorded as published: a subscriber that does not read in between
+    # would get them merged.
+    events = []
+    publish = service.events.publish
+
+    def record(event):
+        events.append(event)
+        publish(event)
+
+    service.events.publish = record
+    result = asyncio.run(
+        service._run_judge_turn(actions, service.game_state.characters)
+    )
+    return result, events
+
+
+def replay(events):
+    """Rebuilds the narrative the way a client does."""
+    narrative = ""
+    for event in events:
+        assert event.type == RoundEventType.JUDGE_NARRATIVE
+        narrative = narrative[: event.offset] + event.text
+    return narrative
+
+
+def test_crisis_update_is_streamed_before_the_round_commits(monkeypatch):
+    use_judge(monkeypatch, JUDGE_OUTPUT)
+
+    (crisis_update, characters, _, _), events = resolve_round()
+
+    assert len(events) > 1
+    assert NARRATIVE.startswith(events[0].text) and events[0].text != NARRATIVE
+    assert replay(events) == crisis_update == NARRATIVE
+    assert characters["scipio"].resources == {"Gold": 6}
+
+
+def test_narrative_events_are_coalesced(monkeypatch):
+    use_judge(monkeypatch, JUDGE_OUTPUT, flush_ms=60_000)
+
+    _, events = resolve_round()
+
+    # The first piece, then the rest once the output is complete.
+    assert len(events) == 2
+    assert replay(events) == NARRATIVE
+
+
+def test_truncated_output_is_retried_and_restarts_the_narrative(monkeypatch):
+    # Cut off at max_tokens: valid as a partial object, but not as JSON.
+    use_judge(monkeypatch, '{"crisis_update": "Carthage', JUDGE_OUTPUT)
+
+    (crisis_update, _, _, _), events = resolve_round()
+
+    restart = next(i for i, event in enumerate(events) if i and event.offset == 0)
+    assert replay(events[:restart]) == "Carthage"
+    assert replay(events) == crisis_update == NARRATIVE
+
+
+def test_judge_fails_after_its_last_attempt(monkeypatch):
+    error = RuntimeError("connection reset")
+    use_judge(monkeypatch, *[(JUDGE_OUTPUT[:30], error)] * nodes.JUDGE_ATTEMPTS)
+
+    with pytest.raises(RuntimeError, match="connection reset"):
+        resolve_round()
+
+
+def test_judge_rounds_are_recorded_and_replayed_offline(tmp_path, monkeypatch):
+    use_judge(monkeypatch)
+    monkeypatch.setattr(
+        nodes, "get_judge_resolution_chain", chains.get_judge_resolution_chain
+    )
+    monkeypatch.setattr(groq_rate_limiter.settings, "GROQ_RATE_LIMITS_ENABLED", False)
+    calls = []
+
+    # Groq, streamed or not: some langchain-groq versions stream structured
+    # output, others fall back to a single request.
+    async def groq_stream(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        for start in range(0, len(JUDGE_OUTPUT), 5):
+            yield ChatGenerationChunk(
+                message=AIMessageChunk(content=JUDGE_OUTPUT[start : start + 5])
+            )
+
+    async def groq_generate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(JUDGE_OUTPUT))])
+
+    def use_cache(mode):
+        cache = SQLiteLLMCache(tmp_path / "llm.sqlite3", mode=mode, max_entries=10)
+        monkeypatch.setattr(chains, "get_llm_cache", lambda: cache)
+
+    monkeypatch.setattr(ChatGroq, "_astream", groq_stream)
+    monkeypatch.setattr(ChatGroq, "_agenerate", groq_generate)
+    use_cache(LLMCacheMode.RECORD)
+    (recorded, _, _, _), _ = resolve_round()
+    assert len(calls) == 1
+
+    calls.clear()
+    use_cache(LLMCacheMode.REPLAY)
+    (replayed, characters, _, _), events = resolve_round()
+
+    assert calls == []
+    assert replayed == recorded == NARRATIVE
+    assert replay(events) == NARRATIVE
+    assert characters["scipio"].resources == {"Gold": 6}
+
+
+def test_narrative_pieces_waiting_for_a_slow_client_are_merged():
+    events = RoundEventBroadcaster(max_queued_events=4)
+
+    def narrative(offset, text):
+        events.publish(
+            RoundEvent(
+                type=RoundEventType.JUDGE_NARRATIVE,
+                round_number=1,
+                offset=offset,
+                text=text,
+            )
+        )
+
+    with events.subscribe() as queue:
+        narrative(0, "Rome")
+        narrative(4, " burns")
+        narrative(2, "me falls")
+        narrative(0, "Carthage")  # the judge started over
+        narrative(8, " waits")
+        events.publish(RoundEvent(type=RoundEventType.ROUND_COMMITTED, round_number=2))
+        narrative(0, "Next")
+        pending = [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert len(pending) == 3
+    assert (pending[0].offset, pending[0].text) == (0, "Carthage waits")
+    assert pending[1].type == RoundEventType.ROUND_COMMITTED
+    assert (pending[2].offset, pending[2].text) == (0, "Next")
+    assert events.has_subscribers is False
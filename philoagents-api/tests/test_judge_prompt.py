@@ -0,0 +1,95 @@
+import json
+
+from test_game_loop_service import make_action, make_character
+
+from philoagents.application.game_loop_service.workflow.judge_prompt import (
+    TokenCounter,
+    build_judge_prompt,
+)
+
+# Estimates 4 characters per token, so the tests don't download a tokenizer.
+COUNTER = TokenCounter()
+
+
+def make_characters(goals: str = "Take Rome."):
+    characters = {
+        "hannibal": make_character("hannibal", victory_points=5),
+        "scipio": make_character("scipio"),
+    }
+    return {
+        character_id: character.model_copy(update={"goals": goals})
+        for character_id, character in characters.items()
+    }
+
+
+def build(budget=10_000, crisis="Rome burns.", goals="Take Rome.", fixed_text=""):
+    return build_judge_prompt(
+        round_number=2,
+        crisis_update=crisis,
+        characters=make_characters(goals),
+        actions=[make_action("hannibal", {"Gold": 3}), make_action("scipio")],
+        fixed_text=fixed_text,
+        budget=budget,
+        counter=COUNTER,
+    )
+
+
+def test_state_is_compact_and_omits_dialogue_only_text():
+    prompt = build()
+
+    assert "\n" not in prompt.game_state and ", " not in prompt.game_state
+    state = json.loads(prompt.game_state)
+    assert state["round"] == 2
+    assert state["crisis"] == "Rome burns."
+    assert state["characters"]["hannibal"] == {
+        "res": {"Gold": 10},
+        "vp": 5,
+        "goals": "Take Rome.",
+    }
+    assert "Test perspective" not in prompt.game_state
+    assert prompt.truncated == []
+
+
+def test_actions_use_short_keys_and_omit_empty_costs():
+    actions = json.loads(build().actions)
+
+    assert actions[0] == {
+        "by": "hannibal",
+        "type": "MILITARY",
+        "cost": {"Gold": 3},
+        "details": "March on the enemy camp.",
+    }
+    assert "cost" not in actions[1]
+
+
+def test_goals_are_truncated_before_the_crisis_update():
+    long_goals = "Outmaneuver the Senate. " * 40
+    full = build(goals=long_goals)
+
+    prompt = build(budget=full.tokens - 100, goals=long_goals)
+
+    state = json.loads(prompt.game_state)
+    assert state["crisis"] == "Rome burns."
+    assert state["characters"]["hannibal"]["goals"].endswith("…")
+    assert prompt.truncated == ["goals:hannibal", "goals:scipio"]
+    assert prompt.tokens <= prompt.budget
+
+
+def test_optional_context_is_dropped_when_the_budget_is_exhausted():
+    prompt = build(budget=10, crisis="A long crisis. " * 50)
+
+    state = json.loads(prompt.game_state)
+    assert "crisis" not in state
+    assert "goals" not in state["characters"]["hannibal"]
+    # The actions and the economy are always sent.
+    assert len(json.loads(prompt.actions)) == 2
+    assert state["characters"]["scipio"]["res"] == {"Gold": 10}
+
+
+def test_fixed_text_counts_against_the_budget():
+    prompt = build(fixed_text="x" * 400)
+
+    assert prompt.fixed_tokens == 100
+    assert prompt.tokens == (
+        prompt.fixed_tokens + prompt.game_state_tokens + prompt.actions_tokens
+    )
@@ -91,3 +91,21 @@ def test_status_update_for_unknown_character_is_ignored():
     characters = {"hannibal": make_character("hannibal")}
     result = _apply_judge_output(characters, [], [statuses("caesar", {"X": "1"})])
     assert result["hannibal"].statuses == {"Morale": "High"}
+
+
+def test_input_characters_are_never_mutated():
+    # The input may be shared with the live game state snapshot.
+    characters = {
+        "hannibal": make_character("hannibal"),
+        "scipio": make_character("scipio"),
+    }
+    result = _apply_judge_output(
+        characters,
+        [change("hannibal", "Gold", -3), change("hannibal", "Ships", 2)],
+        [statuses("hannibal", {"Morale": "Low"})],
+    )
+    assert characters["hannibal"].resources == {"Gold": 10, "Spies": 3}
+    assert characters["hannibal"].statuses == {"Morale": "High"}
+    assert result["hannibal"].resources == {"Gold": 7, "Spies": 3, "Ships": 2}
+    # Unchanged characters are shared, not copied.
+    assert result["scipio"] is characters["scipio"]
@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+    Generation,
+)
+from langchain_groq import ChatGroq
+
+from philoagents.infrastructure import groq_rate_limiter
+from philoagents.infrastructure.groq_rate_limiter import RateLimitedChatGroq
+from philoagents.infrastructure.llm_cache import (
+    LLMCacheMiss,
+    LLMCacheMode,
+    SQLiteLLMCache,
+)
+
+
+def make_cache(tmp_path, mode=LLMCacheMode.RECORD, max_entries=100):
+    return SQLiteLLMCache(tmp_path / "llm.sqlite3", mode=mode, max_entries=max_entries)
+
+
+def test_record_mode_stores_and_returns_responses(tmp_path):
+    cache = make_cache(tmp_path)
+    assert cache.lookup("prompt", "model") is None
+
+    cache.update("prompt", "model", [Generation(text="answer")])
+
+    assert cache.lookup("prompt", "model") == [Generation(text="answer")]
+    assert cache.lookup("prompt", "other model") is None
+
+
+def test_recorded_responses_persist_on_disk(tmp_path):
+    make_cache(tmp_path).update("prompt", "model", [Generation(text="answer")])
+
+    replay = make_cache(tmp_path, mode=LLMCacheMode.REPLAY)
+
+    assert replay.lookup("prompt", "model") == [Generation(text="answer")]
+
+
+def test_replay_mode_fails_on_unrecorded_requests(tmp_path):
+    cache = make_cache(tmp_path, mode=LLMCacheMode.REPLAY)
+
+    with pytest.raises(LLMCacheMiss, match="No recorded LLM response"):
+        cache.lookup("prompt", "model")
+    cache.update("prompt", "model", [Generation(text="answer")])
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.update("a", "model", [Generation(text="a")])
+    cache.update("b", "model", [Generation(text="b")])
+    cache.lookup("a", "model")  # "b" is now the least recently used
+
+    cache.update("c", "model", [Generation(text="c")])
+
+    assert len(cache) == 2
+    assert cache.lookup("b", "model") is None
+    assert cache.lookup("a", "model") is not None
+
+
+def _counting_model(monkeypatch, cache, temperature=0.3):
+    calls = []
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage("ruling"))])
+
+    monkeypatch.setattr(ChatGroq, "_agenerate", fake_agenerate)
+    monkeypatch.setattr(groq_rate_limiter.settings, "GROQ_RATE_LIMITS_ENABLED", False)
+    model = RateLimitedChatGroq(
+        api_key="test-key",
+        model="openai/gpt-oss-20b",
+        temperature=temperature,
+        cache=cache,
+    )
+    return model, calls
+
+
+def test_chat_model_replays_recorded_rounds_offline(tmp_path, monkeypatch):
+    model, calls = _counting_model(monkeypatch, make_cache(tmp_path))
+    first = asyncio.run(model.ainvoke("Resolve the round."))
+    second = asyncio.run(model.ainvoke("Resolve the round."))
+    assert len(calls) == 1
+    assert first.content == second.content == "ruling"
+
+    replay = make_cache(tmp_path, mode=LLMCacheMode.REPLAY)
+    model, calls = _counting_model(monkeypatch, replay)
+    assert asyncio.run(model.ainvoke("Resolve the round.")).content == "ruling"
+    assert calls == []
+
+    # A different temperature is a different request.
+    model, calls = _counting_model(monkeypatch, replay, temperature=0.9)
+    with pytest.raises(LLMCacheMiss):
+        asyncio.run(model.ainvoke("Resolve the round."))
+    assert calls == []
+
+
+def test_streamed_calls_are_recorded_and_replayed_offline(tmp_path, monkeypatch):
+    calls = []
+
+    async def fake_astream(self, messages, stop=None, run_manager=None, **kwargs):
+        calls.append(messages)
+        for word in ("The ", "Senate ", "yields."):
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+    monkeypatch.setattr(ChatGroq, "_astream", fake_astream)
+    monkeypatch.setattr(groq_rate_limiter.settings, "GROQ_RATE_LIMITS_ENABLED", False)
+
+    def stream(cache, prompt="Resolve the round."):
+        model = RateLimitedChatGroq(
+            api_key="test-key", model="openai/gpt-oss-20b", cache=cache
+        )
+
+        async def collect():
+            return "".join([chunk.content async for chunk in model.astream(prompt)])
+
+        return asyncio.run(collect())
+
+    assert stream(make_cache(tmp_path)) == "The Senate yields."
+    assert len(calls) == 1
+
+    replay = make_cache(tmp_path, mode=LLMCacheMode.REPLAY)
+    assert stream(replay) == "The Senate yields."
+    assert len(calls) == 1
+    with pytest.raises(LLMCacheMiss):
+        stream(replay, "Resolve another round.")
+    assert len(calls) == 1
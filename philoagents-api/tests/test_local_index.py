@@ -0,0 +1,145 @@
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from philoagents.application.rag.local_index import (
+    LocalHybridSearchRetriever,
+    LocalVectorStore,
+)
+
+VOCABULARY = ["hannibal", "rome", "carthage", "elephants", "senate", "alps"]
+CHUNKS = [
+    "Hannibal led elephants across the Alps.",
+    "The Senate of Rome debated the war.",
+    "Carthage sent gold to Hannibal.",
+    "Elephants frightened the Roman cavalry.",
+]
+
+
+class BagOfWordsEmbeddings(Embeddings):
+    """Embeds a text as its normalized counts of a few known words."""
+
+    def __init__(self):
+        self.queries = 0
+
+    def _embed(self, text):
+        words = text.lower().replace(".", "").split()
+        vector = np.array([words.count(word) for word in VOCABULARY], float)
+        norm = np.linalg.norm(vector)
+        return list(vector / norm if norm else vector)
+
+    def embed_documents(self, texts):
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries += 1
+        return self._embed(text)
+
+
+def make_store(path, chunks=CHUNKS):
+    store = LocalVectorStore(path, BagOfWordsEmbeddings())
+    store.add_texts(chunks, [{"source": f"doc-{n}"} for n in range(len(chunks))])
+    store.save()
+    return store
+
+
+def test_saved_chunks_are_searchable_from_a_new_process(tmp_path):
+    make_store(tmp_path)
+
+    reopened = LocalVectorStore(tmp_path, BagOfWordsEmbeddings())
+    (document,) = reopened.similarity_search("Senate of Rome", k=1)
+
+    assert document.page_content == CHUNKS[1]
+    assert document.metadata["source"] == "doc-1"
+    assert len(document.metadata["_id"]) == 32
+
+
+def test_hybrid_search_fuses_both_rankings_by_reciprocal_rank(tmp_path):
+    retriever = LocalHybridSearchRetriever(
+        vectorstore=make_store(tmp_path),
+        top_k=2,
+        vector_penalty=50,
+        fulltext_penalty=50,
+    )
+
+    documents = retriever.invoke("Hannibal elephants")
+
+    # First in both rankings: 1/51 + 1/51.
+    assert documents[0].page_content == CHUNKS[0]
+    assert documents[0].metadata["score"] == 2 / 51
+    assert documents[0].metadata["vector_score"] == 1 / 51
+    assert len(documents) == 2
+    second = documents[1].metadata
+    assert second["score"] == second["vector_score"] + second["fulltext_score"]
+    assert second["score"] < 2 / 51
+
+
+def test_full_text_ranking_favors_rare_terms(tmp_path):
+    store = make_store(tmp_path)
+
+    rows = store.snapshot().text_ranking("the cavalry", k=4)
+
+    # "the" appears in most chunks, "cavalry" in one.
+    assert rows[0] == 3
+    assert store.snapshot().text_ranking("Numidia", k=4).size == 0
+
+
+def test_searches_switch_to_a_reingested_index(tmp_path):
+    store = make_store(tmp_path)
+    reader = LocalVectorStore(tmp_path, BagOfWordsEmbeddings())
+    generation = reader.memory_generation()
+
+    store.clear()
+    store.add_texts(["Rome raised new legions."])
+    assert reader.memory_generation() == generation
+    store.save()
+
+    assert reader.memory_generation() != generation
+    assert [d.page_content for d in reader.similarity_search("Rome", k=4)] == [
+        "Rome raised new legions."
+    ]
+
+
+def test_saving_keeps_the_replaced_version_for_readers_switching_over(tmp_path):
+    store = make_store(tmp_path)
+    first = store.memory_generation()
+    second = store.save()
+
+    # A reader that read the manifest before the save can still open it.
+    assert LocalVectorStore(tmp_path, BagOfWordsEmbeddings()).snapshot() is not None
+    assert len(list(tmp_path.glob(f"{first}.*"))) == 7
+
+    third = store.save()
+
+    assert len(list(tmp_path.glob(f"{first}.*"))) == 0
+    assert len(list(tmp_path.glob(f"{second}.*"))) == 7
+    assert store.memory_generation() == third
+
+
+def test_reader_rereads_the_manifest_when_its_version_was_removed(
+    tmp_path, monkeypatch
+):
+    make_store(tmp_path)
+    reader = LocalVectorStore(tmp_path, BagOfWordsEmbeddings())
+    writer = LocalVectorStore(tmp_path, BagOfWordsEmbeddings())
+    read_manifest = LocalVectorStore._saved_generation
+
+    def read_then_save_twice(self):
+        generation = read_manifest(self)
+        if self is reader and writer.save() and writer.save():
+            monkeypatch.undo()
+        return generation
+
+    monkeypatch.setattr(LocalVectorStore, "_saved_generation", read_then_save_twice)
+
+    assert reader.memory_generation() == writer.memory_generation()
+    assert len(reader.similarity_search("Senate of Rome", k=4)) == len(CHUNKS)
+
+
+def test_missing_index_retrieves_nothing(tmp_path):
+    embeddings = BagOfWordsEmbeddings()
+    retriever = LocalHybridSearchRetriever(
+        vectorstore=LocalVectorStore(tmp_path / "missing", embeddings)
+    )
+
+    assert retriever.invoke("Hannibal") == []
+    assert embeddings.queries == 0
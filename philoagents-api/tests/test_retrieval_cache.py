@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from philoagents.application.rag import retrieval_cache
+from philoagents.application.rag.retrieval_cache import (
+    CachedQueryEmbeddings,
+    CachedRetriever,
+    RetrievalResultCache,
+    normalize_query,
+)
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeds a query as its letter counts, so similar texts are similar."""
+
+    def __init__(self):
+        self.queries = []
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(text.count(letter)) for letter in "abcdefghijklmnopqrstuvwxyz"]
+
+
+class FakeHybridRetriever:
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.queries = []
+
+    def invoke(self, query, config=None):
+        self.embeddings.embed_query(query)
+        self.queries.append(query)
+        return [Document(page_content=f"about {query}", metadata={"_id": query})]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_retriever(monkeypatch, generation=None, threshold=0.99):
+    clock = FakeClock()
+    generations = {"current": generation}
+    monkeypatch.setattr(
+        retrieval_cache,
+        "get_memory_generation",
+        lambda database: generations["current"],
+    )
+    query_embeddings = CachedQueryEmbeddings(CountingEmbeddings(), max_entries=100)
+    inner = FakeHybridRetriever(query_embeddings)
+    inner.vectorstore = SimpleNamespace(collection=SimpleNamespace(database=None))
+    retriever = CachedRetriever(
+        retriever=inner,
+        query_embeddings=query_embeddings,
+        results=RetrievalResultCache(max_entries=100, similarity_threshold=threshold),
+        generation_check_seconds=30,
+        clock=clock,
+    )
+    return retriever, inner, clock, generations
+
+
+def test_queries_are_normalized():
+    assert normalize_query("  What are Rome's   weaknesses?? ") == (
+        "what are rome's weaknesses"
+    )
+
+
+def test_query_embeddings_are_cached_by_normalized_text():
+    base = CountingEmbeddings()
+    embeddings = CachedQueryEmbeddings(base, max_entries=2)
+
+    first = embeddings.embed_query("What are Rome's weaknesses?")
+    second = embeddings.embed_query("what are rome's weaknesses")
+
+    assert first == second
+    assert base.queries == ["What are Rome's weaknesses?"]
+    assert (embeddings.hits, embeddings.misses) == (1, 1)
+
+    embeddings.embed_query("b")
+    embeddings.embed_query("c")  # evicts the oldest query
+    embeddings.embed_query("What are Rome's weaknesses?")
+    assert len(base.queries) == 4
+
+
+def test_results_are_reused_for_similar_embeddings_only():
+    cache = RetrievalResultCache(max_entries=10, similarity_threshold=0.95)
+    documents = [Document(page_content="Rome's legions are tired.")]
+    cache.put([1.0, 0.0, 0.0], documents)
+
+    assert cache.lookup([2.0, 0.1, 0.0]) == documents  # same direction
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = RetrievalResultCache(max_entries=2, similarity_threshold=0.99)
+    cache.put([1.0, 0.0, 0.0], [Document(page_content="a")])
+    cache.put([0.0, 1.0, 0.0], [Document(page_content="b")])
+    cache.lookup([1.0, 0.0, 0.0])  # "b" is now the least recently used
+
+    cache.put([0.0, 0.0, 1.0], [Document(page_content="c")])
+
+    assert len(cache) == 2
+    assert cache.lookup([0.0, 1.0, 0.0]) is None
+    assert cache.lookup([1.0, 0.0, 0.0])[0].page_content == "a"
+
+
+def test_repeated_questions_skip_the_embedding_model_and_mongo(monkeypatch):
+    retriever, inner, _, _ = make_retriever(monkeypatch)
+
+    first = retriever.invoke("What are Rome's weaknesses?")
+    second = retriever.invoke("what are rome's weaknesses")
+
+    assert first == second
+    assert inner.queries == ["What are Rome's weaknesses?"]
+    # One embedding for the first question, shared with the hybrid search.
+    assert len(retriever.query_embeddings.embeddings.queries) == 1
+
+
+def test_reingestion_drops_the_caches(monkeypatch):
+    retriever, inner, clock, generations = make_retriever(monkeypatch, "v1")
+    retriever.invoke("Who leads Carthage?")
+
+    generations["current"] = "v2"
+    retriever.invoke("Who leads Carthage?")
+    assert len(inner.queries) == 1  # not checked again yet
+
+    clock.now += 31
+    retriever.invoke("Who leads Carthage?")
+    assert len(inner.queries) == 2
@@ -0,0 +1,262 @@
+import asyncio
+from typing import Optional
+
+import pytest
+from test_game_loop_service import make_state
+
+from philoagents.application.game_loop_service.service import GameLoopService
+from philoagents.application.game_loop_service.session_registry import (
+    GameSessionRegistry,
+)
+from philoagents.domain.game_state import GameState
+
+
+class FakeGameStore:
+    """In-memory stand-in for GameStateRepository, one document per game id."""
+
+    def __init__(self, documents: Optional[dict] = None, game_id: str = "default"):
+        self.documents = documents if documents is not None else {}
+        self.game_id = game_id
+        self.load_calls = 0
+
+    def for_game(self, game_id: str) -> "FakeGameStore":
+        return FakeGameStore(self.documents, game_id)
+
+    async def save(self, state: GameState) -> None:
+        self.documents[self.game_id] = state.model_copy(deep=True)
+
+    async def load(self) -> Optional[GameState]:
+        self.load_calls += 1
+        return self.documents.get(self.game_id)
+
+    async def clear(self) -> None:
+        self.documents.pop(self.game_id, None)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_registry(
+    store: Optional[FakeGameStore] = None,
+    clock: Optional[FakeClock] = None,
+    idle_timeout_seconds: float = 60,
+    max_active_sessions: int = 10,
+) -> GameSessionRegistry:
+    return GameSessionRegistry(
+        initial_state=make_state(),
+        undergame_plot="The secret undergame plot.",
+        factory=None,
+        undergame_plot_display="The displayed undergame plot.",
+        state_repository=store,
+        idle_timeout_seconds=idle_timeout_seconds,
+        max_active_sessions=max_active_sessions,
+        clock=clock or FakeClock(),
+    )
+
+
+def test_sessions_are_created_lazily_and_reused():
+    registry = make_registry()
+    assert len(registry) == 0
+
+    first = asyncio.run(registry.get("game-a"))
+    again = asyncio.run(registry.get("game-a"))
+
+    assert first is again
+    assert first.game_id == "game-a"
+    assert len(registry) == 1
+
+
+def test_games_have_independent_state():
+    registry = make_registry()
+    game_a = asyncio.run(registry.get("game-a"))
+    game_b = asyncio.run(registry.get("game-b"))
+
+    asyncio.run(game_a.start_game("hannibal"))
+    game_a.game_state.round_number = 3
+
+    assert game_b.game_state.player_character_id is None
+    assert game_b.game_state.round_number == 1
+    assert game_a._round_lock is not game_b._round_lock
+
+
+def test_each_game_persists_to_its_own_document():
+    store = FakeGameStore()
+    registry = make_registry(store)
+
+    asyncio.run(asyncio.run(registry.get("game-a")).start_game("hannibal"))
+    asyncio.run(asyncio.run(registry.get("game-b")).start_game("scipio"))
+
+    assert store.documents["game-a"].player_character_id == "hannibal"
+    assert store.documents["game-b"].player_character_id == "scipio"
+
+
+def test_new_session_resumes_its_saved_game():
+    store = FakeGameStore({"game-a": make_state(round_number=3)})
+    registry = make_registry(store)
+
+    assert asyncio.run(registry.get("game-a")).game_state.round_number == 3
+    assert asyncio.run(registry.get("game-b")).game_state.round_number == 1
+
+
+def test_loading_a_game_does_not_precompute_ai_actions(monkeypatch):
+    speculated = []
+    monkeypatch.setattr(
+        GameLoopService,
+        "speculate_ai_actions",
+        lambda service: speculated.append(service.game_id),
+    )
+    saved = make_state(round_number=3)
+    saved.player_character_id = "hannibal"
+    registry = make_registry(FakeGameStore({"game-a": saved}))
+
+    service = asyncio.run(registry.get("game-a"))
+    asyncio.run(registry.get("game-a"))
+    assert speculated == []
+
+    # The player reopening the game opens its round.
+    asyncio.run(service.start_game("hannibal"))
+    assert speculated == ["game-a"]
+
+
+def test_concurrent_first_requests_create_one_session():
+    async def scenario():
+        registry = make_registry(FakeGameStore())
+        return await asyncio.gather(*(registry.get("game-a") for _ in range(5)))
+
+    services = asyncio.run(scenario())
+    assert all(service is services[0] for service in services)
+    assert services[0].state_repository.load_calls == 1
+
+
+def test_request_after_a_failed_creation_waits_for_the_retry():
+    class FlakyStore(FakeGameStore):
+        def __init__(self):
+            super().__init__()
+            self.release = asyncio.Event()
+            self.loading = 0
+            self.max_loading = 0
+
+        def for_game(self, game_id):
+            return self
+
+        async def load(self):
+            self.load_calls += 1
+            self.loading += 1
+            self.max_loading = max(self.max_loading, self.loading)
+            try:
+                if self.load_calls == 1:
+                    raise RuntimeError("database unavailable")
+                await self.release.wait()
+                return None
+            finally:
+                self.loading -= 1
+
+    async def scenario():
+        store = FlakyStore()
+        registry = make_registry(store)
+        first = asyncio.ensure_future(registry.get("game-a"))
+        second = asyncio.ensure_future(registry.get("game-a"))
+        with pytest.raises(RuntimeError):
+            await first
+        await asyncio.sleep(0)  # the second request is now creating the game
+        third = asyncio.ensure_future(registry.get("game-a"))
+        await asyncio.sleep(0)
+        store.release.set()
+        return store, await second, await third
+
+    store, second, third = asyncio.run(scenario())
+
+    assert second is third
+    assert store.max_loading == 1
+    assert store.load_calls == 2
+
+
+def test_idle_sessions_are_evicted_and_resume_later():
+    store = FakeGameStore()
+    clock = FakeClock()
+    registry = make_registry(store, clock, idle_timeout_seconds=60)
+
+    old = asyncio.run(registry.get("game-a"))
+    asyncio.run(old.start_game("hannibal"))
+    clock.now = 30
+    asyncio.run(registry.get("game-b"))
+
+    clock.now = 61
+    assert registry.evict_idle() == 1
+    assert "game-a" not in registry
+    assert "game-b" in registry
+
+    resumed = asyncio.run(registry.get("game-a"))
+    assert resumed is not old
+    assert resumed.game_state.player_character_id == "hannibal"
+
+
+def test_session_resolving_a_round_is_not_evicted():
+    clock = FakeClock()
+    registry = make_registry(clock=clock, idle_timeout_seconds=60)
+    service = asyncio.run(registry.get("game-a"))
+    service.is_processing_round = True
+
+    clock.now = 1000
+    assert registry.evict_idle() == 0
+    assert "game-a" in registry
+
+
+def test_full_registry_evicts_least_recently_used_idle_game():
+    clock = FakeClock()
+    registry = make_registry(clock=clock, max_active_sessions=2)
+    asyncio.run(registry.get("game-a"))
+    clock.now = 1
+    asyncio.run(registry.get("game-b"))
+    clock.now = 2
+    asyncio.run(registry.get("game-a"))  # game-b is now least recently used
+
+    clock.now = 3
+    asyncio.run(registry.get("game-c"))
+
+    assert "game-a" in registry
+    assert "game-b" not in registry
+    assert "game-c" in registry
+
+
+def test_full_registry_rejects_new_games_when_all_are_busy():
+    registry = make_registry(max_active_sessions=1)
+    asyncio.run(registry.get("game-a")).is_processing_round = True
+
+    with pytest.raises(RuntimeError, match="maximum number of games"):
+        asyncio.run(registry.get("game-b"))
+
+
+def test_session_with_an_open_event_stream_is_not_evicted():
+    clock = FakeClock()
+    registry = make_registry(clock=clock, idle_timeout_seconds=60)
+    service = asyncio.run(registry.get("game-a"))
+
+    clock.now = 1000
+    with service.events.subscribe():
+        assert registry.evict_idle() == 0
+    assert registry.evict_idle() == 1
+
+
+def test_session_with_a_long_polling_request_is_not_evicted():
+    async def scenario():
+        clock = FakeClock()
+        registry = make_registry(clock=clock, idle_timeout_seconds=60)
+        service = await registry.get("game-a")
+        waiter = asyncio.create_task(
+            service.wait_for_state_change(service.game_state.version, 30)
+        )
+        await asyncio.sleep(0)
+
+        clock.now = 1000
+        assert registry.evict_idle() == 0
+        waiter.cancel()
+        await asyncio.sleep(0)
+        assert registry.evict_idle() == 1
+
+    asyncio.run(scenario())
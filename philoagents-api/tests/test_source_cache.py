@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+from test_game_loop_service import make_character
+
+from philoagents.application.data import RagExtractor
+from philoagents.domain.character_factory import CharacterFactory
+from philoagents.infrastructure.source_cache import (
+    SourceCache,
+    SourceCacheMiss,
+    SourceCacheMode,
+)
+
+ARTICLE = "<html><title>Hannibal</title><article><p>{}</p></article></html>"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """Serves pages by URL, answering 304 when the client's ETag matches."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, headers, timeout):
+        self.requests.append((url, headers))
+        text, etag = self.pages[url]
+        if headers.get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, text, {"ETag": etag})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cache(tmp_path, session, mode=SourceCacheMode.REVALIDATE, clock=None):
+    return SourceCache(
+        tmp_path / "sources.sqlite3",
+        mode=mode,
+        max_age_seconds=60,
+        session=session,
+        clock=clock or Clock(),
+    )
+
+
+def test_stale_pages_are_revalidated_with_their_etag(tmp_path):
+    url = "https://www.britannica.com/biography/Hannibal"
+    session = FakeSession({url: ("v1", '"a"')})
+    clock = Clock()
+    cache = make_cache(tmp_path, session, clock=clock)
+
+    assert cache.fetch_url(url) == "v1"
+    # Fresh: no request at all.
+    assert cache.fetch_url(url) == "v1"
+    assert len(session.requests) == 1
+
+    clock.now = 120
+    assert cache.fetch_url(url) == "v1"
+    assert session.requests[-1][1]["If-None-Match"] == '"a"'
+
+    session.pages[url] = ("v2", '"b"')
+    clock.now = 240
+    assert cache.fetch_url(url) == "v2"
+    assert len(session.requests) == 3
+
+
+def test_offline_mode_reads_only_from_the_cache(tmp_path):
+    url = "https://www.britannica.com/biography/Hannibal"
+    make_cache(tmp_path, FakeSession({url: ("v1", '"a"')})).fetch_url(url)
+    offline_session = FakeSession({})
+    clock = Clock()
+    clock.now = 10**9
+    offline = make_cache(
+        tmp_path, offline_session, mode=SourceCacheMode.OFFLINE, clock=clock
+    )
+
+    assert offline.fetch_url(url) == "v1"
+    with pytest.raises(SourceCacheMiss):
+        offline.fetch("wikipedia:Scipio Africanus", lambda: "never called")
+    assert offline_session.requests == []
+
+
+def test_sources_are_extracted_concurrently_and_yielded_in_order(tmp_path):
+    ids = ["hannibal", "scipio", "fabius"]
+    urls = {
+        character_id: f"https://britannica.test/{character_id}" for character_id in ids
+    }
+    all_started = threading.Barrier(len(ids), timeout=5)
+
+    class ConcurrentSession(FakeSession):
+        def get(self, url, headers, timeout):
+            # Fails unless the three downloads are in flight at once.
+            all_started.wait()
+            return super().get(url, headers, timeout)
+
+    session = ConcurrentSession(
+        {
+            url: (ARTICLE.format(character_id), f'"{character_id}"')
+            for character_id, url in urls.items()
+        }
+    )
+    factory = CharacterFactory(
+        [make_character(character_id).model_dump() for character_id in ids]
+    )
+    extractor = RagExtractor(
+        factory, source_cache=make_cache(tmp_path, session), max_workers=3
+    )
+
+    extracted = list(
+        extractor.get_extraction_generator(
+            [
+                {"character_id": character_id, "britannica_urls": [urls[character_id]]}
+                for character_id in ids
+            ]
+        )
+    )
+
+    assert [character.id for character, _ in extracted] == ids
+    assert [docs[0].page_content for _, docs in extracted] == ids
+    assert extracted[0][1][0].metadata["title"] == "Hannibal"
@@ -0,0 +1,198 @@
+import asyncio
+import json
+
+import pytest
+
+from philoagents.infrastructure.ws_stream import (
+    ChatMultiplexer,
+    ChunkStreamer,
+    encode_frame,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingSocket:
+    def __init__(self):
+        self.frames = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def send_text(self, frame):
+        await self.release.wait()
+        self.frames.append(frame)
+
+    def chunks(self):
+        return [json.loads(frame)["c"] for frame in self.frames]
+
+
+def test_frames_are_compact():
+    assert encode_frame({"c": "Carthage é"}) == '{"c":"Carthage é"}'
+
+
+def test_chunks_are_coalesced_until_the_size_limit():
+    async def scenario():
+        socket = RecordingSocket()
+        streamer = ChunkStreamer(
+            socket.send_text, flush_ms=10_000, flush_bytes=5, max_queued_frames=8
+        )
+        streamer.start()
+        for chunk in ["Ro", "me ", "will ", "fall"]:
+            streamer.feed(chunk)
+        await streamer.close()
+        return socket, streamer
+
+    socket, streamer = asyncio.run(scenario())
+
+    assert socket.chunks() == ["Rome ", "will ", "fall"]
+    assert streamer.text == "Rome will fall"
+
+
+def test_chunks_are_flushed_once_the_window_elapses():
+    async def scenario():
+        socket = RecordingSocket()
+        clock = FakeClock()
+        streamer = ChunkStreamer(
+            socket.send_text,
+            flush_ms=50,
+            flush_bytes=1_000,
+            max_queued_frames=8,
+            clock=clock,
+        )
+        streamer.start()
+        streamer.feed("Hanni")
+        streamer.feed("bal")
+        clock.now += 0.05
+        streamer.feed(" marches")
+        await asyncio.sleep(0)
+        flushed = socket.chunks()
+        streamer.feed(".")
+        await streamer.close()
+        return flushed, socket.chunks()
+
+    flushed, chunks = asyncio.run(scenario())
+
+    assert flushed == ["Hannibal marches"]
+    assert chunks == ["Hannibal marches", "."]
+
+
+def test_the_window_flushes_a_stalled_stream():
+    async def scenario():
+        socket = RecordingSocket()
+        streamer = ChunkStreamer(
+            socket.send_text, flush_ms=1, flush_bytes=1_000, max_queued_frames=8
+        )
+        streamer.start()
+        streamer.feed("Thinking")
+        await asyncio.sleep(0.05)
+        flushed = socket.chunks()
+        await streamer.close()
+        return flushed
+
+    assert asyncio.run(scenario()) == ["Thinking"]
+
+
+def test_a_slow_client_gets_larger_frames_instead_of_stalling_the_stream():
+    async def scenario():
+        socket = RecordingSocket()
+        socket.release.clear()
+        streamer = ChunkStreamer(
+            socket.send_text, flush_ms=0, flush_bytes=1, max_queued_frames=2
+        )
+        streamer.start()
+        for i in range(100):
+            streamer.feed(f"{i} ")
+            await asyncio.sleep(0)  # the producer is never blocked
+        socket.release.set()
+        await streamer.close()
+        return socket, streamer
+
+    socket, streamer = asyncio.run(scenario())
+
+    assert "".join(socket.chunks()) == streamer.text
+    assert streamer.chunks == 100
+    assert len(socket.frames) <= 4
+
+
+def test_a_disconnected_client_stops_the_stream():
+    async def scenario():
+        async def send_text(frame):
+            raise ConnectionError("client went away")
+
+        streamer = ChunkStreamer(
+            send_text, flush_ms=0, flush_bytes=1, max_queued_frames=1
+        )
+        streamer.start()
+        streamer.feed("a")
+        await asyncio.sleep(0)
+        with pytest.raises(ConnectionError):
+            streamer.feed("b")
+        with pytest.raises(ConnectionError):
+            await streamer.close()
+
+    asyncio.run(scenario())
+
+
+def test_chats_in_one_thread_run_in_order_and_others_in_parallel():
+    async def scenario():
+        socket = RecordingSocket()
+        chats = ChatMultiplexer(socket.send_text, max_inflight=4)
+        events = []
+        gates = {name: asyncio.Event() for name in ("rome-1", "rome-2", "carthage")}
+
+        def chat(name):
+            async def handler():
+                events.append(f"start {name}")
+                await gates[name].wait()
+                await chats.send({"id": name, "response": name})
+                events.append(f"end {name}")
+
+            return handler
+
+        await chats.submit("rome", chat("rome-1"))
+        await chats.submit("rome", chat("rome-2"))
+        await chats.submit("carthage", chat("carthage"))
+        await asyncio.sleep(0)
+        started = list(events)
+
+        gates["carthage"].set()
+        gates["rome-2"].set()  # must still wait for rome-1
+        await asyncio.sleep(0.01)
+        gates["rome-1"].set()
+        await asyncio.sleep(0.01)
+        await chats.aclose()
+        return started, events, socket
+
+    started, events, socket = asyncio.run(scenario())
+
+    assert started == ["start rome-1", "start carthage"]
+    assert events.index("end rome-1") < events.index("start rome-2")
+    assert [json.loads(frame)["id"] for frame in socket.frames] == [
+        "carthage",
+        "rome-1",
+        "rome-2",
+    ]
+
+
+def test_submitting_waits_for_a_free_slot():
+    async def scenario():
+        socket = RecordingSocket()
+        chats = ChatMultiplexer(socket.send_text, max_inflight=1)
+        gate = asyncio.Event()
+        await chats.submit("rome", gate.wait)
+
+        second = asyncio.create_task(chats.submit("carthage", asyncio.sleep))
+        await asyncio.sleep(0.01)
+        blocked = not second.done()
+        gate.set()
+        await second
+        await chats.aclose()
+        return blocked
+
+    assert asyncio.run(scenario())
@@ -0,0 +1,139 @@
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import click
+from datasketch import MinHash, MinHashLSH
+from langchain_core.documents import Document
+
+from philoagents.application.data import DuplicateIndex, deduplicate_documents
+from philoagents.application.data.deduplicate_documents import DEFAULT_NUM_PERM
+
+
+def make_corpus(
+    chunks: int, characters: int, words: int, duplicate_rate: float, seed: int
+) -> List[List[Document]]:
+    """
+    Synthetic chunks of `words` words, split among `characters`. A share of
+    them retell a chunk of another character with a few words changed.
+    """
+    rng = random.Random(seed)
+    vocabulary = [f"word{n}" for n in range(20_000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    originals: List[str] = []
+    corpus: List[List[Document]] = [[] for _ in range(characters)]
+    for n in range(chunks):
+        character = n % characters
+        if originals and rng.random() < duplicate_rate:
+            text = rng.choice(originals).split()
+            for position in rng.sample(range(len(text)), 3):
+                text[position] = rng.choice(vocabulary)
+            text = " ".join(text)
+        else:
+            text = " ".join(rng.choices(vocabulary, weights, k=words))
+            originals.append(text)
+        corpus[character].append(Document(page_content=text, id=f"{character}-{n}"))
+    return corpus
+
+
+def legacy_deduplicate(documents: List[Document], threshold: float) -> int:
+    """The previous implementation: one MinHash.update per shingle and a list
+    scan per candidate pair. Returns the number of duplicate pairs."""
+    minhashes = []
+    for doc in documents:
+        minhash = MinHash(num_perm=DEFAULT_NUM_PERM)
+        words = re.findall(r"\w+", doc.page_content.lower())
+        for i in range(len(words) - 3):
+            minhash.update(" ".join(words[i : i + 3]).encode("utf-8"))
+        minhashes.append(minhash)
+    lsh = MinHashLSH(threshold=threshold, num_perm=DEFAULT_NUM_PERM)
+    for i, minhash in enumerate(minhashes):
+        lsh.insert(i, minhash)
+    duplicates = []
+    for i, minhash in enumerate(minhashes):
+        for j in lsh.query(minhash):
+            if j == i:
+                continue
+            similarity = minhashes[i].jaccard(minhashes[j])
+            if similarity >= threshold:
+                duplicate_info = (*sorted([i, j]), similarity)
+                if duplicate_info not in duplicates:
+                    duplicates.append(duplicate_info)
+    return len(duplicates)
+
+
+@click.command()
+@click.option("--chunks", type=int, default=100_000, help="Chunks in the corpus.")
+@click.option("--characters", type=int, default=100, help="Characters sharing them.")
+@click.option("--words", type=int, default=190, help="Words per chunk.")
+@click.option(
+    "--duplicate-rate",
+    type=float,
+    default=0.05,
+    help="Share of chunks that retell another chunk.",
+)
+@click.option(
+    "--legacy-chunks",
+    type=int,
+    default=10_000,
+    help="Chunks the previous implementation is timed on (0 to skip).",
+)
+@click.option("--seed", type=int, default=0)
+def main(
+    chunks: int,
+    characters: int,
+    words: int,
+    duplicate_rate: float,
+    legacy_chunks: int,
+    seed: int,
+) -> None:
+    """
+    Measures near-duplicate detection over a synthetic corpus: the previous
+    per-shingle MinHash implementation on a sample, and the vectorized one
+    deduplicating each character's chunks against a corpus-wide index.
+    No database or model is used.
+    """
+    corpus = make_corpus(chunks, characters, words, duplicate_rate, seed)
+    print(
+        f"Corpus: {chunks} chunks of {words} words across {characters} characters, "
+        f"{duplicate_rate:.0%} retold."
+    )
+
+    if legacy_chunks:
+        sample = [doc for docs in corpus for doc in docs][:legacy_chunks]
+        start = time.perf_counter()
+        pairs = legacy_deduplicate(sample, threshold=0.7)
+        elapsed = time.perf_counter() - start
+        print(
+            f"  previous, {len(sample)} chunks in one batch: {elapsed:8.2f} s "
+            f"({len(sample) / elapsed:8.0f} chunks/s, {pairs} pairs)"
+        )
+
+    index = DuplicateIndex(threshold=0.7)
+    start = time.perf_counter()
+    kept = sum(len(deduplicate_documents(docs, index=index)) for docs in corpus)
+    elapsed = time.perf_counter() - start
+    print(
+        f"  vectorized, corpus-wide:        {elapsed:8.2f} s "
+        f"({chunks / elapsed:8.0f} chunks/s, {chunks - kept} removed)"
+    )
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "dedup_index.npz"
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        DuplicateIndex.load(path, threshold=0.7)
+        loaded = time.perf_counter() - start
+        print(
+            f"  index of {len(index)} chunks: saved in {saved:.2f} s, "
+            f"loaded in {loaded:.2f} s ({path.stat().st_size / 2**20:.0f} MB)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import time
+
+import click
+from opik.integrations.langchain import OpikTracer
+
+from philoagents.application.game_loop_service.workflow.graph import (
+    create_action_graph,
+    create_judge_graph,
+    get_action_graph_description,
+    get_compiled_action_graph,
+    get_compiled_judge_graph,
+    get_judge_graph_description,
+)
+from philoagents.config import settings
+
+
+def setup_round_per_call(num_delegates: int) -> None:
+    """The per-round graph setup before graphs were cached: one compile and one
+    xray walk for every delegate, plus one for the judge."""
+    for _ in range(num_delegates):
+        graph = create_action_graph().compile()
+        OpikTracer(
+            graph=graph.get_graph(xray=True), project_name=settings.COMET_PROJECT
+        )
+    graph = create_judge_graph().compile()
+    OpikTracer(graph=graph.get_graph(xray=True), project_name=settings.COMET_PROJECT)
+
+
+def setup_round_cached(num_delegates: int) -> None:
+    """The per-round graph setup with the process-wide compiled graphs."""
+    for _ in range(num_delegates):
+        get_compiled_action_graph()
+        OpikTracer(
+            graph=get_action_graph_description(), project_name=settings.COMET_PROJECT
+        )
+    get_compiled_judge_graph()
+    OpikTracer(graph=get_judge_graph_description(), project_name=settings.COMET_PROJECT)
+
+
+def time_per_round(setup_round, num_delegates: int, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        setup_round(num_delegates)
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+@click.command()
+@click.option(
+    "--delegates",
+    type=int,
+    default=5,
+    help="Number of AI delegates resolved per round.",
+)
+@click.option(
+    "--rounds",
+    type=int,
+    default=200,
+    help="Number of simulated rounds to average over.",
+)
+def main(delegates: int, rounds: int) -> None:
+    """
+    Measures the CPU time a round spends building graphs and tracers before any
+    LLM call: compiling per delegate per round versus the cached graphs.
+    No LLM or database is contacted.
+    """
+    # Warm the caches (and imports) so the cached run measures steady state.
+    setup_round_cached(delegates)
+    setup_round_per_call(1)
+
+    per_call_ms = time_per_round(setup_round_per_call, delegates, rounds)
+    cached_ms = time_per_round(setup_round_cached, delegates, rounds)
+
+    print(f"Graph setup per round ({delegates} delegates + judge, {rounds} rounds):")
+    print(f"  compiled per call: {per_call_ms:8.3f} ms")
+    print(f"  cached:            {cached_ms:8.3f} ms")
+    print(
+        f"  saving:            {per_call_ms - cached_ms:8.3f} ms/round "
+        f"({per_call_ms / cached_ms:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ from pymongo import MongoClient
 from pymongo.database import Database
 
 from philoagents.config import settings
+from philoagents.infrastructure.mongo.memory_generation import bump_memory_generation
 
 
 @click.command()
@@ -43,6 +44,7 @@ def main(collection_name: str, mongo_uri: str, db_name: str) -> None:
     if collection_name in db.list_collection_names():
         db.drop_collection(collection_name)
         logger.info(f"Successfully deleted '{collection_name}' collection.")
+        bump_memory_generation(db)
     else:
         logger.info(f"'{collection_name}' collection does not exist.")
 
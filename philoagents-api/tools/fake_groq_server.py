@@ -0,0 +1,322 @@
+import asyncio
+import json
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import click
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+# Structured outputs returned for `response_format` schemas, by schema name.
+# The delegate's character_id is overwritten by the action node, and the
+# judge's lists are left empty so the fixtures fit any scenario.
+DEFAULT_FIXTURES: Dict[str, List[Dict[str, Any]]] = {
+    "Action": [
+        {
+            "character_id": "delegate",
+            "action_type": "DIPLOMACY",
+            "action_details": "Send envoys to propose a temporary truce.",
+            "resource_cost": {},
+        },
+        {
+            "character_id": "delegate",
+            "action_type": "ECONOMIC",
+            "action_details": "Redirect grain shipments to secure the supply lines.",
+            "resource_cost": {},
+        },
+        {
+            "character_id": "delegate",
+            "action_type": "ESPIONAGE",
+            "action_details": "Plant informants among the rival's advisers.",
+            "resource_cost": {},
+        },
+    ],
+    "JudgeOutput": [
+        {
+            "crisis_update": (
+                "Envoys crisscross the region while armies hold their ground. "
+                "The uneasy calm cannot last."
+            ),
+            "resource_changes": [],
+            "status_updates": [],
+            "private_intel_reports": None,
+            "victory_point_awards": None,
+        }
+    ],
+}
+
+LOREM_WORDS = (
+    "the council weighs every option while rivals gather strength and old "
+    "alliances fray under the pressure of war famine and ambition"
+).split()
+
+
+class LatencyModel:
+    """
+    Samples the time to first token from a log-normal distribution around
+    `median_ms` (a fixed delay when `jitter` is 0), then emits completion
+    tokens at `tokens_per_second`.
+    """
+
+    def __init__(
+        self,
+        median_ms: float,
+        jitter: float,
+        tokens_per_second: float,
+        rng: random.Random,
+    ):
+        self.median_ms = median_ms
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self._rng = rng
+
+    def time_to_first_token(self) -> float:
+        if self.jitter <= 0:
+            return self.median_ms / 1000
+        return self._rng.lognormvariate(0, self.jitter) * self.median_ms / 1000
+
+    def time_per_token(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+def _schema_example(schema: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    """Builds a minimal instance of a JSON schema without a fixture."""
+    if "$ref" in schema:
+        return _schema_example(defs[schema["$ref"].split("/")[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"]
+            return _schema_example(options[0], defs) if options else None
+    schema_type = schema.get("type", "object")
+    if isinstance(schema_type, list):
+        schema_type = next(t for t in schema_type if t != "null")
+    if schema_type == "object":
+        return {
+            name: _schema_example(prop, defs)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    return {
+        "array": [],
+        "string": "placeholder",
+        "integer": 0,
+        "number": 0.0,
+        "boolean": False,
+    }.get(schema_type)
+
+
+class FakeGroq:
+    """Produces completions for the OpenAI-compatible endpoint."""
+
+    def __init__(
+        self,
+        latency: LatencyModel,
+        fixtures: Dict[str, List[Dict[str, Any]]],
+        reply_words: int,
+        error_rate: float,
+        rng: random.Random,
+    ):
+        self.latency = latency
+        self.fixtures = fixtures
+        self.reply_words = reply_words
+        self.error_rate = error_rate
+        self._rng = rng
+
+    def should_fail(self) -> bool:
+        return self._rng.random() < self.error_rate
+
+    def content_for(self, body: Dict[str, Any]) -> str:
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            json_schema = response_format.get("json_schema", {})
+            fixtures = self.fixtures.get(json_schema.get("name", ""))
+            if fixtures:
+                return json.dumps(self._rng.choice(fixtures))
+            schema = json_schema.get("schema", {})
+            return json.dumps(_schema_example(schema, schema.get("$defs", {})))
+        if response_format.get("type") == "json_object":
+            return "{}"
+        return " ".join(self._rng.choice(LOREM_WORDS) for _ in range(self.reply_words))
+
+
+def _tokenize(content: str) -> List[str]:
+    # Whitespace-delimited pieces stand in for tokens; joined they rebuild
+    # the content exactly.
+    words = content.split(" ")
+    return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+
+def _usage(body: Dict[str, Any], completion_tokens: int) -> Dict[str, int]:
+    prompt_chars = sum(len(str(m.get("content") or "")) for m in body["messages"])
+    prompt_tokens = prompt_chars // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(fake: FakeGroq) -> FastAPI:
+    app = FastAPI(title="Fake Groq")
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if fake.should_fail():
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": "1"},
+                content={
+                    "error": {
+                        "message": "Rate limit reached (injected by fake server).",
+                        "type": "tokens",
+                        "code": "rate_limit_exceeded",
+                    }
+                },
+            )
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        model = body.get("model", "fake")
+        tokens = _tokenize(fake.content_for(body))
+        usage = _usage(body, len(tokens))
+
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream_chunks(fake, completion_id, created, model, tokens, usage),
+                media_type="text/event-stream",
+            )
+
+        await asyncio.sleep(
+            fake.latency.time_to_first_token()
+            + fake.latency.time_per_token() * len(tokens)
+        )
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": usage,
+        }
+
+    return app
+
+
+async def _stream_chunks(
+    fake: FakeGroq,
+    completion_id: str,
+    created: int,
+    model: str,
+    tokens: List[str],
+    usage: Dict[str, int],
+) -> AsyncIterator[str]:
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra):
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    await asyncio.sleep(fake.latency.time_to_first_token())
+    yield chunk({"role": "assistant", "content": ""})
+    for token in tokens:
+        yield chunk({"content": token})
+        await asyncio.sleep(fake.latency.time_per_token())
+    yield chunk({}, finish_reason="stop", x_groq={"id": completion_id, "usage": usage})
+    yield "data: [DONE]\n\n"
+
+
+def load_fixtures(path: Optional[Path]) -> Dict[str, List[Dict[str, Any]]]:
+    fixtures = dict(DEFAULT_FIXTURES)
+    if path is not None:
+        for name, outputs in json.loads(path.read_text()).items():
+            fixtures[name] = outputs if isinstance(outputs, list) else [outputs]
+    return fixtures
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Interface to listen on.")
+@click.option("--port", type=int, default=8100, help="Port to listen on.")
+@click.option(
+    "--latency-ms",
+    type=float,
+    default=400.0,
+    help="Median time to first token, in milliseconds.",
+)
+@click.option(
+    "--latency-jitter",
+    type=float,
+    default=0.5,
+    help="Log-normal sigma of the time to first token; 0 for a fixed delay.",
+)
+@click.option(
+    "--tokens-per-second",
+    type=float,
+    default=300.0,
+    help="Completion speed; 0 emits all tokens at once.",
+)
+@click.option(
+    "--reply-words",
+    type=int,
+    default=60,
+    help="Length of plain-text (dialogue and summary) replies.",
+)
+@click.option(
+    "--error-rate",
+    type=click.FloatRange(0, 1),
+    default=0.0,
+    help="Fraction of requests answered with a 429 to exercise retries.",
+)
+@click.option(
+    "--fixtures",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="JSON file mapping schema names (e.g. Action, JudgeOutput) to outputs.",
+)
+@click.option("--seed", type=int, default=None, help="Seed for reproducible runs.")
+def main(
+    host: str,
+    port: int,
+    latency_ms: float,
+    latency_jitter: float,
+    tokens_per_second: float,
+    reply_words: int,
+    error_rate: float,
+    fixtures: Optional[Path],
+    seed: Optional[int],
+) -> None:
+    """
+    Serves an offline, OpenAI/Groq-compatible chat completions endpoint. Point
+    the API at it with GROQ_API_BASE=http://HOST:PORT, and set
+    GROQ_RATE_LIMITS_ENABLED=false to measure the API rather than the
+    client-side rate limiter.
+    """
+    rng = random.Random(seed)
+    fake = FakeGroq(
+        latency=LatencyModel(latency_ms, latency_jitter, tokens_per_second, rng),
+        fixtures=load_fixtures(fixtures),
+        reply_words=reply_words,
+        error_rate=error_rate,
+        rng=rng,
+    )
+    uvicorn.run(create_app(fake), host=host, port=port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
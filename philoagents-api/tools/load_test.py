@@ -0,0 +1,326 @@
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from functools import wraps
+from typing import Dict, List, Optional
+
+import click
+import httpx
+import websockets
+
+# The harness only speaks HTTP to the API, so it runs without the API's .env.
+ACTION_TYPES = ("DIPLOMACY", "MILITARY", "ESPIONAGE", "ECONOMIC")
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of `samples` (q in [0, 100])."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Metrics:
+    """Latencies and failures per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.completed_rounds = 0
+        self.completed_chats = 0
+
+    def record(self, label: str, seconds: float):
+        self.latencies[label].append(seconds)
+
+    def fail(self, label: str, error: str):
+        self.errors[label] += 1
+        click.echo(f"\033[31m{label}: {error}\033[0m", err=True)
+
+    def report(self, elapsed: float):
+        click.echo(f"\nWall time: {elapsed:.1f}s")
+        click.echo(
+            f"Rounds: {self.completed_rounds} "
+            f"({self.completed_rounds / elapsed:.3f} rounds/sec)"
+        )
+        click.echo(
+            f"Chats:  {self.completed_chats} "
+            f"({self.completed_chats / elapsed:.3f} chats/sec)\n"
+        )
+        click.echo(
+            f"{'endpoint':<42}{'count':>7}{'errors':>8}"
+            f"{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+        )
+        for label in sorted(set(self.latencies) | set(self.errors)):
+            samples = self.latencies.get(label, [])
+            stats = (
+                f"{percentile(samples, 50) * 1000:>10.1f}"
+                f"{percentile(samples, 99) * 1000:>10.1f}"
+                f"{max(samples) * 1000:>10.1f}"
+                if samples
+                else f"{'-':>10}{'-':>10}{'-':>10}"
+            )
+            click.echo(
+                f"{label:<42}{len(samples):>7}{self.errors.get(label, 0):>8}{stats}"
+            )
+
+
+class RoundFailed(RuntimeError):
+    """The server finished resolving a round without advancing it."""
+
+
+async def timed_request(
+    client: httpx.AsyncClient,
+    metrics: Metrics,
+    method: str,
+    url: str,
+    label: Optional[str] = None,
+    **kwargs,
+) -> httpx.Response:
+    """Sends a request, recording its latency under `label` (or the route)."""
+    label = label or f"{method} {url.split('?')[0]}"
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    metrics.record(label, time.perf_counter() - start)
+    response.raise_for_status()
+    return response
+
+
+async def play_game(
+    client: httpx.AsyncClient,
+    metrics: Metrics,
+    game_id: str,
+    character_id: str,
+    rounds: int,
+    round_timeout: float,
+    rng: random.Random,
+):
+    params = {"game_id": game_id}
+    status_url = f"/game/status/{character_id}"
+    await timed_request(
+        client,
+        metrics,
+        "POST",
+        "/game/start",
+        params=params,
+        json={"character_id": character_id},
+    )
+    status = (
+        await timed_request(
+            client, metrics, "GET", status_url, label="GET /game/status", params=params
+        )
+    ).json()
+
+    for _ in range(rounds):
+        if status["is_game_over"]:
+            return
+        round_number = status["round_number"]
+        action = {
+            "character_id": character_id,
+            "action_type": rng.choice(ACTION_TYPES),
+            "action_details": f"Load-test action for round {round_number}.",
+            "resource_cost": {},
+        }
+        round_start = time.perf_counter()
+        await timed_request(
+            client,
+            metrics,
+            "POST",
+            "/game/action",
+            params=params,
+            json=action,
+        )
+        status = await wait_for_next_round(
+            client, metrics, game_id, character_id, status, round_timeout
+        )
+        metrics.record("round (action -> committed)", time.perf_counter() - round_start)
+        metrics.completed_rounds += 1
+
+
+async def wait_for_next_round(
+    client: httpx.AsyncClient,
+    metrics: Metrics,
+    game_id: str,
+    character_id: str,
+    status: dict,
+    round_timeout: float,
+) -> dict:
+    """Long-polls the status until the round advances or its resolution fails."""
+    deadline = time.monotonic() + round_timeout
+    round_number = status["round_number"]
+    while time.monotonic() < deadline:
+        response = await timed_request(
+            client,
+            metrics,
+            "GET",
+            f"/game/status/{character_id}",
+            label="GET /game/status (long-poll)",
+            params={"game_id": game_id, "wait_for_version": status["version"]},
+        )
+        previous, status = status, response.json()
+        if status["round_number"] > round_number:
+            return status
+        # The server wakes long-polls when a resolution attempt ends, so an
+        # idle game on the same round and version means the attempt failed.
+        if (
+            not status["is_processing_round"]
+            and status["version"] == previous["version"]
+        ):
+            raise RoundFailed(f"Round {round_number} of '{game_id}' failed.")
+    raise TimeoutError(
+        f"Round {round_number} of '{game_id}' did not finish in {round_timeout}s."
+    )
+
+
+async def run_game(metrics: Metrics, game_id: str, **kwargs):
+    try:
+        await play_game(metrics=metrics, game_id=game_id, **kwargs)
+    except (httpx.HTTPError, RoundFailed, TimeoutError) as e:
+        metrics.fail("game", f"{game_id}: {e}")
+
+
+async def chat_session(
+    ws_url: str,
+    metrics: Metrics,
+    sender_id: str,
+    receiver_ids: List[str],
+    messages: int,
+    rng: random.Random,
+):
+    try:
+        async with websockets.connect(ws_url) as websocket:
+            for i in range(messages):
+                await chat_once(
+                    websocket, metrics, sender_id, rng.choice(receiver_ids), i
+                )
+    except (OSError, websockets.WebSocketException) as e:
+        metrics.fail("WS /ws/chat (complete)", str(e))
+
+
+async def chat_once(
+    websocket,
+    metrics: Metrics,
+    sender_id: str,
+    receiver_id: str,
+    index: int,
+):
+    await websocket.send(
+        json.dumps(
+            {
+                "message": f"What is your next move? ({index})",
+                "sender_id": sender_id,
+                "receiver_id": receiver_id,
+            }
+        )
+    )
+    start = time.perf_counter()
+    first_chunk: Optional[float] = None
+    while True:
+        event = json.loads(await websocket.recv())
+        if "error" in event:
+            metrics.fail("WS /ws/chat (complete)", event["error"])
+            return
+        if "c" in event and first_chunk is None:
+            first_chunk = time.perf_counter() - start
+            metrics.record("WS /ws/chat (first chunk)", first_chunk)
+        if event.get("streaming") is False:
+            metrics.record("WS /ws/chat (complete)", time.perf_counter() - start)
+            metrics.completed_chats += 1
+            return
+
+
+@click.command()
+@click.option(
+    "--api-url",
+    default="http://localhost:8000",
+    help="Base URL of the API under test.",
+)
+@click.option("--games", type=int, default=20, help="Concurrent games to play.")
+@click.option(
+    "--rounds", type=int, default=4, help="Rounds to play per game (at most)."
+)
+@click.option("--chats", type=int, default=20, help="Concurrent chat sessions.")
+@click.option("--messages", type=int, default=3, help="Messages sent per chat session.")
+@click.option(
+    "--round-timeout",
+    type=float,
+    default=300.0,
+    help="Seconds to wait for a round to resolve before failing the game.",
+)
+@click.option("--seed", type=int, default=None, help="Seed for reproducible runs.")
+@async_command
+async def main(
+    api_url: str,
+    games: int,
+    rounds: int,
+    chats: int,
+    messages: int,
+    round_timeout: float,
+    seed: Optional[int],
+) -> None:
+    """
+    Drives many concurrent games and chats against a running API and reports
+    rounds/sec and p50/p99 latency per endpoint. Run the API against
+    tools/fake_groq_server.py to benchmark it fully offline.
+    """
+    rng = random.Random(seed)
+    metrics = Metrics()
+    run_id = uuid.uuid4().hex[:8]
+    ws_url = api_url.replace("http", "ws", 1).rstrip("/") + "/ws/chat"
+
+    async with httpx.AsyncClient(
+        base_url=api_url,
+        timeout=httpx.Timeout(60.0),
+        limits=httpx.Limits(max_connections=games * 2 + 10),
+    ) as client:
+        characters = (await client.get("/game/characters")).json()["characters"]
+        character_ids = [character["id"] for character in characters]
+        player_id = character_ids[0]
+        click.echo(
+            f"Load test {run_id}: {games} games x {rounds} rounds as "
+            f"'{player_id}', {chats} chats x {messages} messages."
+        )
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                run_game(
+                    metrics,
+                    f"load-{run_id}-{i}",
+                    client=client,
+                    character_id=player_id,
+                    rounds=rounds,
+                    round_timeout=round_timeout,
+                    rng=rng,
+                )
+                for i in range(games)
+            ),
+            *(
+                chat_session(
+                    ws_url,
+                    metrics,
+                    f"load-{run_id}-chat-{i}",
+                    character_ids,
+                    messages,
+                    rng,
+                )
+                for i in range(chats)
+            ),
+        )
+        metrics.report(time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import Phaser from "phaser";
 import ApiService from "../services/ApiService";
-import { POLL_INTERVAL_MS } from "../config";
+import { POLL_INTERVAL_MS, ROUND_EVENTS_IDLE_TIMEOUT_MS } from "../config";
 
 export class GameManager {
   /**
@@ -17,7 +17,10 @@ export class GameManager {
     this.gameState = {}; // Will hold the full state from the backend
     this.gamePhase = "INITIALIZING"; // e.g., 'INITIALIZING', 'DIPLOMACY', 'ACTION', 'WAITING_FOR_JUDGE'
     this._pollTimer = null; // Handle for the round-polling timer.
+    this._roundEvents = null; // Open round event stream, if any.
+    this._roundEventsTimer = null; // Fires when the round event stream goes quiet.
     this._pollRunId = 0; // Bumped on stopPolling() so in-flight polls know they're stale.
+    this.crisisDraft = ""; // The judge's crisis update as it is being written.
 
     // Using Phaser's event emitter to communicate with the UI
     this.events = new Phaser.Events.EventEmitter();
@@ -91,14 +94,109 @@ export class GameManager {
         "GameManager: Action submitted successfully. Waiting for next round..."
       );
 
-      // Start polling for the next round's state update.
-      this.pollForNextRound();
+      this.waitForNextRound();
     } catch (error) {
       console.error("GameManager: Failed to submit action.", error);
       this.events.emit("error", "Failed to submit your action.");
     }
   }
 
+  /**
+   * Waits for the round to resolve by listening to the server's round event
+   * stream: one message per phase instead of a status request every tick.
+   * Falls back to polling if the stream cannot be opened, drops, or sends
+   * nothing for ROUND_EVENTS_IDLE_TIMEOUT_MS.
+   */
+  waitForNextRound() {
+    const initialRound = this.gameState.round_number;
+
+    this.stopPolling(); // Ensure only one wait loop is ever running.
+    const runId = this._pollRunId;
+    this.crisisDraft = "";
+
+    const fallBackToPolling = (reason) => {
+      if (runId !== this._pollRunId) {
+        return;
+      }
+      console.warn(
+        `GameManager: Round event stream ${reason}; polling instead.`
+      );
+      this.pollForNextRound();
+    };
+    const restartIdleTimer = () => {
+      clearTimeout(this._roundEventsTimer);
+      this._roundEventsTimer = setTimeout(
+        () => fallBackToPolling("went quiet"),
+        ROUND_EVENTS_IDLE_TIMEOUT_MS
+      );
+    };
+
+    this._roundEvents = this.api.subscribeToRoundEvents({
+      onEvent: (event) => {
+        if (runId === this._pollRunId) {
+          restartIdleTimer();
+          this.handleRoundEvent(event, initialRound);
+        }
+      },
+      onError: () => fallBackToPolling("lost"),
+    });
+    restartIdleTimer();
+  }
+
+  /**
+   * Reacts to one round event. The first message is a status snapshot, which
+   * also covers a round that committed before the stream connected.
+   * @param {object} event - The event sent by the server.
+   * @param {number} initialRound - The round the player submitted for.
+   */
+  handleRoundEvent(event, initialRound) {
+    this.events.emit("roundProgress", event);
+
+    if (event.type === "judge_narrative") {
+      this.updateCrisisDraft(event);
+      return;
+    }
+    if (event.type === "round_failed" || event.type === "round_committed") {
+      this.crisisDraft = "";
+    }
+
+    if (event.type === "round_failed") {
+      this.stopPolling();
+      this.events.emit(
+        "error",
+        "The round could not be resolved. Please submit your action again."
+      );
+      this.startActionPhase();
+      return;
+    }
+
+    const committed =
+      event.type === "round_committed" ||
+      (event.type === "status" &&
+        (event.round_number > initialRound || event.is_game_over));
+    if (committed) {
+      console.log("GameManager: Round committed.");
+      this.stopPolling();
+      this.fetchAndProcessGameState();
+    }
+  }
+
+  /**
+   * Applies a piece of the crisis update the judge is writing. Each piece
+   * replaces the draft from its offset on (0 when the judge starts over).
+   * The server merges pieces a slow client has not read yet rather than
+   * dropping them; a piece past the end of the draft would still mean one was
+   * lost, so the draft then waits for the committed state instead.
+   * @param {object} event - A judge_narrative event.
+   */
+  updateCrisisDraft(event) {
+    if (event.offset > this.crisisDraft.length) {
+      return;
+    }
+    this.crisisDraft = this.crisisDraft.slice(0, event.offset) + event.text;
+    this.events.emit("crisisDraftUpdated", this.crisisDraft);
+  }
+
   /**
    * Periodically checks the server for a new game state (i.e., a new round).
    * Individual requests time out via ApiService, so a hung backend just skips
@@ -149,15 +247,24 @@ export class GameManager {
   }
 
   /**
-   * Stops the round-polling loop, if one is running. Also invalidates any
-   * poll callback whose request is still in flight.
+   * Stops waiting for the next round: closes the round event stream and the
+   * polling loop, if running. Also invalidates any poll callback whose
+   * request is still in flight.
    */
   stopPolling() {
     this._pollRunId += 1;
+    if (this._roundEvents) {
+      this._roundEvents.close();
+      this._roundEvents = null;
+    }
     if (this._pollTimer) {
       clearInterval(this._pollTimer);
       this._pollTimer = null;
     }
+    if (this._roundEventsTimer) {
+      clearTimeout(this._roundEventsTimer);
+      this._roundEventsTimer = null;
+    }
   }
 
   /**
@@ -171,8 +278,9 @@ export class GameManager {
   }
 
   /**
-   * Releases all resources: stops polling and removes event listeners. Call
-   * this when the Game scene shuts down so timers don't fire on a dead scene.
+   * Releases all resources: stops waiting for the round and removes event
+   * listeners. Call this when the Game scene shuts down so timers and streams
+   * don't fire on a dead scene.
    */
   destroy() {
     this.stopPolling();
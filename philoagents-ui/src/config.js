@@ -34,3 +34,6 @@ export const POLL_INTERVAL_MS = 5000;
 // How long a dialogue stream may go without any server activity before the
 // client gives up (and falls back to the REST endpoint if nothing arrived).
 export const STREAM_IDLE_TIMEOUT_MS = 30000;
+// How long the round event stream may stay silent before the client stops
+// trusting it and polls for the next round instead.
+export const ROUND_EVENTS_IDLE_TIMEOUT_MS = 60000;
@@ -68,9 +68,11 @@ export class HUDScene extends Scene {
             .setOrigin(1, 0);
         this.createEndDiplomacyButton();
         this.createIntelButton();
+        this.createCrisisDraftText();
 
         this.gameManager.events.on("stateUpdated", this.updateHUD, this);
         this.gameManager.events.on("phaseChanged", this.updatePhase, this);
+        this.gameManager.events.on("crisisDraftUpdated", this.updateCrisisDraft, this);
 
         // Detach listeners when this scene shuts down or is destroyed to avoid updates on dead objects
         this.events.once(Phaser.Scenes.Events.SHUTDOWN, () => this.detachGameManagerEvents());
@@ -84,6 +86,7 @@ export class HUDScene extends Scene {
         if (this.gameManager && this.gameManager.events) {
             this.gameManager.events.off("stateUpdated", this.updateHUD, this);
             this.gameManager.events.off("phaseChanged", this.updatePhase, this);
+            this.gameManager.events.off("crisisDraftUpdated", this.updateCrisisDraft, this);
         }
     }
 
@@ -102,6 +105,25 @@ export class HUDScene extends Scene {
         this.intelButton.setData("label", label);
     }
 
+    // The judge's crisis update, shown as it is written while the round resolves
+    createCrisisDraftText() {
+        const width = this.cameras.main.width;
+        this.crisisDraftText = this.add
+            .text(width / 2, this.cameras.main.height - 40, "", {
+                fontSize: "18px", color: "#ffffff", stroke: "#000000", strokeThickness: 4,
+                align: "center", wordWrap: { width: width - 160 },
+            })
+            .setOrigin(0.5, 1)
+            .setVisible(false);
+    }
+
+    updateCrisisDraft(draft) {
+        if (!this.crisisDraftText || this.gameManager.gamePhase !== "WAITING_FOR_JUDGE") {
+            return;
+        }
+        this.crisisDraftText.setText(draft).setVisible(true);
+    }
+
     createEndDiplomacyButton() {
         const buttonX = this.cameras.main.width / 2;
         const buttonY = this.cameras.main.height - 40;
@@ -183,5 +205,8 @@ export class HUDScene extends Scene {
         const phaseName = newPhase.replace("_", " ").toUpperCase();
         this.phaseText.setText(`Phase: ${phaseName}`);
         this.endDiplomacyButton.setVisible(newPhase === "DIPLOMACY");
+        if (newPhase !== "WAITING_FOR_JUDGE" && this.crisisDraftText) {
+            this.crisisDraftText.setText("").setVisible(false);
+        }
     }
 }
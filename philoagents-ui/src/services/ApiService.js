@@ -95,6 +95,33 @@ class ApiService {
         }
     }
 
+    /**
+     * Opens the server-sent stream of round-resolution events (delegates
+     * started/finished, judge started, round committed or failed). The stream
+     * is closed on its first error instead of letting EventSource reconnect,
+     * so the caller can fall back to polling.
+     * @param {object} handlers - { onEvent(event), onError(error) }
+     * @returns {EventSource} The open stream; call close() to unsubscribe.
+     */
+    subscribeToRoundEvents({ onEvent, onError }) {
+        const source = new EventSource(`${this.apiUrl}/game/events`);
+        source.onmessage = (message) => {
+            let event;
+            try {
+                event = JSON.parse(message.data);
+            } catch (error) {
+                console.error('Ignoring a malformed round event:', error);
+                return;
+            }
+            onEvent(event);
+        };
+        source.onerror = (error) => {
+            source.close();
+            onError(error);
+        };
+        return source;
+    }
+
     /**
      * Submits the player's final, official action for the round.
      * @param {object} actionData - The action object to be submitted.
@@ -12,6 +12,10 @@ class WebSocketApiService {
     initializeConnectionProperties() {
         this.socket = null;
         this.messageCallbacks = new Map();
+        // Callbacks of in-flight requests, keyed by the request id the server
+        // tags their frames with, so several chats can share the socket.
+        this.requests = new Map();
+        this.nextRequestId = 1;
         this.connected = false;
         this.connectionPromise = null;
         this.connectionTimeout = REQUEST_TIMEOUT_MS;
@@ -54,8 +58,12 @@ class WebSocketApiService {
                 this.connected = false;
                 this.connectionPromise = null;
                 // A close during an active exchange means no terminating frame
-                // will ever arrive; let the consumer unblock instead of hanging.
-                this.notifyError(new Error('WebSocket connection closed'));
+                // will ever arrive; let the consumers unblock instead of hanging.
+                const error = new Error('WebSocket connection closed');
+                for (const requestId of [...this.requests.keys()]) {
+                    this.notifyError(error, requestId);
+                }
+                this.notifyError(error);
             };
         });
 
@@ -73,41 +81,48 @@ class WebSocketApiService {
 
         if (data.error) {
             console.error('WebSocket error:', data.error);
-            this.notifyError(new Error(data.error));
+            this.notifyError(new Error(data.error), data.id);
             return;
         }
 
         if (data.streaming !== undefined) {
-            this.handleStreamingUpdate(data.streaming);
+            this.handleStreamingUpdate(data.streaming, data.id);
             return;
         }
 
-        if (data.chunk) {
-            this.triggerCallback('chunk', data.chunk);
+        // Chunk frames are compact: {"c": text}, coalescing several tokens.
+        if (data.c) {
+            this.triggerCallback('chunk', data.c, data.id);
             return;
         }
 
         if (data.response) {
-            this.triggerCallback('message', data.response);
+            this.triggerCallback('message', data.response, data.id);
         }
     }
 
-    handleStreamingUpdate(isStreaming) {
-        const streamingCallback = this.messageCallbacks.get('streaming');
-        if (streamingCallback) {
-            streamingCallback(isStreaming);
+    handleStreamingUpdate(isStreaming, requestId) {
+        this.triggerCallback('streaming', isStreaming, requestId);
+        if (!isStreaming) {
+            this.requests.delete(requestId);
         }
     }
 
-    triggerCallback(type, data) {
-        const callback = this.messageCallbacks.get(type);
+    callbacksFor(requestId) {
+        // Untagged frames go to the callbacks registered without a request.
+        return this.requests.get(requestId) || this.messageCallbacks;
+    }
+
+    triggerCallback(type, data, requestId) {
+        const callback = this.callbacksFor(requestId).get(type);
         if (callback) {
             callback(data);
         }
     }
 
-    notifyError(error) {
-        this.triggerCallback('error', error);
+    notifyError(error, requestId) {
+        this.triggerCallback('error', error, requestId);
+        this.requests.delete(requestId);
     }
 
     async sendMessage(senderId, receiverId, message, callbacks = {}) {
@@ -115,20 +130,24 @@ class WebSocketApiService {
             await this.connect();
         }
 
-        this.registerCallbacks(callbacks);
+        // Each request gets its own id and callbacks, so replies to several
+        // delegates can stream at the same time.
+        const requestId = String(this.nextRequestId++);
+        this.requests.set(requestId, this.registerCallbacks(callbacks, new Map()));
 
         this.socket.send(JSON.stringify({
-            sender_id: senderId, receiver_id: receiverId, message: message,
+            request_id: requestId, sender_id: senderId, receiver_id: receiverId, message: message,
         }));
+        return requestId;
     }
 
-    registerCallbacks(callbacks) {
+    registerCallbacks(callbacks, target = this.messageCallbacks) {
         if (callbacks.onMessage) {
-            this.messageCallbacks.set('message', callbacks.onMessage);
+            target.set('message', callbacks.onMessage);
         }
 
         if (callbacks.onStreamingStart) {
-            this.messageCallbacks.set('streaming', (isStreaming) => {
+            target.set('streaming', (isStreaming) => {
                 if (isStreaming) {
                     callbacks.onStreamingStart();
                 } else if (callbacks.onStreamingEnd) {
@@ -138,12 +157,14 @@ class WebSocketApiService {
         }
 
         if (callbacks.onChunk) {
-            this.messageCallbacks.set('chunk', callbacks.onChunk);
+            target.set('chunk', callbacks.onChunk);
         }
 
         if (callbacks.onError) {
-            this.messageCallbacks.set('error', callbacks.onError);
+            target.set('error', callbacks.onError);
         }
+
+        return target;
     }
 
     disconnect() {
@@ -151,6 +172,7 @@ class WebSocketApiService {
             // Clear the callbacks first so the deliberate close below does not
             // fire the error callback via onclose.
             this.messageCallbacks.clear();
+            this.requests.clear();
             this.socket.close();
             this.connected = false;
             this.connectionPromise = null;
@@ -1,6 +1,9 @@
 import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
 import { EventEmitter } from "node:events";
-import { POLL_INTERVAL_MS } from "../src/config";
+import {
+  POLL_INTERVAL_MS,
+  ROUND_EVENTS_IDLE_TIMEOUT_MS,
+} from "../src/config";
 
 vi.mock("phaser", () => ({
   default: { Events: { EventEmitter } },
@@ -10,6 +13,7 @@ vi.mock("../src/services/ApiService", () => ({
   default: {
     getGameState: vi.fn(),
     submitAction: vi.fn(),
+    subscribeToRoundEvents: vi.fn(),
   },
 }));
 
@@ -31,6 +35,7 @@ const state = (round, over = false) => ({
 beforeEach(() => {
   vi.useFakeTimers();
   ApiService.getGameState.mockReset();
+  ApiService.subscribeToRoundEvents.mockReset();
 });
 
 afterEach(() => {
@@ -122,6 +127,133 @@ describe("pollForNextRound", () => {
   });
 });
 
+describe("waitForNextRound", () => {
+  // Captures the handlers GameManager registers, so tests can push events.
+  function openStream() {
+    const stream = { close: vi.fn() };
+    let handlers;
+    ApiService.subscribeToRoundEvents.mockImplementation((h) => {
+      handlers = h;
+      return stream;
+    });
+    return { stream, handlers: () => handlers };
+  }
+
+  it("fetches the new state once the round is committed", async () => {
+    const { stream, handlers } = openStream();
+    const manager = makeManager(1);
+    const crisis = vi.fn();
+    manager.events.on("showCrisisUpdate", crisis);
+    ApiService.getGameState.mockResolvedValue(state(2));
+
+    manager.waitForNextRound();
+    handlers().onEvent({ type: "status", round_number: 1, is_game_over: false });
+    handlers().onEvent({ type: "judge_started", round_number: 1 });
+    expect(ApiService.getGameState).not.toHaveBeenCalled();
+
+    handlers().onEvent({ type: "round_committed", round_number: 2 });
+    await vi.runOnlyPendingTimersAsync();
+
+    expect(ApiService.getGameState).toHaveBeenCalledTimes(1);
+    expect(crisis).toHaveBeenCalledWith("Crisis of round 2", 2);
+    expect(stream.close).toHaveBeenCalled();
+    expect(manager._pollTimer).toBeNull();
+  });
+
+  it("treats a status snapshot past the submitted round as committed", async () => {
+    const { handlers } = openStream();
+    const manager = makeManager(1);
+    ApiService.getGameState.mockResolvedValue(state(2));
+
+    manager.waitForNextRound();
+    handlers().onEvent({ type: "status", round_number: 2, is_game_over: false });
+    await vi.runOnlyPendingTimersAsync();
+
+    expect(ApiService.getGameState).toHaveBeenCalledTimes(1);
+    expect(manager.gamePhase).toBe("DIPLOMACY");
+  });
+
+  it("assembles the crisis update as the judge writes it", () => {
+    const { handlers } = openStream();
+    const manager = makeManager(1);
+    const drafts = [];
+    manager.events.on("crisisDraftUpdated", (draft) => drafts.push(draft));
+
+    manager.waitForNextRound();
+    const narrative = (offset, text) =>
+      handlers().onEvent({ type: "judge_narrative", round_number: 1, offset, text });
+    narrative(0, "Rome");
+    narrative(4, " burns");
+    narrative(0, "Carthage"); // the judge started over
+    narrative(12, " lost"); // a dropped piece: ignored
+    narrative(8, " waits");
+
+    expect(drafts).toEqual(["Rome", "Rome burns", "Carthage", "Carthage waits"]);
+
+    handlers().onEvent({ type: "round_failed", round_number: 1 });
+    expect(manager.crisisDraft).toBe("");
+  });
+
+  it("reopens the action phase when the round fails", () => {
+    const { handlers } = openStream();
+    const manager = makeManager(1);
+    const error = vi.fn();
+    manager.events.on("error", error);
+
+    manager.waitForNextRound();
+    handlers().onEvent({ type: "round_failed", round_number: 1 });
+
+    expect(error).toHaveBeenCalled();
+    expect(manager.gamePhase).toBe("ACTION");
+  });
+
+  it("falls back to polling when the stream drops", async () => {
+    const { handlers } = openStream();
+    const manager = makeManager(1);
+    ApiService.getGameState.mockResolvedValue(state(2));
+
+    manager.waitForNextRound();
+    handlers().onError(new Error("stream closed"));
+    expect(manager._pollTimer).not.toBeNull();
+
+    await vi.advanceTimersByTimeAsync(POLL_INTERVAL_MS);
+    expect(manager.gamePhase).toBe("DIPLOMACY");
+  });
+
+  it("falls back to polling when the stream goes quiet", async () => {
+    const { stream, handlers } = openStream();
+    const manager = makeManager(1);
+    ApiService.getGameState.mockResolvedValue(state(2));
+
+    manager.waitForNextRound();
+    await vi.advanceTimersByTimeAsync(ROUND_EVENTS_IDLE_TIMEOUT_MS - 1);
+    handlers().onEvent({ type: "judge_started", round_number: 1 });
+    await vi.advanceTimersByTimeAsync(ROUND_EVENTS_IDLE_TIMEOUT_MS - 1);
+    expect(manager._pollTimer).toBeNull(); // each event restarts the timer
+
+    await vi.advanceTimersByTimeAsync(1);
+    expect(stream.close).toHaveBeenCalled();
+    expect(manager._pollTimer).not.toBeNull();
+
+    await vi.advanceTimersByTimeAsync(POLL_INTERVAL_MS);
+    expect(manager.gamePhase).toBe("DIPLOMACY");
+  });
+
+  it("ignores events from a stream that was stopped", () => {
+    const { handlers } = openStream();
+    const manager = makeManager(1);
+
+    manager.waitForNextRound();
+    const staleHandlers = handlers();
+    manager.stopPolling();
+    staleHandlers.onEvent({ type: "round_committed", round_number: 2 });
+    staleHandlers.onError(new Error("closed"));
+
+    expect(ApiService.getGameState).not.toHaveBeenCalled();
+    expect(manager._pollTimer).toBeNull();
+  });
+});
+
 describe("destroy", () => {
   it("stops the timer and removes listeners", () => {
     const manager = makeManager(1);
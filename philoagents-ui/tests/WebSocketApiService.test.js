@@ -17,6 +17,7 @@ const frame = (payload) => ({ data: JSON.stringify(payload) });
 
 beforeEach(() => {
   WebSocketApiService.messageCallbacks.clear();
+  WebSocketApiService.requests.clear();
 });
 
 describe("handleMessage", () => {
@@ -26,7 +27,7 @@ describe("handleMessage", () => {
     WebSocketApiService.handleMessage(frame({ streaming: true }));
     expect(cb.onStreamingStart).toHaveBeenCalled();
 
-    WebSocketApiService.handleMessage(frame({ chunk: "Hello" }));
+    WebSocketApiService.handleMessage(frame({ c: "Hello" }));
     expect(cb.onChunk).toHaveBeenCalledWith("Hello");
 
     WebSocketApiService.handleMessage(frame({ response: "Hello world", streaming: false }));
@@ -53,6 +54,31 @@ describe("handleMessage", () => {
   });
 });
 
+describe("multiplexed requests", () => {
+  it("routes interleaved frames to the request they are tagged with", async () => {
+    const sent = [];
+    WebSocketApiService.connected = true;
+    WebSocketApiService.socket = { send: (payload) => sent.push(JSON.parse(payload)) };
+    const scipio = { onChunk: vi.fn(), onStreamingEnd: vi.fn(), onStreamingStart: vi.fn() };
+    const hannibal = { onChunk: vi.fn(), onStreamingEnd: vi.fn(), onStreamingStart: vi.fn() };
+
+    const first = await WebSocketApiService.sendMessage("player", "scipio", "Hi", scipio);
+    const second = await WebSocketApiService.sendMessage("player", "hannibal", "Hi", hannibal);
+    expect(sent.map((message) => message.request_id)).toEqual([first, second]);
+
+    WebSocketApiService.handleMessage(frame({ id: second, c: "Rome" }));
+    WebSocketApiService.handleMessage(frame({ id: first, c: "Carthage" }));
+    WebSocketApiService.handleMessage(frame({ id: first, response: "Carthage", streaming: false }));
+
+    expect(scipio.onChunk).toHaveBeenCalledWith("Carthage");
+    expect(hannibal.onChunk).toHaveBeenCalledWith("Rome");
+    expect(scipio.onStreamingEnd).toHaveBeenCalled();
+    expect(hannibal.onStreamingEnd).not.toHaveBeenCalled();
+    expect(WebSocketApiService.requests.has(first)).toBe(false);
+    expect(WebSocketApiService.requests.has(second)).toBe(true);
+  });
+});
+
 describe("disconnect", () => {
   it("clears callbacks before closing so the deliberate close is silent", () => {
     const cb = registerSpies();